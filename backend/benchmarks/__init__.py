@@ -0,0 +1,3 @@
+"""
+Load-testing benchmarks for the backend API.
+"""
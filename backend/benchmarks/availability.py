@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the availability index at portfolio scale.
+
+Generates non-overlapping future stays for every unit (default 500 units x
+10 years at ~70% occupancy), builds the UnitIntervalIndex and compares
+availability queries against a naive scan of every stay:
+    
+    python -m backend.benchmarks.availability --units 500 --years 10
+
+The HTTP endpoint is covered by the "availability" scenario of
+backend.benchmarks.run.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.availability_service import UnitIntervalIndex
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark availability queries.")
+    parser.add_argument("--units", type=int, default=500, help="Units (properties)")
+    parser.add_argument("--years", type=int, default=10, help="Years of future bookings")
+    parser.add_argument("--occupancy", type=float, default=0.7, help="Target share of nights booked")
+    parser.add_argument("--queries", type=int, default=2000, help="Availability queries to time")
+    parser.add_argument("--naive-queries", type=int, default=50, help="Queries for the naive scan")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args(argv)
+
+
+def generate_stays(units: int, years: int, occupancy: float, seed: int):
+    """(property_id, check_in, check_out) tuples, back to back with random gaps."""
+    rng = random.Random(seed)
+    first_day = date.today()
+    last_day = first_day + timedelta(days=365 * years)
+    # Mean gap so that nights / (nights + gap) ~= occupancy
+    mean_nights = 4.5
+    mean_gap = mean_nights * (1 - occupancy) / occupancy
+    stays = []
+    for property_id in range(1, units + 1):
+        day = first_day + timedelta(days=rng.randrange(7))
+        while day < last_day:
+            nights = max(1, int(rng.expovariate(1 / mean_nights)))
+            stays.append((property_id, day, day + timedelta(days=nights)))
+            day += timedelta(days=nights + int(rng.expovariate(1 / mean_gap)) if mean_gap else nights)
+    return stays
+
+
+def random_queries(count: int, years: int, seed: int):
+    rng = random.Random(seed + 1)
+    today = date.today()
+    queries = []
+    for _ in range(count):
+        check_in = today + timedelta(days=rng.randrange(365 * years))
+        queries.append((check_in, check_in + timedelta(days=rng.randint(1, 14))))
+    return queries
+
+
+def naive_free_units(stays, unit_ids, check_in, check_out):
+    busy = {pid for pid, start, end in stays if start < check_out and end > check_in}
+    return [pid for pid in unit_ids if pid not in busy]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_queries(fn, queries):
+    samples = []
+    for check_in, check_out in queries:
+        started = time.perf_counter()
+        fn(check_in, check_out)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stays = generate_stays(args.units, args.years, args.occupancy, args.seed)
+    unit_ids = list(range(1, args.units + 1))
+    print(f"📦 {len(stays):,} stays across {args.units} units and {args.years} years")
+    
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = UnitIntervalIndex.build(stays)
+    # Force the lazily computed running maxima so they are measured too
+    index.free_units(unit_ids, date.today(), date.today() + timedelta(days=1))
+    build_ms = (time.perf_counter() - started) * 1000
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    print(f"🏗️  Index built in {build_ms:.0f} ms, {memory_mb:.1f} MB")
+    
+    queries = random_queries(args.queries, args.years, args.seed)
+    
+    # Both strategies must agree
+    for check_in, check_out in queries[:args.naive_queries]:
+        assert index.free_units(unit_ids, check_in, check_out) == naive_free_units(stays, unit_ids, check_in, check_out)
+    
+    indexed = time_queries(lambda a, b: index.free_units(unit_ids, a, b), queries)
+    naive = time_queries(lambda a, b: naive_free_units(stays, unit_ids, a, b), queries[:args.naive_queries])
+    
+    print(f"{'strategy':<10} {'queries':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, samples in (("index", indexed), ("naive", naive)):
+        print(f"{name:<10} {len(samples):>8} {statistics.median(samples):>9.3f} {percentile(samples, 0.99):>9.3f}")
+    print(f"⚡ Speed-up (p50): {statistics.median(naive) / statistics.median(indexed):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Seeded synthetic booking dataset for benchmarks.
+
+The same (seed, years, bookings_per_day, units, end_year) always produces
+the same bookings, so results from different runs are comparable.
+"""
+
+from typing import Iterator, Tuple
+from datetime import date, timedelta
+import random
+
+
+FIRST_NAMES = ["Ana", "Luis", "Marta", "John", "Emma", "Pablo", "Sofia", "Liam", "Chloe", "Hugo"]
+LAST_NAMES = ["Garcia", "Smith", "Moreno", "Müller", "Rossi", "Dubois", "Lopez", "Brown", "Novak", "Silva"]
+
+# (status, weight)
+STATUSES = [("Confirmed", 85), ("Cancelled", 10), ("Pending", 5)]
+
+# (nights, weight) - short stays dominate
+NIGHTS = [(1, 8), (2, 14), (3, 18), (4, 14), (5, 12), (6, 8), (7, 12), (10, 6), (14, 5), (21, 3)]
+
+INSERT_SQL = """
+    INSERT INTO bookings
+    (`Booking ID`, `Nº Booking`, `Nombre,Apellidos`, `Check-In`, `Check-Out`,
+     `Nº Noches`, `Nº Personas`, `Nº Adultos`, `Nº Niños`,
+     `Status`, `Email`, `Movil`, `Precio`, `Comm y Cargos`)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def dataset_period(years: int, end_year: int) -> Tuple[date, date]:
+    """First and last check-in date of a dataset spanning whole years."""
+    return date(end_year - years + 1, 1, 1), date(end_year, 12, 31)
+
+
+def generate_bookings(
+    years: int = 3,
+    bookings_per_day: float = 20,
+    units: int = 50,
+    seed: int = 42,
+    end_year: int = None
+) -> Iterator[Tuple]:
+    """
+    Generate booking rows in INSERT_SQL column order.
+    
+    Args:
+        years: Number of calendar years of check-ins (ending with end_year)
+        bookings_per_day: Average check-ins per day
+        units: Number of distinct Booking IDs (apartments)
+        seed: Random seed
+        end_year: Last year of data (defaults to the current year)
+    
+    Yields:
+        Row tuples for INSERT_SQL
+    """
+    rng = random.Random(seed)
+    first, last = dataset_period(years, end_year or date.today().year)
+    statuses, status_weights = zip(*STATUSES)
+    nights_options, nights_weights = zip(*NIGHTS)
+    
+    booking_number = 4_000_000_000
+    day = first
+    while day <= last:
+        # Poisson-like daily volume around the average
+        count = max(0, int(rng.gauss(bookings_per_day, bookings_per_day ** 0.5) + 0.5))
+        for _ in range(count):
+            nights = rng.choices(nights_options, nights_weights)[0]
+            adults = rng.randint(1, 4)
+            children = rng.choice([0, 0, 0, 1, 2])
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            price = round(nights * rng.uniform(55, 240), 2)
+            booking_number += rng.randint(1, 997)
+            yield (
+                f"APT-{rng.randrange(units):03d}",
+                str(booking_number),
+                f"{first_name} {last_name}",
+                day,
+                day + timedelta(days=nights),
+                nights,
+                adults + children,
+                adults,
+                children,
+                rng.choices(statuses, status_weights)[0],
+                f"{first_name.lower()}.{last_name.lower()}{booking_number % 1000}@example.com",
+                f"+34 6{rng.randrange(10 ** 8):08d}",
+                price,
+                round(price * 0.15, 2),
+            )
+        day += timedelta(days=1)
+
+
+def seed_database(connection, rows: Iterator[Tuple], batch_size: int = 5000) -> int:
+    """
+    Insert generated rows in batches inside one transaction.
+    
+    Args:
+        connection: Database connection (any storage engine)
+        rows: Rows from generate_bookings
+        batch_size: Rows per executemany call
+    
+    Returns:
+        Number of rows inserted
+    """
+    cursor = connection.cursor()
+    total = 0
+    batch = []
+    
+    try:
+        connection.start_transaction()
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cursor.executemany(INSERT_SQL, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+            total += len(batch)
+        connection.commit()
+        return total
+    
+    except Exception:
+        connection.rollback()
+        raise
+    
+    finally:
+        cursor.close()
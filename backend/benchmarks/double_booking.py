@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Stress test for double-booking prevention under concurrency.
+
+Several processes (like uvicorn workers or channel syncs) are released
+together by a barrier each round: some create overlapping stays in the same
+"hot" unit, the rest create stays in their own "cold" unit. Afterwards no
+hot unit may hold two overlapping bookings, and every cold create must have
+succeeded (unrelated units are not serialized):
+    
+    python -m backend.benchmarks.double_booking --workers 8 --contenders 4 --rounds 50
+
+Runs on a fresh SQLite database by default; with --db mysql the configured
+MySQL database is used and the test bookings are deleted afterwards.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.config import settings
+
+
+# Unit codes of the test bookings
+PREFIX = "STRESS"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fire concurrent overlapping booking creates.")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite",
+                        help="Fresh SQLite database or the configured MySQL database")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent processes")
+    parser.add_argument("--contenders", type=int, default=4,
+                        help="Processes per round creating overlapping stays in the hot unit")
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds (one create per process each)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args(argv)
+
+
+def _init_worker(engine: str, sqlite_path: str):
+    settings.DB_ENGINE = engine
+    settings.SQLITE_PATH = sqlite_path
+
+
+def _create(task):
+    """Create one booking after every process reached the barrier."""
+    from backend.exceptions import BookingConflictError
+    from backend.models.booking import BookingCreate
+    from backend.services.booking_service import BookingService
+    
+    barrier, unit, check_in, nights = task
+    booking = BookingCreate(
+        booking_id=unit,
+        guest_name="Stress Test",
+        check_in=check_in,
+        check_out=check_in + timedelta(days=nights),
+        nights=nights,
+    )
+    service = BookingService()
+    barrier.wait()
+    started = time.perf_counter()
+    try:
+        created = service.create_booking(booking)
+        return "created", unit, created.record_id, (time.perf_counter() - started) * 1000
+    except BookingConflictError:
+        return "conflict", unit, None, (time.perf_counter() - started) * 1000
+    except Exception as e:
+        return f"error: {e}", unit, None, (time.perf_counter() - started) * 1000
+
+
+def find_overlaps(bookings):
+    """Pairs of overlapping non-cancelled bookings of the same unit."""
+    overlaps = []
+    by_unit = {}
+    for booking in bookings:
+        by_unit.setdefault(booking.booking_id, []).append(booking)
+    for unit_bookings in by_unit.values():
+        unit_bookings.sort(key=lambda b: b.check_in)
+        for previous, current in zip(unit_bookings, unit_bookings[1:]):
+            if current.check_in < previous.check_out:
+                overlaps.append((previous.record_id, current.record_id))
+    return overlaps
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not 0 < args.contenders <= args.workers:
+        print("❌ --contenders must be between 1 and --workers")
+        return 2
+    
+    sqlite_path = os.path.join(tempfile.mkdtemp(prefix="pms_stress_"), "stress.sqlite3")
+    engine = args.db
+    _init_worker(engine, sqlite_path)
+    
+    from backend.models.booking import BookingFilter
+    from backend.services.booking_service import BookingService
+    
+    rng = random.Random(args.seed)
+    # Far in the future, so the test never meets real bookings
+    base = date.today().replace(day=1) + timedelta(days=365 * 50)
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+    results = []
+    
+    print(f"🔥 {args.rounds} rounds x {args.workers} processes "
+          f"({args.contenders} contending for one unit) on {engine}")
+    started = time.perf_counter()
+    with context.Pool(args.workers, initializer=_init_worker, initargs=(engine, sqlite_path)) as pool:
+        for round_no in range(args.rounds):
+            barrier = manager.Barrier(args.workers)
+            window = base + timedelta(days=30 * round_no)
+            tasks = [
+                # Random stays inside the same 10 nights: most pairs overlap
+                (barrier, f"{PREFIX}-HOT", window + timedelta(days=rng.randrange(7)), rng.randint(1, 4))
+                for _ in range(args.contenders)
+            ] + [
+                (barrier, f"{PREFIX}-COLD-{i}", window, rng.randint(1, 10))
+                for i in range(args.workers - args.contenders)
+            ]
+            results.extend(pool.map(_create, tasks))
+    elapsed = time.perf_counter() - started
+    
+    service = BookingService()
+    bookings = [
+        b for b in service.search_bookings(BookingFilter(check_in_from=base))
+        if b.booking_id.startswith(PREFIX)
+    ]
+    overlaps = find_overlaps(bookings)
+    
+    hot = [r for r in results if r[1].endswith("-HOT")]
+    cold = [r for r in results if not r[1].endswith("-HOT")]
+    errors = [r for r in results if r[0].startswith("error")]
+    print(f"hot unit:   {sum(r[0] == 'created' for r in hot)} created, "
+          f"{sum(r[0] == 'conflict' for r in hot)} rejected as conflicts")
+    print(f"cold units: {sum(r[0] == 'created' for r in cold)}/{len(cold)} created")
+    for name, group in (("hot", hot), ("cold", cold)):
+        latencies = [r[3] for r in group]
+        if latencies:
+            print(f"{name:<5} latency p50 {statistics.median(latencies):.1f} ms, max {max(latencies):.1f} ms")
+    print(f"⏱️  {len(results)} creates in {elapsed:.1f}s")
+    
+    if engine == "mysql":
+        for booking in bookings:
+            service.delete_booking(booking.record_id)
+    
+    failed = False
+    if overlaps:
+        print(f"❌ {len(overlaps)} double bookings: {overlaps[:10]}")
+        failed = True
+    if any(r[0] != "created" for r in cold):
+        print("❌ Creates in unrelated units failed")
+        failed = True
+    for status, unit, _, _ in errors[:5]:
+        print(f"❌ {unit}: {status}")
+    if errors:
+        failed = True
+    if not failed:
+        print("✅ No double bookings")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the occupancy engine (per-unit night bitsets).
+
+Uses the same synthetic stays as the availability benchmark (default
+500 units x 10 years) and reports memory, build and incremental update
+times and query latencies for conflict checks, free units, in-house counts
+and the calendar grid:
+    
+    python -m backend.benchmarks.occupancy --units 500 --years 10
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.benchmarks.availability import generate_stays, percentile
+from backend.services.occupancy_engine import OccupancyBitmap
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the occupancy engine.")
+    parser.add_argument("--units", type=int, default=500, help="Units (properties)")
+    parser.add_argument("--years", type=int, default=10, help="Years of future bookings")
+    parser.add_argument("--occupancy", type=float, default=0.7, help="Target share of nights booked")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per operation")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args(argv)
+
+
+def timed(fn, count):
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stays = generate_stays(args.units, args.years, args.occupancy, args.seed)
+    unit_ids = list(range(1, args.units + 1))
+    today = date.today()
+    print(f"📦 {len(stays):,} stays across {args.units} units and {args.years} years")
+    
+    tracemalloc.start()
+    started = time.perf_counter()
+    bitmap = OccupancyBitmap.build(stays, today)
+    build_ms = (time.perf_counter() - started) * 1000
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    print(f"🏗️  Built in {build_ms:.0f} ms (peak {peak_mb:.1f} MB while building)")
+    print(f"💾 Bitsets: {bitmap.nbytes / 1024:.0f} KB ({bitmap.nbytes * 8 / args.units:.0f} nights per unit), "
+          f"{sum(len(days) for days in bitmap._extra.values())} overbooked nights")
+    
+    rng = random.Random(args.seed + 1)
+    
+    def window(max_nights):
+        check_in = today + timedelta(days=rng.randrange(365 * args.years))
+        return check_in, check_in + timedelta(days=rng.randint(1, max_nights))
+    
+    def conflict():
+        bitmap.is_free(rng.choice(unit_ids), *window(14))
+    
+    def free_units():
+        bitmap.free_units(unit_ids, *window(14))
+    
+    def in_house_90():
+        check_in, _ = window(1)
+        bitmap.in_house(check_in, check_in + timedelta(days=90))
+    
+    def grid_90():
+        check_in, _ = window(1)
+        bitmap.grid(unit_ids, check_in, check_in + timedelta(days=90))
+    
+    def update():
+        pid, (check_in, check_out) = rng.choice(unit_ids), window(14)
+        bitmap.add(pid, check_in, check_out)
+        bitmap.remove(pid, check_in, check_out)
+    
+    operations = [
+        ("conflict check (1 unit)", conflict),
+        (f"free units ({args.units})", free_units),
+        ("in-house per night (90 d)", in_house_90),
+        (f"grid {args.units} x 90 d", grid_90),
+        ("add + remove a stay", update),
+    ]
+    print(f"{'operation':<28} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, fn in operations:
+        samples = timed(fn, args.queries)
+        print(f"{name:<28} {statistics.median(samples):>9.3f} {percentile(samples, 0.99):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
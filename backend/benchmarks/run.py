@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Load-test the FastAPI backend and compare against a saved baseline.
+
+Seeds a synthetic dataset (embedded SQLite engine by default, cached between runs),
+starts the app with uvicorn in-process and runs each scenario with
+concurrent HTTP clients, reporting throughput and latency percentiles:
+    
+    python -m backend.benchmarks.run --years 3 --per-day 20 --save baseline.json
+    python -m backend.benchmarks.run --years 3 --per-day 20 --compare baseline.json
+
+With --db mysql the configured MySQL database is benchmarked as-is (not seeded).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+import uvicorn
+
+from backend.benchmarks.dataset import dataset_period, generate_bookings, seed_database
+from backend.benchmarks.scenarios import SCENARIOS, BenchContext
+from backend.config import settings
+from backend.database.connection import close_connection, new_connection
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the backend API endpoints.")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite",
+                        help="Seeded SQLite engine or the configured MySQL database")
+    parser.add_argument("--sqlite-dir", default=tempfile.gettempdir(),
+                        help="Directory for cached seeded SQLite databases")
+    parser.add_argument("--years", type=int, default=3, help="Years of synthetic bookings")
+    parser.add_argument("--per-day", type=float, default=20, help="Average check-ins per day")
+    parser.add_argument("--units", type=int, default=50, help="Distinct Booking IDs (apartments)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and requests")
+    parser.add_argument("--end-year", type=int, default=datetime.now().year,
+                        help="Last year of data (default: current year)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up requests per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenarios (default: all)")
+    parser.add_argument("--save", metavar="PATH", help="Write results as baseline JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed relative regression in p95 / throughput (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def prepare_sqlite(args) -> str:
+    """Create (or reuse) a seeded SQLite database and route the app to it."""
+    name = f"pms_bench_{args.years}y_{args.per_day:g}pd_{args.units}u_s{args.seed}_{args.end_year}.sqlite3"
+    path = os.path.join(args.sqlite_dir, name)
+    
+    # Switch the app to the embedded engine before anything connects
+    settings.DB_ENGINE = "sqlite"
+    settings.SQLITE_PATH = path
+    close_connection()
+    
+    if os.path.exists(path):
+        print(f"♻️  Reusing seeded database {path}")
+        link_properties()
+        return path
+    
+    print(f"🌱 Seeding {path} ...")
+    started = time.perf_counter()
+    conn = new_connection()
+    try:
+        rows = generate_bookings(args.years, args.per_day, args.units, args.seed, args.end_year)
+        total = seed_database(conn, rows)
+    finally:
+        conn.close()
+    
+    # Analytics read the daily rollup, so build it once as well
+    from backend.services.analytics_service import AnalyticsService
+    AnalyticsService().rebuild_occupancy()
+    link_properties()
+    
+    print(f"✅ Seeded {total} bookings in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def link_properties():
+    """Create one property per unit and link the seeded bookings (no-op once linked)."""
+    from backend.services.property_service import PropertyService
+    PropertyService().backfill_from_bookings()
+
+
+def count_records() -> int:
+    """Highest booking record ID (used by the get_booking scenario)."""
+    conn = new_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT MAX(ID) FROM bookings")
+        row = cursor.fetchone()
+        return int(row[0] or 0)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def start_server():
+    """Run the app with uvicorn in a background thread; returns (server, thread, base_url)."""
+    from backend.main import app
+    
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("❌ Benchmark server did not start")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}{settings.API_PREFIX}"
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(name, base_url, ctx, args) -> dict:
+    """Run one scenario with args.concurrency clients and summarize latencies."""
+    rng = random.Random(f"{args.seed}:{name}")
+    build = SCENARIOS[name]
+    requests = [build(rng, ctx) for _ in range(args.warmup + args.requests)]
+    warmup, measured = requests[:args.warmup], requests[args.warmup:]
+    
+    local = threading.local()
+    
+    def send(request):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = httpx.Client(base_url=base_url, timeout=60)
+        started = time.perf_counter()
+        try:
+            response = client.get(request.path, params=request.params, headers=request.headers)
+            response.read()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        return time.perf_counter() - started, ok
+    
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(send, warmup))
+        
+        started = time.perf_counter()
+        results = list(pool.map(send, measured))
+        elapsed = time.perf_counter() - started
+        
+        # Close the per-thread clients
+        pool.map(lambda _: getattr(local, "client", None) and local.client.close(), range(args.concurrency))
+    
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+def print_report(results: dict):
+    header = f"{'scenario':<20} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<20} {r['requests']:>6} {r['errors']:>5} {r['throughput_rps']:>9.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results to a baseline.
+    
+    Returns:
+        List of regression messages (empty if none)
+    """
+    regressions = []
+    print(f"\n📊 Comparison with baseline ({baseline['meta'].get('created_at', '?')}):")
+    for name, current in results.items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            print(f"   {name:<20} (not in baseline)")
+            continue
+        
+        p95_change = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] if previous["p95_ms"] else 0.0
+        rps_change = (current["throughput_rps"] - previous["throughput_rps"]) / previous["throughput_rps"] \
+            if previous["throughput_rps"] else 0.0
+        flag = ""
+        if p95_change > threshold or rps_change < -threshold:
+            flag = "  ⚠️  REGRESSION"
+            regressions.append(f"{name}: p95 {p95_change:+.0%}, throughput {rps_change:+.0%}")
+        print(f"   {name:<20} p95 {p95_change:+7.1%}   throughput {rps_change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"❌ Unknown scenarios: {', '.join(unknown)}")
+        return 2
+    
+    if args.db == "sqlite":
+        prepare_sqlite(args)
+    first_day, last_day = dataset_period(args.years, args.end_year)
+    ctx = BenchContext(first_day, last_day, count_records(), args.units)
+    
+    server, thread, base_url = start_server()
+    print(f"🚀 Benchmarking {base_url} ({args.concurrency} clients, {args.requests} requests/scenario)")
+    try:
+        results = {}
+        for name in names:
+            results[name] = run_scenario(name, base_url, ctx, args)
+            print(f"   ✔ {name}")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+    
+    print_report(results)
+    
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "db": args.db,
+            "years": args.years,
+            "per_day": args.per_day,
+            "units": args.units,
+            "seed": args.seed,
+            "end_year": args.end_year,
+            "records": ctx.record_count,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+        print("\n✅ No regressions")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
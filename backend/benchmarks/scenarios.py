@@ -0,0 +1,135 @@
+"""
+Load scenarios, one per endpoint (read-only, so a seeded database can be reused).
+
+Each scenario builds a request from a seeded random generator and the
+dataset context, so every run issues the same request sequence.
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional
+from datetime import date, timedelta
+import random
+from backend.benchmarks.dataset import LAST_NAMES
+
+
+ARROW_ACCEPT = {"Accept": "application/vnd.apache.arrow.stream"}
+
+
+class BenchContext(NamedTuple):
+    """What scenarios need to know about the seeded dataset."""
+    
+    first_day: date
+    last_day: date
+    record_count: int
+    units: int
+
+
+class Request(NamedTuple):
+    """A request issued by a scenario (path is relative to the API prefix)."""
+    
+    path: str
+    params: Dict
+    headers: Optional[Dict] = None
+
+
+def _random_day(rng: random.Random, ctx: BenchContext, margin_days: int = 0) -> date:
+    """Random day in the dataset leaving margin_days before its end."""
+    span = (ctx.last_day - ctx.first_day).days - margin_days
+    return ctx.first_day + timedelta(days=rng.randrange(max(span, 1)))
+
+
+def list_limit(rng, ctx):
+    return Request("/bookings/", {"limit": 500})
+
+
+def list_period(rng, ctx):
+    start = _random_day(rng, ctx, 31)
+    return Request("/bookings/", {"start_date": start.isoformat(), "end_date": (start + timedelta(days=30)).isoformat()})
+
+
+def list_period_arrow(rng, ctx):
+    request = list_period(rng, ctx)
+    return Request(request.path, request.params, ARROW_ACCEPT)
+
+
+def active(rng, ctx):
+    return Request("/bookings/active", {})
+
+
+def upcoming_checkins(rng, ctx):
+    return Request("/bookings/upcoming-checkins", {"days": 7})
+
+
+def calendar_events(rng, ctx):
+    return Request("/bookings/calendar-events", {"days": 90})
+
+
+def property_calendar(rng, ctx):
+    return Request(f"/properties/{rng.randint(1, max(ctx.units, 1))}/calendar-events", {"days": 90})
+
+
+def availability(rng, ctx):
+    # Arrivals in the past are rejected, so search from today on
+    check_in = max(_random_day(rng, ctx, 14), date.today()) + timedelta(days=rng.randrange(60))
+    return Request("/availability", {
+        "check_in": check_in.isoformat(),
+        "check_out": (check_in + timedelta(days=rng.randint(1, 14))).isoformat(),
+        "guests": rng.randint(1, 4),
+    })
+
+
+def get_booking(rng, ctx):
+    return Request(f"/bookings/{rng.randint(1, max(ctx.record_count, 1))}", {})
+
+
+def search(rng, ctx):
+    start = _random_day(rng, ctx, 92)
+    return Request("/bookings/search", {
+        "guest_name": rng.choice(LAST_NAMES),
+        "status": "Confirmed",
+        "check_in_from": start.isoformat(),
+        "check_in_to": (start + timedelta(days=91)).isoformat(),
+    })
+
+
+def stats_by_month(rng, ctx):
+    start = _random_day(rng, ctx, 366)
+    return Request("/bookings/stats", {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=365)).isoformat(),
+        "group_by": "month",
+    })
+
+
+def occupancy(rng, ctx):
+    start = _random_day(rng, ctx, 91)
+    return Request("/analytics/occupancy", {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=90)).isoformat(),
+    })
+
+
+def export_ndjson(rng, ctx):
+    start = _random_day(rng, ctx, 31)
+    return Request("/bookings/export", {
+        "format": "ndjson",
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=30)).isoformat(),
+    })
+
+
+# Scenario name -> request builder, in report order
+SCENARIOS: Dict[str, Callable[[random.Random, BenchContext], Request]] = {
+    "list_limit": list_limit,
+    "list_period": list_period,
+    "list_period_arrow": list_period_arrow,
+    "active": active,
+    "upcoming_checkins": upcoming_checkins,
+    "calendar_events": calendar_events,
+    "property_calendar": property_calendar,
+    "availability": availability,
+    "get_booking": get_booking,
+    "search": search,
+    "stats_by_month": stats_by_month,
+    "occupancy": occupancy,
+    "export_ndjson": export_ndjson,
+}
@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.1.0"
     DEBUG: bool = False
     
+    # Storage engine: "mysql" (server) or "sqlite" (embedded file, single host)
+    DB_ENGINE: str = "mysql"
+    SQLITE_PATH: str = "data/property_manager.sqlite3"
+    
+    # Connection/probe timeouts (seconds); requests fail fast with 503 while the DB is down
+    DB_CONNECT_TIMEOUT: int = 3
+    DB_PROBE_INTERVAL: float = 5.0
+    DB_PROBE_TIMEOUT: int = 2
+    
     # Database - acepta tanto DB_* como MYSQL_*
     DB_HOST: Optional[str] = None
     DB_USER: Optional[str] = None
@@ -35,6 +44,55 @@ class Settings(BaseSettings):
     # Electric allowance bookings (comma-separated list)
     ELECTRIC: str = ""
     
+    # Exports (rows fetched per batch from the server-side cursor)
+    EXPORT_BATCH_SIZE: int = 5000
+    
+    # Nights before today kept in the in-memory occupancy engine (older windows
+    # are answered from the database)
+    OCCUPANCY_HISTORY_DAYS: int = 365
+    
+    # The availability index and occupancy engine follow API writes as they
+    # happen, and are rebuilt from the database in the background once
+    # LIVE_INDEX_MAX_AGE seconds old to pick up writes made outside the API
+    # (0 disables)
+    LIVE_INDEX_MAX_AGE: float = 30.0
+    
+    # Active/upcoming/dashboard views share one fetched bookings window per
+    # property filter, reused for BOOKING_RANGE_TTL seconds while no booking
+    # changes (0 disables); fetches extend to today + BOOKING_RANGE_LOOKAHEAD_DAYS
+    BOOKING_RANGE_TTL: float = 5.0
+    BOOKING_RANGE_LOOKAHEAD_DAYS: int = 31
+    
+    # Background jobs (POST /jobs): JOB_WORKERS run at once per worker process,
+    # at most JOB_QUEUE_LIMIT queued or running; finished jobs kept in memory up
+    # to JOB_HISTORY (older output files are deleted), and persisted to the
+    # `jobs` table with JOB_PERSIST so any worker can report them. Job output
+    # files go to JOB_OUTPUT_DIR.
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_LIMIT: int = 20
+    JOB_HISTORY: int = 200
+    JOB_PERSIST: bool = True
+    JOB_OUTPUT_DIR: str = "data/jobs"
+    
+    # Observability (Server-Timing response header with per-layer durations)
+    SERVER_TIMING_HEADER: bool = True
+    
+    # Slow-query log (opt-in): statements over SLOW_QUERY_MS are logged with
+    # redacted parameters; a sample gets its EXPLAIN plan captured
+    SLOW_QUERY_LOG: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    EXPLAIN_SAMPLE_RATE: float = 0.1
+    EXPLAIN_MIN_INTERVAL: float = 60.0
+    
+    # Admin token (X-Admin-Token header) for profiling; profiling is disabled while unset
+    ADMIN_TOKEN: Optional[str] = None
+    
+    # Workers (processes) started by `python -m backend.main`; with more than
+    # one, use a shared coordination backend so writes reach every worker
+    WORKERS: int = 1
+    COORDINATION_BACKEND: str = "local"
+    COORDINATION_PATH: str = "data/coordination.sqlite3"
+    
     # API
     API_PREFIX: str = "/api/v1"
     CORS_ORIGINS: list = ["http://localhost:8501", "http://localhost:3000"]
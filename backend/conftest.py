@@ -0,0 +1,56 @@
+"""
+Shared pytest fixtures: the API on a throwaway SQLite database.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from backend.config import settings
+from backend.database.connection import close_connection
+from backend.database.health import database_probe
+from backend.main import app
+from backend.services.availability_service import availability_index
+from backend.services.booking_service import booking_range_memo
+from backend.services.occupancy_engine import occupancy_engine
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the app at an empty SQLite database for one test."""
+    monkeypatch.setattr(settings, "DB_ENGINE", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "pms.sqlite3"))
+    monkeypatch.setattr(settings, "COORDINATION_BACKEND", "local")
+    
+    # Process-wide state may still hold another test's database
+    close_connection()
+    database_probe.stop()
+    database_probe.check()
+    for index in (availability_index, occupancy_engine):
+        index.invalidate()
+    booking_range_memo.invalidate()
+    yield settings.SQLITE_PATH
+    close_connection()
+    database_probe.stop()
+
+
+@pytest.fixture
+def client(sqlite_db):
+    """TestClient on the temporary database (lifespan not run: no background threads)."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_booking(client):
+    """Create a booking through the API and return its JSON."""
+    def make(**fields):
+        payload = {
+            "booking_id": "T1",
+            "guest_name": "Test Guest",
+            "check_in": "2031-03-01",
+            "check_out": "2031-03-04",
+            "nights": 3,
+            **fields,
+        }
+        response = client.post("/api/v1/bookings/", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
@@ -0,0 +1,250 @@
+"""
+Cross-worker coordination: change versions and pub/sub.
+
+With several workers (WORKERS > 1) every process keeps its own caches, so
+writes must be visible to the other processes. Writers bump a per-topic
+change version (e.g. "bookings"), readers compare versions to tell whether
+cached data is stale, and subscribers get a callback in every worker.
+
+Selected with Settings.COORDINATION_BACKEND:
+- "local": in-process stand-in (single worker, tests, scripts)
+- "sqlite": shared SQLite file (WAL), for the workers of one host; events are
+  delivered by a polling thread in each worker
+"""
+
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+from backend.config import settings
+
+
+Callback = Callable[[str, dict], None]
+
+
+class LocalCoordinator:
+    """In-process versions and pub/sub (single worker)."""
+    
+    name = "local"
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._subscribers: Dict[str, List[Callback]] = {}
+    
+    def start(self):
+        """Start delivering events (nothing to do in-process)."""
+    
+    def stop(self):
+        """Stop delivering events (nothing to do in-process)."""
+    
+    def version(self, topic: str) -> int:
+        """Current change version of a topic (0 if never bumped)."""
+        with self._lock:
+            return self._versions.get(topic, 0)
+    
+    def bump(self, topic: str, payload: Optional[dict] = None) -> int:
+        """
+        Record a change to a topic and notify its subscribers.
+        
+        Args:
+            topic: Changed topic, e.g. "bookings"
+            payload: Optional details sent to subscribers (JSON-serializable)
+        
+        Returns:
+            The new version
+        """
+        with self._lock:
+            version = self._versions.get(topic, 0) + 1
+            self._versions[topic] = version
+        self.publish(topic, {**(payload or {}), "version": version})
+        return version
+    
+    def publish(self, channel: str, payload: dict):
+        """Send an event to the channel's subscribers in every worker."""
+        self._dispatch(channel, payload)
+    
+    def subscribe(self, channel: str, callback: Callback) -> Callable[[], None]:
+        """
+        Call `callback(channel, payload)` for every event on a channel.
+        
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+        
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(channel, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        
+        return unsubscribe
+    
+    def _dispatch(self, channel: str, payload: dict):
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, []))
+        for callback in callbacks:
+            try:
+                callback(channel, payload)
+            except Exception as e:
+                print(f"⚠️ Error in '{channel}' subscriber: {e}")
+
+
+class SQLiteCoordinator(LocalCoordinator):
+    """
+    Versions and events in a SQLite file shared by the workers of one host.
+    
+    Versions are read from the file, so they are never stale. Events are
+    appended to a table that each worker polls every POLL_INTERVAL seconds;
+    events older than EVENT_RETENTION seconds are pruned.
+    """
+    
+    name = "sqlite"
+    
+    # Seconds between event polls
+    POLL_INTERVAL = 0.2
+    
+    # Seconds events are kept for slow pollers
+    EVENT_RETENTION = 300
+    
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS versions (topic TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created REAL NOT NULL
+        )
+        """,
+    ]
+    
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_event_id = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection()
+        with connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread (sqlite3 connections are not shared)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+    
+    def start(self):
+        """Start polling for events (only events published from now on are delivered)."""
+        if self._thread is not None:
+            return
+        row = self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+        self._last_event_id = row[0]
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="coordination-poller", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop polling for events."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.POLL_INTERVAL * 5)
+            self._thread = None
+    
+    def version(self, topic: str) -> int:
+        row = self._connection().execute(
+            "SELECT version FROM versions WHERE topic = ?", (topic,)
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def bump(self, topic: str, payload: Optional[dict] = None) -> int:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO versions (topic, version) VALUES (?, 1) "
+                "ON CONFLICT (topic) DO UPDATE SET version = version + 1",
+                (topic,)
+            )
+            version = connection.execute(
+                "SELECT version FROM versions WHERE topic = ?", (topic,)
+            ).fetchone()[0]
+            self._insert_event(connection, topic, {**(payload or {}), "version": version})
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return version
+    
+    def publish(self, channel: str, payload: dict):
+        self._insert_event(self._connection(), channel, payload)
+    
+    @staticmethod
+    def _insert_event(connection: sqlite3.Connection, channel: str, payload: dict):
+        connection.execute(
+            "INSERT INTO events (channel, payload, created) VALUES (?, ?, ?)",
+            (channel, json.dumps(payload, default=str), time.time())
+        )
+    
+    def _run(self):
+        last_prune = 0.0
+        while not self._stop.wait(self.POLL_INTERVAL):
+            try:
+                self.poll()
+                if time.monotonic() - last_prune > self.EVENT_RETENTION:
+                    self._connection().execute(
+                        "DELETE FROM events WHERE created < ?", (time.time() - self.EVENT_RETENTION,)
+                    )
+                    last_prune = time.monotonic()
+            except Exception as e:
+                print(f"⚠️ Error polling coordination events: {e}")
+    
+    def poll(self):
+        """Deliver events published (by any worker) since the last poll."""
+        rows = self._connection().execute(
+            "SELECT id, channel, payload FROM events WHERE id > ? ORDER BY id", (self._last_event_id,)
+        ).fetchall()
+        for event_id, channel, payload in rows:
+            self._last_event_id = event_id
+            self._dispatch(channel, json.loads(payload))
+
+
+_coordinator = None
+_coordinator_key: Optional[tuple] = None
+
+
+def get_coordinator():
+    """
+    Get the coordination backend configured in settings.
+    
+    Returns:
+        LocalCoordinator or SQLiteCoordinator
+    
+    Raises:
+        ValueError: If COORDINATION_BACKEND is not supported
+    """
+    global _coordinator, _coordinator_key
+    key = (settings.COORDINATION_BACKEND, settings.COORDINATION_PATH)
+    if _coordinator is None or _coordinator_key != key:
+        if settings.COORDINATION_BACKEND == "local":
+            _coordinator = LocalCoordinator()
+        elif settings.COORDINATION_BACKEND == "sqlite":
+            _coordinator = SQLiteCoordinator(settings.COORDINATION_PATH)
+        else:
+            raise ValueError(
+                f"Unsupported COORDINATION_BACKEND '{settings.COORDINATION_BACKEND}' (use 'local' or 'sqlite')"
+            )
+        _coordinator_key = key
+    return _coordinator
@@ -2,6 +2,17 @@
 Database configuration and connection management.
 """
 
-from .connection import get_connection, close_connection
+from .connection import get_connection, close_connection, new_connection
+from .engines import get_engine, MySQLEngine, SQLiteEngine
+from .health import database_probe, DatabaseProbe
 
-__all__ = ["get_connection", "close_connection"]
+__all__ = [
+    "get_connection",
+    "close_connection",
+    "new_connection",
+    "get_engine",
+    "MySQLEngine",
+    "SQLiteEngine",
+    "database_probe",
+    "DatabaseProbe",
+]
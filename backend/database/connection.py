@@ -3,11 +3,14 @@ Database connection management.
 Migrated from services/bbdd_conection.py with improvements.
 """
 
+from contextlib import contextmanager
 from dotenv import load_dotenv
-import os
 import mysql.connector
-from mysql.connector import Error
 from typing import Optional
+import threading
+from backend.database.engines import get_engine
+from backend.database.health import database_probe
+from backend.observability.db import InstrumentedConnection
 
 load_dotenv()
 
@@ -34,22 +37,44 @@ class DatabaseConnection:
             RuntimeError: If connection fails
         """
         if self._connection is None or not self._connection.is_connected():
+            if self._connection is not None:
+                self.close_quietly(self._connection)
+                self._connection = None
             try:
-                self._connection = mysql.connector.connect(
-                    host=os.getenv("DB_HOST"),
-                    user=os.getenv("DB_USER"),
-                    password=os.getenv("DB_PASS"),
-                    database=os.getenv("DB_NAME"),
-                    port=int(os.getenv("DB_PORT", "3306")),
-                    autocommit=True,
-                )
-                self._connection.ping(reconnect=True, attempts=3, delay=2)
-                print("✅ Database connection established.")
-            except Error as e:
-                raise RuntimeError(f"❌ MySQL connection error: {e}")
+                self._connection = self.new_connection()
+            except RuntimeError as e:
+                # Let other requests fail fast until the probe sees the DB again
+                database_probe.report_failure(e)
+                raise
+            print("✅ Database connection established.")
         
         return self._connection
     
+    @staticmethod
+    def new_connection() -> mysql.connector.MySQLConnection:
+        """
+        Open a new dedicated database connection (not shared) on the configured engine.
+        
+        Used for long-running work such as streaming exports, which must not
+        hold the shared connection while results are being read. Statements
+        are timed into the current request's "db" layer.
+        
+        Returns:
+            mysql.connector.MySQLConnection (or SQLiteConnection): New database connection
+            
+        Raises:
+            RuntimeError: If connection fails
+        """
+        return InstrumentedConnection(get_engine().connect())
+    
+    @staticmethod
+    def close_quietly(connection):
+        """Close a (possibly broken) connection, ignoring errors."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
     def close_connection(self):
         """Close the database connection if it exists."""
         if self._connection and self._connection.is_connected():
@@ -75,3 +100,68 @@ def get_connection() -> mysql.connector.MySQLConnection:
 def close_connection():
     """Close database connection (backward compatible with old code)."""
     _db.close_connection()
+
+
+def new_connection() -> mysql.connector.MySQLConnection:
+    """
+    Open a new dedicated database connection (caller must close it).
+    
+    Returns:
+        mysql.connector.MySQLConnection: New database connection
+    """
+    return DatabaseConnection.new_connection()
+
+
+# Per-thread writer connections (see writer_connection)
+_writers = threading.local()
+
+
+def writer_connection() -> mysql.connector.MySQLConnection:
+    """
+    Get this thread's connection for write transactions, opening it on first use.
+    
+    Writers do not share the autocommit connection, so their transactions
+    never mix; keeping one per thread (request and job threads alike) saves
+    opening a connection for every write. Reopened when the configured
+    engine changes.
+    
+    Returns:
+        mysql.connector.MySQLConnection: This thread's writer connection
+    """
+    engine = get_engine()
+    connection = getattr(_writers, "connection", None)
+    if connection is not None and _writers.engine is not engine:
+        discard_writer_connection()
+        connection = None
+    if connection is None:
+        connection = DatabaseConnection.new_connection()
+        _writers.connection, _writers.engine = connection, engine
+    return connection
+
+
+def discard_writer_connection():
+    """Close this thread's writer connection (a new one is opened on next use)."""
+    connection = getattr(_writers, "connection", None)
+    _writers.connection = None
+    if connection is not None:
+        DatabaseConnection.close_quietly(connection)
+
+
+@contextmanager
+def dedicated_connections(*repositories):
+    """
+    Give repositories their own database connection for the duration of a
+    background task (jobs, index rebuilds).
+    
+    Repositories otherwise share the process-wide connection used by request
+    handlers, which must not be used from two threads at once.
+    """
+    connections = []
+    try:
+        for repository in repositories:
+            repository.connection = new_connection()
+            connections.append(repository.connection)
+        yield
+    finally:
+        for connection in connections:
+            DatabaseConnection.close_quietly(connection)
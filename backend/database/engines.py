@@ -0,0 +1,307 @@
+"""
+Storage engines.
+Selected with Settings.DB_ENGINE: "mysql" (default) or "sqlite" (embedded,
+single host, no network round trips).
+
+Repositories write portable SQL with %s parameters and backtick-quoted
+columns; the few dialect differences are asked from the engine.
+"""
+
+from typing import List, Optional
+import os
+import threading
+import mysql.connector
+from mysql.connector import Error
+from backend.config import settings
+from backend.database.sqlite import SQLiteConnection
+
+
+class MySQLEngine:
+    """
+    MySQL server.
+    
+    The bookings table itself is created outside the application; the first
+    connection of the process creates the properties and night ledger tables
+    and applies MIGRATIONS (property_id, capacity and version columns).
+    """
+    
+    name = "mysql"
+    
+    PROPERTIES_DDL = """
+        CREATE TABLE IF NOT EXISTS properties (
+            `ID` INT AUTO_INCREMENT PRIMARY KEY,
+            `Code` VARCHAR(64) NOT NULL UNIQUE,
+            `Name` VARCHAR(255),
+            `Capacity` INT NULL
+        )
+    """
+    
+    # One row per (unit, night) taken: the primary key rejects double bookings
+    NIGHT_LEDGER_DDL = """
+        CREATE TABLE IF NOT EXISTS booking_nights (
+            property_id INT NOT NULL,
+            stay_date DATE NOT NULL,
+            record_id INT NOT NULL,
+            PRIMARY KEY (property_id, stay_date),
+            KEY idx_booking_nights_record (record_id)
+        )
+    """
+    
+    # Adds bookings.property_id and the row version; statements failing with
+    # "duplicate" are already applied
+    MIGRATIONS = [
+        "ALTER TABLE bookings ADD COLUMN property_id INT NULL",
+        "CREATE INDEX idx_bookings_property_dates ON bookings (property_id, `Check-In`, `Check-Out`)",
+        "ALTER TABLE properties ADD COLUMN `Capacity` INT NULL",
+        "ALTER TABLE bookings ADD COLUMN version INT NOT NULL DEFAULT 1",
+    ]
+    
+    def __init__(self):
+        self._schema_ready = False
+        self._lock = threading.Lock()
+    
+    def connect(self, timeout: Optional[float] = None) -> mysql.connector.MySQLConnection:
+        """
+        Open a new MySQL connection.
+        
+        Fails after one attempt instead of retrying, so callers never stall
+        on an unreachable server; the readiness probe handles recovery. The
+        first connection of the process applies the properties and night
+        ledger migration.
+        
+        Args:
+            timeout: Socket timeout in seconds (defaults to DB_CONNECT_TIMEOUT)
+        
+        Raises:
+            RuntimeError: If connection fails
+        """
+        try:
+            connection = mysql.connector.connect(
+                host=settings.DB_HOST,
+                user=settings.DB_USER,
+                password=settings.DB_PASS,
+                database=settings.DB_NAME,
+                port=settings.DB_PORT,
+                autocommit=True,
+                connection_timeout=timeout or settings.DB_CONNECT_TIMEOUT,
+            )
+        except Error as e:
+            raise RuntimeError(f"❌ MySQL connection error: {e}")
+        
+        with self._lock:
+            if not self._schema_ready:
+                try:
+                    apply_migration(
+                        connection, [self.PROPERTIES_DDL] + self.MIGRATIONS + [self.NIGHT_LEDGER_DDL]
+                    )
+                    self._schema_ready = True
+                except Error as e:
+                    # Retried on the next connection; property queries fail until applied
+                    print(f"⚠️ Could not apply properties/night ledger migration: {e}")
+        return connection
+    
+    @staticmethod
+    def month_expression(column: str) -> str:
+        """SQL expression formatting a date column as 'YYYY-MM'."""
+        return f"DATE_FORMAT({column}, '%Y-%m')"
+    
+    @staticmethod
+    def explain_sql(sql: str) -> str:
+        """Statement returning the query plan of `sql` (same parameters)."""
+        return f"EXPLAIN {sql}"
+    
+    @staticmethod
+    def additive_upsert(table: str, columns: List[str], key_columns: List[str]) -> str:
+        """
+        INSERT that adds the non-key values to an existing row with the same key.
+        
+        Args:
+            table: Table name
+            columns: Inserted columns (one %s parameter each)
+            key_columns: Columns of the primary/unique key
+        """
+        updates = ", ".join(f"{c} = {c} + VALUES({c})" for c in columns if c not in key_columns)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+    
+    @staticmethod
+    def insert_ignore(table: str, columns: List[str]) -> str:
+        """INSERT that skips rows whose primary/unique key already exists."""
+        return (
+            f"INSERT IGNORE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+
+
+class SQLiteEngine:
+    """Embedded SQLite database file (WAL mode), created on first use."""
+    
+    name = "sqlite"
+    
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            `ID` INTEGER PRIMARY KEY AUTOINCREMENT,
+            `Booking ID` VARCHAR(64),
+            `Nº Booking` VARCHAR(64),
+            `Nombre,Apellidos` VARCHAR(255),
+            `Check-In` DATE,
+            `Check-Out` DATE,
+            `Nº Noches` INT,
+            `Nº Personas` INT,
+            `Nº Adultos` INT,
+            `Nº Niños` INT,
+            `Status` VARCHAR(32),
+            `Email` VARCHAR(255),
+            `Movil` VARCHAR(64),
+            `Precio` DECIMAL(10, 2),
+            `Comm y Cargos` DECIMAL(10, 2),
+            property_id INTEGER,
+            version INTEGER NOT NULL DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS properties (
+            `ID` INTEGER PRIMARY KEY AUTOINCREMENT,
+            `Code` VARCHAR(64) NOT NULL UNIQUE,
+            `Name` VARCHAR(255),
+            `Capacity` INTEGER
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS booking_nights (
+            property_id INTEGER NOT NULL,
+            stay_date DATE NOT NULL,
+            record_id INTEGER NOT NULL,
+            PRIMARY KEY (property_id, stay_date)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_booking_nights_record ON booking_nights (record_id)",
+        # Overlap queries filter on both dates; unit queries on Booking ID + dates
+        "CREATE INDEX IF NOT EXISTS idx_bookings_check_in ON bookings (`Check-In`, `Check-Out`)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_check_out ON bookings (`Check-Out`)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_unit ON bookings (`Booking ID`, `Check-In`)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings (`Status`)",
+    ]
+    
+    PROPERTIES_DDL = SCHEMA[1]
+    
+    # For databases created before properties and row versions existed
+    MIGRATIONS = [
+        "ALTER TABLE bookings ADD COLUMN property_id INTEGER",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_property_dates ON bookings (property_id, `Check-In`, `Check-Out`)",
+        "ALTER TABLE properties ADD COLUMN `Capacity` INTEGER",
+        "ALTER TABLE bookings ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    ]
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._schema_ready = False
+        self._lock = threading.Lock()
+    
+    def connect(self, timeout: Optional[float] = None) -> SQLiteConnection:
+        """
+        Open a new connection, creating the database file and schema if needed.
+        
+        Args:
+            timeout: Seconds to wait for a locked database (defaults to DB_CONNECT_TIMEOUT)
+        
+        Raises:
+            RuntimeError: If the database cannot be opened
+        """
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = SQLiteConnection(self.path, timeout or settings.DB_CONNECT_TIMEOUT)
+            with self._lock:
+                if not self._schema_ready:
+                    for statement in self.SCHEMA:
+                        connection.raw.execute(statement)
+                    apply_migration(connection.raw, self.MIGRATIONS)
+                    self._schema_ready = True
+            return connection
+        except Exception as e:
+            raise RuntimeError(f"❌ SQLite connection error ({self.path}): {e}")
+    
+    @staticmethod
+    def month_expression(column: str) -> str:
+        """SQL expression formatting a date column as 'YYYY-MM'."""
+        return f"strftime('%Y-%m', {column})"
+    
+    @staticmethod
+    def explain_sql(sql: str) -> str:
+        """Statement returning the query plan of `sql` (same parameters)."""
+        return f"EXPLAIN QUERY PLAN {sql}"
+    
+    @staticmethod
+    def additive_upsert(table: str, columns: List[str], key_columns: List[str]) -> str:
+        """
+        INSERT that adds the non-key values to an existing row with the same key.
+        
+        Args:
+            table: Table name
+            columns: Inserted columns (one %s parameter each)
+            key_columns: Columns of the primary/unique key
+        """
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in columns if c not in key_columns)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}"
+        )
+    
+    @staticmethod
+    def insert_ignore(table: str, columns: List[str]) -> str:
+        """INSERT that skips rows whose primary/unique key already exists."""
+        return (
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+
+
+def apply_migration(connection, statements: List[str]):
+    """
+    Run schema migration statements, skipping the ones already applied.
+    
+    Statements that fail with a "duplicate" column/index error are taken as
+    applied, so migrations can run on every start.
+    """
+    for statement in statements:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(statement)
+        except Exception as e:
+            if "duplicate" not in str(e).lower():
+                raise
+        finally:
+            cursor.close()
+
+
+_engine = None
+_engine_key: Optional[tuple] = None
+
+
+def get_engine():
+    """
+    Get the storage engine configured in settings.
+    
+    Returns:
+        MySQLEngine or SQLiteEngine
+    
+    Raises:
+        ValueError: If DB_ENGINE is not supported
+    """
+    global _engine, _engine_key
+    key = (settings.DB_ENGINE, settings.SQLITE_PATH)
+    if _engine is None or _engine_key != key:
+        if settings.DB_ENGINE == "mysql":
+            _engine = MySQLEngine()
+        elif settings.DB_ENGINE == "sqlite":
+            _engine = SQLiteEngine(settings.SQLITE_PATH)
+        else:
+            raise ValueError(f"Unsupported DB_ENGINE '{settings.DB_ENGINE}' (use 'mysql' or 'sqlite')")
+        _engine_key = key
+    return _engine
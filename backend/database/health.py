@@ -0,0 +1,146 @@
+"""
+Background database probe for readiness checks.
+
+A daemon thread runs `SELECT 1` on its own connection every
+DB_PROBE_INTERVAL seconds (every second while the database is down), with
+bounded timeouts. Requests read the cached result instead of each one
+waiting on connection attempts during an outage.
+"""
+
+from typing import Optional
+from datetime import datetime
+import threading
+import time
+from backend.config import settings
+from backend.database.engines import get_engine
+from backend.observability.metrics import REGISTRY
+
+
+class DatabaseProbe:
+    """Cached database availability, refreshed in the background."""
+    
+    # Re-check interval while the database is down (seconds)
+    DOWN_INTERVAL = 1.0
+    
+    def __init__(self, interval: Optional[float] = None, timeout: Optional[float] = None):
+        """
+        Initialize the probe.
+        
+        Args:
+            interval: Seconds between checks while up (defaults to DB_PROBE_INTERVAL)
+            timeout: Connect/query timeout in seconds (defaults to DB_PROBE_TIMEOUT)
+        """
+        self.interval = interval or settings.DB_PROBE_INTERVAL
+        self.timeout = timeout or settings.DB_PROBE_TIMEOUT
+        self._lock = threading.Lock()
+        # Serializes checks: the probe connection is not thread-safe, and the
+        # readiness endpoint may check while the probe thread does
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+        self._status = "unknown"
+        self._error: Optional[str] = None
+        self._latency_ms: Optional[float] = None
+        self._checked_at: Optional[datetime] = None
+        self._consecutive_failures = 0
+    
+    @property
+    def status(self) -> str:
+        """'up', 'down' or 'unknown' (not checked yet)."""
+        return self._status
+    
+    def is_available(self) -> bool:
+        """False only when the last check (or a reported failure) found the database down."""
+        return self._status != "down"
+    
+    def start(self):
+        """Start the background checks (first check runs immediately)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-probe", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background checks and close the probe connection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+        with self._check_lock:
+            self._close_connection()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval if self._status == "up" else self.DOWN_INTERVAL)
+    
+    def check(self) -> dict:
+        """
+        Run one probe now (waits for a check already running in another thread).
+        
+        Returns:
+            Probe snapshot (see snapshot)
+        """
+        with self._check_lock:
+            started = time.perf_counter()
+            try:
+                if self._connection is None:
+                    self._connection = get_engine().connect(timeout=self.timeout)
+                cursor = self._connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchall()
+                finally:
+                    cursor.close()
+                self._record("up", None, time.perf_counter() - started)
+            except Exception as e:
+                self._close_connection()
+                self._record("down", str(e), time.perf_counter() - started)
+        return self.snapshot()
+    
+    def report_failure(self, error: Exception):
+        """Mark the database down after a failed connection attempt elsewhere."""
+        self._record("down", str(error), None)
+    
+    def _record(self, status: str, error: Optional[str], elapsed: Optional[float]):
+        with self._lock:
+            if status == "down" and self._status != "down":
+                print(f"⚠️ Database unavailable: {error}")
+            elif status == "up" and self._status == "down":
+                print("✅ Database available again.")
+            self._status = status
+            self._error = error
+            self._latency_ms = round(elapsed * 1000, 2) if elapsed is not None else None
+            self._checked_at = datetime.now()
+            self._consecutive_failures = self._consecutive_failures + 1 if status == "down" else 0
+    
+    def _close_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    
+    def snapshot(self) -> dict:
+        """Current probe state as a dictionary."""
+        with self._lock:
+            return {
+                "status": self._status,
+                "engine": settings.DB_ENGINE,
+                "latency_ms": self._latency_ms,
+                "checked_at": self._checked_at.isoformat(timespec="seconds") if self._checked_at else None,
+                "consecutive_failures": self._consecutive_failures,
+                "error": self._error,
+            }
+
+
+# Process-wide probe (started by the app lifespan)
+database_probe = DatabaseProbe()
+
+REGISTRY.gauge(
+    "pms_db_up", "Database reachable according to the readiness probe (1 up, 0 down/unknown).",
+    collect=lambda: {(): 1 if database_probe.status == "up" else 0}
+)
@@ -0,0 +1,116 @@
+"""
+Embedded SQLite connection with the mysql.connector interface.
+
+Wraps sqlite3 with the subset of the mysql.connector API the repositories
+use (format-style %s parameters, cursor(buffered=...), is_connected,
+start_transaction, ...), so the same repository code runs on both engines.
+"""
+
+from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+import sqlite3
+import threading
+
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()[:10]))
+
+
+class SQLiteCursor:
+    """Cursor with the mysql.connector interface used by the repositories."""
+    
+    def __init__(self, connection: "SQLiteConnection", buffered: bool = True):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self._buffered = buffered
+        self._rows: Optional[list] = None
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+    
+    def execute(self, query: str, params=()):
+        """Execute a query written with %s placeholders."""
+        with self._connection.lock:
+            self._cursor.execute(query.replace("%s", "?"), tuple(params or ()))
+            self.description = self._cursor.description
+            self.rowcount = self._cursor.rowcount
+            self.lastrowid = self._cursor.lastrowid
+            # Buffered cursors read everything while holding the lock
+            self._rows = self._cursor.fetchall() if self._buffered and self.description else None
+    
+    def executemany(self, query: str, seq_params):
+        """Execute a query for each parameter tuple."""
+        with self._connection.lock:
+            self._cursor.executemany(query.replace("%s", "?"), [tuple(p) for p in seq_params])
+            self.rowcount = self._cursor.rowcount
+    
+    def fetchone(self):
+        if self._rows is not None:
+            return self._rows.pop(0) if self._rows else None
+        return self._cursor.fetchone()
+    
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        return self._cursor.fetchall()
+    
+    def fetchmany(self, size: int):
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        return self._cursor.fetchmany(size)
+    
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """
+    sqlite3 connection exposing the mysql.connector methods the repositories call.
+    
+    Runs in autocommit mode like the MySQL connection; start_transaction opens
+    an explicit transaction. A lock serializes statements, because the shared
+    connection is used from several threads.
+    """
+    
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.raw = sqlite3.connect(
+            path,
+            timeout=timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.raw.execute("PRAGMA journal_mode=WAL")
+        self.raw.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self._open = True
+    
+    def cursor(self, buffered: bool = True) -> SQLiteCursor:
+        return SQLiteCursor(self, buffered=buffered)
+    
+    def is_connected(self) -> bool:
+        return self._open
+    
+    def start_transaction(self):
+        with self.lock:
+            self.raw.execute("BEGIN IMMEDIATE")
+    
+    def commit(self):
+        with self.lock:
+            if self.raw.in_transaction:
+                self.raw.execute("COMMIT")
+    
+    def rollback(self):
+        with self.lock:
+            if self.raw.in_transaction:
+                self.raw.execute("ROLLBACK")
+    
+    def close(self):
+        if self._open:
+            self.raw.close()
+            self._open = False
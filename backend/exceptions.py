@@ -0,0 +1,26 @@
+"""
+Domain errors raised by services and repositories.
+Routers map them to HTTP status codes.
+"""
+
+from typing import List
+
+
+class BookingConflictError(ValueError):
+    """A booking would take nights already taken in the same property (409)."""
+    
+    def __init__(self, message: str, conflicting_ids: List[int] = None):
+        super().__init__(message)
+        self.conflicting_ids = conflicting_ids or []
+
+
+class VersionConflictError(ValueError):
+    """The record changed since the version the client read (409)."""
+    
+    def __init__(self, message: str, current_version: int = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
+class JobQueueFullError(Exception):
+    """Too many background jobs queued or running (429)."""
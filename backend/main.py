@@ -2,13 +2,37 @@
 FastAPI backend for Property Management System.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings
-from backend.routers import bookings
+from backend.coordination import get_coordinator
+from backend.routers import bookings, analytics, admin, health, properties, availability, dashboard, jobs
+from backend.database.health import database_probe
+from backend.services.job_runner import job_runner
+from backend.observability.middleware import TimingMiddleware, TimedRoute
+from backend.observability.metrics import REGISTRY
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background database probe, coordination events and job runner while the app is up."""
+    coordinator = get_coordinator()
+    if settings.WORKERS > 1 and coordinator.name == "local":
+        print("⚠️ WORKERS > 1 with COORDINATION_BACKEND=local: writes are not visible to other workers' caches.")
+    coordinator.start()
+    database_probe.start()
+    job_runner.fail_abandoned()
+    yield
+    job_runner.shutdown()
+    database_probe.stop()
+    coordinator.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="REST API for Property Management System",
@@ -16,6 +40,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Name app-level routes in request metrics too
+app.router.route_class = TimedRoute
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +52,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request timing (outermost, so it also covers CORS handling)
+app.add_middleware(TimingMiddleware, server_timing_header=settings.SERVER_TIMING_HEADER)
+
 # Include routers
 app.include_router(bookings.router, prefix=settings.API_PREFIX)
+app.include_router(properties.router, prefix=settings.API_PREFIX)
+app.include_router(availability.router, prefix=settings.API_PREFIX)
+app.include_router(dashboard.router, prefix=settings.API_PREFIX)
+app.include_router(jobs.router, prefix=settings.API_PREFIX)
+app.include_router(analytics.router, prefix=settings.API_PREFIX)
+app.include_router(admin.router, prefix=settings.API_PREFIX)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -42,10 +79,17 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check (kept for existing health checks; see /health/live and /health/ready)."""
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (text exposition format)."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need the import string (each process imports the app itself)
+    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, workers=settings.WORKERS)
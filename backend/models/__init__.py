@@ -3,6 +3,18 @@ Data models for the application.
 Contains Pydantic models for validation and serialization.
 """
 
-from .booking import Booking, BookingCreate, BookingUpdate
+from .booking import Booking, BookingBatchResponse, BookingCreate, BookingUpdate, BookingFilter
+from .property import Property, PropertyCreate
+from .availability import AvailabilityResponse, OccupancyGrid, UnitOccupancy
+from .dashboard import DashboardCounts, DashboardResponse
+from .job import Job, JobCreate
+from .stats import BookingStats, BookingStatsGroup, BookingStatsResponse
 
-__all__ = ["Booking", "BookingCreate", "BookingUpdate"]
+__all__ = [
+    "Booking", "BookingBatchResponse", "BookingCreate", "BookingUpdate", "BookingFilter",
+    "Property", "PropertyCreate",
+    "AvailabilityResponse", "OccupancyGrid", "UnitOccupancy",
+    "DashboardCounts", "DashboardResponse",
+    "Job", "JobCreate",
+    "BookingStats", "BookingStatsGroup", "BookingStatsResponse",
+]
@@ -0,0 +1,29 @@
+"""
+Pydantic models for analytics responses.
+"""
+
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Optional
+
+
+class OccupancyDay(BaseModel):
+    """Occupancy and revenue for a single night."""
+    
+    stay_date: date = Field(..., description="Night of the stay")
+    in_house: int = Field(0, description="Bookings in house that night (nights sold)")
+    guests: int = Field(0, description="Guests in house that night")
+    revenue: float = Field(0.0, description="Revenue attributed to that night")
+    adr: Optional[float] = Field(None, description="Average daily rate (revenue / nights sold)")
+
+
+class OccupancyReport(BaseModel):
+    """Occupancy report for a period, read from the daily rollup."""
+    
+    start_date: date
+    end_date: date
+    booking_id: Optional[str] = Field(None, description="Booking ID/unit filter, if any")
+    nights_sold: int = Field(0, description="Total nights sold in the period")
+    revenue: float = Field(0.0, description="Total revenue in the period")
+    adr: Optional[float] = Field(None, description="Average daily rate for the period")
+    days: List[OccupancyDay] = Field(default_factory=list)
@@ -0,0 +1,40 @@
+"""
+Pydantic models for availability search responses.
+"""
+
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Optional
+from backend.models.property import Property
+
+
+class AvailabilityResponse(BaseModel):
+    """Units free for a whole stay."""
+    
+    check_in: date
+    check_out: date
+    nights: int = Field(..., description="Nights of the stay")
+    guests: int = Field(1, description="Guests to accommodate")
+    total_units: int = Field(0, description="Units considered")
+    available_count: int = Field(0, description="Units free for the whole stay")
+    available: List[Property] = Field(default_factory=list)
+
+
+class UnitOccupancy(BaseModel):
+    """Taken nights of one unit."""
+    
+    property_id: int
+    code: str
+    occupied_nights: int = Field(0, description="Nights taken in the period")
+    nights: str = Field("", description="One character per night: '1' taken, '0' free")
+
+
+class OccupancyGrid(BaseModel):
+    """Taken nights per unit and units in house per night, from the occupancy engine."""
+    
+    start_date: date
+    end_date: date
+    in_house: List[int] = Field(default_factory=list, description="Units taken per night")
+    occupied_nights: int = Field(0, description="Nights taken in the period (all units)")
+    occupancy_rate: Optional[float] = Field(None, description="Taken nights / available nights")
+    units: List[UnitOccupancy] = Field(default_factory=list)
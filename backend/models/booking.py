@@ -5,7 +5,7 @@ Provides validation, serialization, and type safety.
 
 from pydantic import BaseModel, Field, EmailStr, field_validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 
@@ -34,6 +34,9 @@ class BookingBase(BaseModel):
     
     # Additional
     booking_number: Optional[str] = Field(None, description="Platform booking number")
+    property_id: Optional[int] = Field(
+        None, description="Property (unit) ID; resolved from booking_id when omitted"
+    )
     
     @field_validator('check_out')
     @classmethod
@@ -59,6 +62,7 @@ class Booking(BookingBase):
     """Complete booking model with database ID."""
     
     record_id: int = Field(..., description="Database record ID")
+    version: Optional[int] = Field(None, description="Row version, bumped by every update (ETag)")
     electric_allowance: Optional[float] = Field(None, description="Electric allowance if applicable")
     
     class Config:
@@ -80,6 +84,7 @@ class Booking(BookingBase):
                 "price": 500.0,
                 "charges": 50.0,
                 "booking_number": "AIRBNB123",
+                "property_id": 1,
                 "electric_allowance": 20.0
             }
         }
@@ -91,7 +96,12 @@ class BookingCreate(BookingBase):
 
 
 class BookingUpdate(BaseModel):
-    """Model for updating an existing booking. All fields are optional."""
+    """
+    Model for updating an existing booking. All fields are optional.
+    
+    PUT ignores fields sent as None; PATCH writes only the fields present in
+    the request, so null clears a field.
+    """
     
     booking_id: Optional[str] = None
     guest_name: Optional[str] = None
@@ -107,6 +117,17 @@ class BookingUpdate(BaseModel):
     email: Optional[str] = None
     phone: Optional[str] = None
     booking_number: Optional[str] = None
+    property_id: Optional[int] = None
+    
+    # Optimistic concurrency: the version the client read (alternative to If-Match)
+    version: Optional[int] = Field(None, description="Expected row version; 409 if the booking changed since")
+
+
+class BookingBatchResponse(BaseModel):
+    """Bookings fetched by record ID, in request order."""
+    
+    bookings: List[Booking] = Field(..., description="Bookings found, in the order requested")
+    missing: List[int] = Field(default_factory=list, description="Requested record IDs that do not exist")
 
 
 class BookingFilter(BaseModel):
@@ -114,5 +135,17 @@ class BookingFilter(BaseModel):
     
     start_date: Optional[date] = Field(None, description="Filter bookings from this date")
     end_date: Optional[date] = Field(None, description="Filter bookings until this date")
-    status: Optional[str] = Field(None, description="Filter by status")
+    status: Optional[List[str]] = Field(None, description="Filter by one or more statuses")
     booking_id: Optional[str] = Field(None, description="Filter by booking ID")
+    property_id: Optional[int] = Field(None, description="Filter by property (unit) ID")
+    
+    # Search filters
+    guest_name: Optional[str] = Field(None, description="Guest name contains this text")
+    booking_number: Optional[str] = Field(None, description="Booking number contains this text")
+    email: Optional[str] = Field(None, description="Email contains this text")
+    check_in_from: Optional[date] = Field(None, description="Check-in on or after this date")
+    check_in_to: Optional[date] = Field(None, description="Check-in on or before this date")
+    check_out_from: Optional[date] = Field(None, description="Check-out on or after this date")
+    check_out_to: Optional[date] = Field(None, description="Check-out on or before this date")
+    min_nights: Optional[int] = Field(None, ge=0, description="Minimum number of nights")
+    max_nights: Optional[int] = Field(None, ge=0, description="Maximum number of nights")
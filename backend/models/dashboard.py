@@ -0,0 +1,34 @@
+"""
+Pydantic models for the overview dashboard response.
+"""
+
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List
+from backend.models.booking import Booking
+
+
+class DashboardCounts(BaseModel):
+    """Headline numbers of the overview."""
+    
+    in_house: int = Field(0, description="Bookings currently staying")
+    arrivals_today: int = Field(0, description="Check-ins today")
+    departures_today: int = Field(0, description="Check-outs today")
+    upcoming_checkins: int = Field(0, description="Check-ins in the look-ahead window")
+    upcoming_checkouts: int = Field(0, description="Check-outs in the look-ahead window")
+    period_bookings: int = Field(0, description="Bookings overlapping the calendar period")
+    period_cancelled: int = Field(0, description="Cancelled bookings overlapping the calendar period")
+
+
+class DashboardResponse(BaseModel):
+    """Everything the overview page shows, from one bookings query."""
+    
+    today: date
+    start_date: date = Field(..., description="First day of the calendar period")
+    end_date: date = Field(..., description="Last day of the calendar period")
+    days: int = Field(..., description="Look-ahead window for check-ins/check-outs")
+    counts: DashboardCounts
+    active: List[Booking] = Field(default_factory=list)
+    upcoming_checkins: List[Booking] = Field(default_factory=list)
+    upcoming_checkouts: List[Booking] = Field(default_factory=list)
+    calendar_events: List[dict] = Field(default_factory=list)
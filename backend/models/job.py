@@ -0,0 +1,46 @@
+"""
+Pydantic models for background jobs.
+"""
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# progress(fraction or None, message or None), passed by the job runner to
+# long-running operations
+Progress = Callable[[Optional[float], Optional[str]], None]
+
+
+class JobCreate(BaseModel):
+    """Request to run a job."""
+    
+    kind: str = Field(..., description="Job kind, e.g. 'export' or 'rebuild_occupancy'")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Job parameters")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "kind": "export",
+                "params": {"format": "csv", "filters": {"status": ["Confirmed"]}}
+            }
+        }
+
+
+class Job(BaseModel):
+    """A background job and its progress."""
+    
+    id: str
+    kind: str
+    status: str = Field("queued", description="queued, running, succeeded or failed")
+    progress: float = Field(0.0, ge=0, le=1, description="Fraction done (0-1)")
+    message: Optional[str] = Field(None, description="Latest progress message")
+    params: Dict[str, Any] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
@@ -0,0 +1,36 @@
+"""
+Pydantic models for Property entity (a rentable unit, e.g. "R106").
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class PropertyBase(BaseModel):
+    """Base property model with common fields."""
+    
+    code: str = Field(..., min_length=1, max_length=64, description="Unit code, as used in bookings' booking_id")
+    name: Optional[str] = Field(None, max_length=255, description="Display name")
+    capacity: Optional[int] = Field(None, ge=1, description="Maximum guests (no limit if unset)")
+
+
+class Property(PropertyBase):
+    """Complete property model with database ID."""
+    
+    property_id: int = Field(..., description="Database property ID")
+    
+    class Config:
+        from_attributes = True
+        json_schema_extra = {
+            "example": {
+                "property_id": 1,
+                "code": "R106",
+                "name": "Apartment 106",
+                "capacity": 4
+            }
+        }
+
+
+class PropertyCreate(PropertyBase):
+    """Model for creating a new property."""
+    pass
@@ -0,0 +1,52 @@
+"""
+Pydantic models for booking statistics.
+Aggregates are computed in the database and returned without row data.
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class BookingStats(BaseModel):
+    """Aggregated figures for a set of bookings."""
+    
+    total_bookings: int = Field(0, description="Number of bookings")
+    total_nights: int = Field(0, description="Sum of nights")
+    total_revenue: Optional[float] = Field(None, description="Sum of prices (None if no prices)")
+    average_price: Optional[float] = Field(None, description="Average price (None if no prices)")
+
+
+class BookingStatsGroup(BookingStats):
+    """Aggregated figures for one group (month, status or booking ID)."""
+    
+    key: Optional[str] = Field(None, description="Group key")
+
+
+class BookingStatsResponse(BaseModel):
+    """Statistics response with overall summary and optional groups."""
+    
+    summary: BookingStats
+    group_by: Optional[str] = Field(None, description="Grouping applied to 'groups'")
+    groups: List[BookingStatsGroup] = Field(default_factory=list)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "summary": {
+                    "total_bookings": 42,
+                    "total_nights": 180,
+                    "total_revenue": 15400.0,
+                    "average_price": 366.67
+                },
+                "group_by": "status",
+                "groups": [
+                    {
+                        "key": "Confirmed",
+                        "total_bookings": 40,
+                        "total_nights": 172,
+                        "total_revenue": 14800.0,
+                        "average_price": 370.0
+                    }
+                ]
+            }
+        }
@@ -0,0 +1,21 @@
+"""
+Request timing and instrumentation.
+"""
+
+from .timing import current_timing, timed, timings_snapshot, reset_timings
+from .metrics import REGISTRY, record_cache_lookup
+from .middleware import TimingMiddleware, TimedRoute
+from .queries import query_log, fingerprint
+
+__all__ = [
+    "current_timing",
+    "timed",
+    "timings_snapshot",
+    "reset_timings",
+    "REGISTRY",
+    "record_cache_lookup",
+    "TimingMiddleware",
+    "TimedRoute",
+    "query_log",
+    "fingerprint",
+]
@@ -0,0 +1,128 @@
+"""
+Database connection wrapper that times every statement.
+
+Execute and fetch time is attributed to the "db" layer of the current
+request (one QueryTiming per statement) and recorded in the query metrics,
+labelled with the repository method that issued the statement. With
+SLOW_QUERY_LOG enabled, statements also go to the slow-query log.
+"""
+
+import sys
+import time
+from backend.observability.metrics import DB_CONNECTIONS_OPEN, DB_QUERY_SECONDS, DB_ROWS
+from backend.observability.queries import query_log
+from backend.observability.timing import current_timing, timed
+
+
+class InstrumentedCursor:
+    """Cursor proxy recording per-statement time and row counts."""
+    
+    def __init__(self, cursor, connection=None):
+        self._cursor = cursor
+        self._connection = connection
+        self._operation = None
+        self._duration = 0.0
+        self._rows = 0
+        self._query = None
+        self._sql = None
+        self._params = None
+    
+    def execute(self, query, params=None):
+        self._start_statement(query, params, sys._getframe(1))
+        return self._timed(self._cursor.execute, query, params)
+    
+    def executemany(self, query, seq_params):
+        self._start_statement(query, None, sys._getframe(1))
+        return self._timed(self._cursor.executemany, query, seq_params)
+    
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        self._count_rows(1 if row is not None else 0)
+        return row
+    
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._count_rows(len(rows))
+        return rows
+    
+    def fetchmany(self, size):
+        rows = self._timed(self._cursor.fetchmany, size)
+        self._count_rows(len(rows))
+        return rows
+    
+    def close(self):
+        # Close first so a sampled EXPLAIN does not meet unread results
+        result = self._cursor.close()
+        self._finish_statement()
+        return result
+    
+    def _start_statement(self, query: str, params, caller):
+        """Flush the previous statement and start a new one."""
+        self._finish_statement()
+        # Label with the calling method, e.g. "BookingRepository.get_all"
+        self._operation = caller.f_code.co_qualname
+        self._duration = 0.0
+        self._rows = 0
+        self._sql = query
+        self._params = params
+        timing = current_timing()
+        self._query = timing.add_query(query) if timing is not None else None
+    
+    def _finish_statement(self):
+        """Record the current statement in the query metrics."""
+        if self._operation is None:
+            return
+        DB_QUERY_SECONDS.observe(self._duration, operation=self._operation)
+        DB_ROWS.observe(self._rows, operation=self._operation)
+        if query_log.enabled:
+            query_log.record(
+                self._sql, self._params, self._operation, self._duration, self._rows, self._connection
+            )
+        self._operation = None
+        self._params = None
+    
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            if current_timing() is None:
+                return method(*args)
+            with timed("db"):
+                return method(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._duration += elapsed
+            if self._query is not None:
+                self._query.duration += elapsed
+    
+    def _count_rows(self, rows: int):
+        self._rows += rows
+        timing = current_timing()
+        if timing is None:
+            return
+        timing.rows += rows
+        if self._query is not None:
+            self._query.rows += rows
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are instrumented (counted in the open connections gauge)."""
+    
+    def __init__(self, connection):
+        self._connection = connection
+        self._open = True
+        DB_CONNECTIONS_OPEN.inc()
+    
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._connection)
+    
+    def close(self):
+        if self._open:
+            self._open = False
+            DB_CONNECTIONS_OPEN.dec()
+        return self._connection.close()
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
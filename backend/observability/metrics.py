@@ -0,0 +1,276 @@
+"""
+Minimal Prometheus metrics registry (text exposition format 0.0.4).
+
+Counters, gauges and histograms with labels, kept in process memory and
+rendered by GET /metrics. Gauges can be computed at scrape time.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import math
+import threading
+
+
+# Latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Payload size buckets in bytes (256 B .. 16 MB)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(9))
+
+# Rows per query
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+
+class _Metric(ABC):
+    """Base class: a named metric family with label names."""
+    
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _format_labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+    
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines of every series of the family."""
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return lines + self.samples()
+    
+    def reset(self):
+        """Drop all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+    
+    type_name = "counter"
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)} {_number(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down.
+    
+    With `collect`, values are computed at scrape time: the callable returns
+    {label tuple: value}.
+    """
+    
+    type_name = "gauge"
+    
+    def __init__(self, name, documentation, labelnames=(), collect: Optional[Callable[[], Dict]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+    
+    def samples(self) -> List[str]:
+        if self.collect is not None:
+            try:
+                items = sorted(self.collect().items())
+            except Exception:
+                return []
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)} {_number(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set."""
+    
+    type_name = "histogram"
+    
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets)}
+            entry["count"] += 1
+            entry["sum"] += value
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][index] += 1
+                    break
+    
+    def series(self) -> List[Tuple[Dict[str, str], dict]]:
+        """Copy of every series: (labels, {count, sum, buckets (non-cumulative)})."""
+        with self._lock:
+            return [
+                (dict(zip(self.labelnames, key)), {**entry, "buckets": list(entry["buckets"])})
+                for key, entry in sorted(self._values.items())
+            ]
+    
+    def quantile(self, entry: dict, quantile: float) -> Optional[float]:
+        """Upper bound of the bucket holding the quantile (None above the last bucket)."""
+        target = quantile * entry["count"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, entry["buckets"]):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+    
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, entry in self.series():
+            key = tuple(labels[name] for name in self.labelnames)
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {entry['count']}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(entry['sum'])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {entry['count']}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=(), collect=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value)) if abs(value) < 1e15 else repr(value)
+        return repr(value)
+    return str(value)
+
+
+# Process-wide registry
+REGISTRY = Registry()
+
+
+def _threadpool_usage() -> Dict[Tuple[str, ...], float]:
+    """Worker threads used by sync code (AnyIO default limiter of the running loop)."""
+    from anyio.to_thread import current_default_thread_limiter
+    limiter = current_default_thread_limiter()
+    return {("busy",): limiter.borrowed_tokens, ("size",): limiter.total_tokens}
+
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.counter(
+    "pms_http_requests_total", "HTTP requests handled.", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "pms_http_request_duration_seconds", "HTTP request latency.", ["method", "route"]
+)
+HTTP_LAYER_SECONDS = REGISTRY.histogram(
+    "pms_http_request_layer_seconds",
+    "Exclusive time per request layer (db, decode, service, serialize).",
+    ["method", "route", "layer"]
+)
+HTTP_RESPONSE_BYTES = REGISTRY.histogram(
+    "pms_http_response_size_bytes", "HTTP response body size.", ["method", "route"], buckets=SIZE_BUCKETS
+)
+HTTP_IN_PROGRESS = REGISTRY.gauge("pms_http_requests_in_progress", "HTTP requests being handled.")
+
+# Database
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "pms_db_query_duration_seconds", "SQL statement latency (execute + fetch) per repository method.", ["operation"]
+)
+DB_ROWS = REGISTRY.histogram(
+    "pms_db_rows_returned", "Rows fetched per SQL statement per repository method.", ["operation"], buckets=ROW_BUCKETS
+)
+DB_CONNECTIONS_OPEN = REGISTRY.gauge("pms_db_connections_open", "Open database connections (shared + dedicated).")
+
+# Worker pool and caches
+THREADPOOL_THREADS = REGISTRY.gauge(
+    "pms_threadpool_threads", "Threadpool for sync endpoints/streams: busy threads and size.", ["state"],
+    collect=_threadpool_usage
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "pms_cache_requests_total", "Cache lookups by cache and result (hit/miss).", ["cache", "result"]
+)
+
+# Derived tables kept up to date on each write
+OCCUPANCY_ROLLUP_ERRORS = REGISTRY.counter(
+    "pms_occupancy_rollup_errors_total",
+    "Failed occupancy_daily updates after a booking write (the rollup needs a rebuild).",
+    ["operation"]
+)
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1):
+    """Count cache lookups (hit ratio = hit / (hit + miss))."""
+    if count:
+        CACHE_REQUESTS.inc(count, cache=cache, result="hit" if hit else "miss")
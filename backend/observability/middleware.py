@@ -0,0 +1,114 @@
+"""
+ASGI middleware and route class for request timing.
+"""
+
+from typing import Callable
+import asyncio
+import functools
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from backend.observability.profiler import profiled, request_profiler
+from backend.observability.timing import current_timing, end_request, start_request, timed
+
+
+class TimingMiddleware:
+    """
+    Time every HTTP request, record request metrics and add a Server-Timing header.
+    
+    Pure ASGI (not BaseHTTPMiddleware) so streaming responses pass through
+    untouched. The header is written when the response starts; time spent
+    streaming the body afterwards still goes to the histograms.
+    
+    Requests with an `X-Profile` header and a valid `X-Admin-Token` run their
+    endpoint under cProfile; the report id is returned in `X-Profile-Id`.
+    """
+    
+    def __init__(self, app, server_timing_header: bool = True):
+        self.app = app
+        self.server_timing_header = server_timing_header
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timing, token = start_request(scope["method"])
+        capture = self._profile_capture(scope)
+        timing.profile = capture
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing.status = message["status"]
+                headers = MutableHeaders(scope=message)
+                if self.server_timing_header:
+                    headers.append("Server-Timing", timing.server_timing_header())
+                if capture is not None:
+                    headers.append("X-Profile-Id", capture["id"])
+            elif message["type"] == "http.response.body":
+                timing.response_bytes += len(message.get("body", b""))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(timing, token)
+            if capture is not None:
+                request_profiler.finish(capture, timing.status)
+    
+    @staticmethod
+    def _profile_capture(scope):
+        """cProfile capture for the request, if asked for by an admin (None otherwise)."""
+        headers = Headers(scope=scope)
+        if "x-profile" not in headers:
+            return None
+        from backend.routers.dependencies import is_admin_token
+        if not is_admin_token(headers.get("x-admin-token")):
+            return None
+        return request_profiler.begin(scope["method"], scope["path"])
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that names the request's route and times its layers.
+    
+    The endpoint function counts as "service" and the rest of the route
+    handler (parameter validation, response model serialization) as
+    "serialize"; SQL and row decoding inside are reported separately.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_name = self.path_format
+        
+        async def timed_handler(request: Request):
+            timing = current_timing()
+            if timing is not None:
+                timing.route = route_name
+            with timed("serialize"):
+                return await handler(request)
+        
+        return timed_handler
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """Wrap an endpoint so its own time counts as the "service" layer (and is profiled on request)."""
+    if getattr(endpoint, "__timed__", False):
+        return endpoint
+    
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with timed("service"), profiled():
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with timed("service"), profiled():
+                return endpoint(*args, **kwargs)
+    
+    wrapper.__timed__ = True
+    return wrapper
@@ -0,0 +1,214 @@
+"""
+Production profiling: a statistical sampler and per-request cProfile.
+
+The sampler reads every thread's Python stack from sys._current_frames() at
+a fixed interval and aggregates them as collapsed stacks
+("frame;frame;frame count"), the input format of flamegraph.pl and
+speedscope. Requests sent with an `X-Profile` header (and a valid admin
+token) run their endpoint under cProfile; the report is kept in memory and
+its id returned in the `X-Profile-Id` response header.
+"""
+
+from typing import Dict, List, Optional
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+import cProfile
+import io
+import itertools
+import pstats
+import sys
+import threading
+import time
+from backend.observability.timing import current_timing
+
+
+# Innermost frames of threads that are waiting, not working
+IDLE_FRAMES = {
+    ("threading", "Condition.wait"),
+    ("selectors", "EpollSelector.select"),
+    ("selectors", "KqueueSelector.select"),
+    ("selectors", "PollSelector.select"),
+    ("selectors", "SelectSelector.select"),
+}
+
+
+def _frame_label(frame) -> str:
+    """'module:Qualified.name' for a frame (no ';', which separates frames)."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}".replace(";", ",")
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads from a background thread (one run at a time)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._include_idle = False
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+    
+    def start(self, interval: float, include_idle: bool = False):
+        """
+        Start sampling.
+        
+        Args:
+            interval: Seconds between samples
+            include_idle: Also count threads blocked in waits/selects
+        
+        Raises:
+            RuntimeError: If a profile is already running
+        """
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("A profile is already running")
+            self._stop.clear()
+            self._stacks = Counter()
+            self._samples = 0
+            self._include_idle = include_idle
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self) -> dict:
+        """
+        Stop sampling.
+        
+        Returns:
+            {"samples": sampling rounds, "stacks": {collapsed stack: count}}
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        return {"samples": self._samples, "stacks": dict(self._stacks)}
+    
+    def _run(self, interval: float):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._collapse(frame)
+                if stack is not None:
+                    self._stacks[f"{names.get(thread_id, thread_id)};{stack}"] += 1
+            self._samples += 1
+    
+    def _collapse(self, frame) -> Optional[str]:
+        """Collapsed stack (outermost first), or None for an idle thread when excluded."""
+        if not self._include_idle:
+            code = frame.f_code
+            if (frame.f_globals.get("__name__"), code.co_qualname) in IDLE_FRAMES:
+                return None
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+def collapsed_text(stacks: Dict[str, int]) -> str:
+    """Render collapsed stacks, one "stack count" line each (heaviest first)."""
+    lines = [f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda item: -item[1])]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+class RequestProfiler:
+    """cProfile captures of single requests, keeping the most recent reports."""
+    
+    # Reports kept in memory
+    MAX_REPORTS = 20
+    
+    # Functions listed per report
+    REPORT_LINES = 60
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self._ids = itertools.count(1)
+        self._reports: "OrderedDict[str, dict]" = OrderedDict()
+    
+    def begin(self, method: str, path: str) -> Optional[dict]:
+        """
+        Reserve a capture for a request.
+        
+        cProfile allows one active profiler per thread, so captures do not
+        overlap: returns None while another request is being profiled.
+        """
+        if not self._busy.acquire(blocking=False):
+            return None
+        return {
+            "id": str(next(self._ids)),
+            "method": method,
+            "path": path,
+            "profile": cProfile.Profile(),
+            "started": time.perf_counter(),
+        }
+    
+    def finish(self, capture: dict, status: int):
+        """Store the report of a finished capture and release the profiler."""
+        try:
+            stream = io.StringIO()
+            try:
+                stats = pstats.Stats(capture["profile"], stream=stream)
+                stats.sort_stats("cumulative").print_stats(self.REPORT_LINES)
+            except TypeError:
+                # Nothing was profiled (the endpoint never ran)
+                stream.write("No profile data (the endpoint did not run).\n")
+            report = {
+                "id": capture["id"],
+                "method": capture["method"],
+                "path": capture["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - capture["started"]) * 1000, 2),
+                "captured_at": datetime.now().isoformat(timespec="seconds"),
+                "stats": stream.getvalue(),
+            }
+            with self._lock:
+                self._reports[capture["id"]] = report
+                while len(self._reports) > self.MAX_REPORTS:
+                    self._reports.popitem(last=False)
+        finally:
+            self._busy.release()
+    
+    def get(self, report_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._reports.get(report_id)
+    
+    def list(self) -> List[dict]:
+        """Kept reports without their stats text, newest first."""
+        with self._lock:
+            reports = list(self._reports.values())
+        return [{k: v for k, v in report.items() if k != "stats"} for report in reversed(reports)]
+
+
+@contextmanager
+def profiled():
+    """Run the block under the current request's cProfile capture, if any."""
+    timing = current_timing()
+    capture = timing.profile if timing is not None else None
+    if capture is None:
+        yield
+        return
+    
+    capture["profile"].enable()
+    try:
+        yield
+    finally:
+        capture["profile"].disable()
+
+
+# Process-wide profilers
+sampling_profiler = SamplingProfiler()
+request_profiler = RequestProfiler()
@@ -0,0 +1,188 @@
+"""
+Slow-query log and per-fingerprint query statistics (opt-in: SLOW_QUERY_LOG).
+
+Statements are grouped by fingerprint (literals and placeholders replaced by
+'?', IN lists collapsed). Statements slower than SLOW_QUERY_MS are logged
+with their parameters redacted, and a sample of them gets its EXPLAIN plan
+captured for the admin endpoint.
+"""
+
+from typing import Dict, List, Optional
+from datetime import date, datetime
+import random
+import re
+import threading
+import time
+from backend.config import settings
+
+
+# Backtick identifiers are kept; string/number literals and placeholders become '?'
+_TOKEN_RE = re.compile(r"(`[^`]*`)|'(?:[^'\\]|\\.|'')*'|(?<!\w)-?\d+(?:\.\d+)?\b|%s|\?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so executions with different values group together."""
+    sql = _TOKEN_RE.sub(lambda match: match.group(1) or "?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def redact(params) -> List[str]:
+    """Describe parameters by type only, so values never reach the logs."""
+    if not params:
+        return []
+    described = []
+    for value in params:
+        if value is None:
+            described.append("NULL")
+        elif isinstance(value, (date, datetime)):
+            described.append("<date>")
+        elif isinstance(value, (int, float)):
+            described.append("<number>")
+        else:
+            described.append(f"<{type(value).__name__}>")
+    return described
+
+
+class QueryLog:
+    """Aggregated statement statistics plus sampled plans of slow statements."""
+    
+    # Fingerprints kept (the least expensive are dropped beyond this)
+    MAX_FINGERPRINTS = 500
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, dict] = {}
+        self._last_explain: Dict[str, float] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return settings.SLOW_QUERY_LOG
+    
+    def record(self, sql: str, params, operation: str, duration: float, rows: int, connection=None):
+        """
+        Record one finished statement.
+        
+        Args:
+            sql: Statement as executed
+            params: Statement parameters (only used for EXPLAIN, never stored)
+            operation: Repository method that issued the statement
+            duration: Execute + fetch time in seconds
+            rows: Rows fetched
+            connection: Raw connection used to EXPLAIN sampled slow statements
+        """
+        key = fingerprint(sql)
+        slow = duration * 1000 >= settings.SLOW_QUERY_MS
+        
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.MAX_FINGERPRINTS:
+                    cheapest = min(self._stats, key=lambda k: self._stats[k]["total_seconds"])
+                    del self._stats[cheapest]
+                entry = self._stats[key] = {
+                    "fingerprint": key,
+                    "operations": set(),
+                    "calls": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "rows": 0,
+                    "slow_calls": 0,
+                    "last_slow_at": None,
+                    "plan": None,
+                }
+            entry["operations"].add(operation)
+            entry["calls"] += 1
+            entry["total_seconds"] += duration
+            entry["max_seconds"] = max(entry["max_seconds"], duration)
+            entry["rows"] += rows
+            if slow:
+                entry["slow_calls"] += 1
+                entry["last_slow_at"] = datetime.now().isoformat(timespec="seconds")
+        
+        if not slow:
+            return
+        
+        print(
+            f"🐢 Slow query ({duration * 1000:.1f} ms, {rows} rows) in {operation}: "
+            f"{key} params={redact(params)}"
+        )
+        if connection is not None and self._should_explain(key, sql):
+            plan = self._explain(connection, sql, params)
+            if plan is not None:
+                with self._lock:
+                    if key in self._stats:
+                        self._stats[key]["plan"] = plan
+    
+    def _should_explain(self, key: str, sql: str) -> bool:
+        """Sample EXPLAIN for SELECTs, at most once per fingerprint per interval."""
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return False
+        if random.random() >= settings.EXPLAIN_SAMPLE_RATE:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_explain.get(key, float("-inf")) < settings.EXPLAIN_MIN_INTERVAL:
+                return False
+            self._last_explain[key] = now
+        return True
+    
+    @staticmethod
+    def _explain(connection, sql: str, params) -> Optional[dict]:
+        """Run EXPLAIN for a statement on an uninstrumented cursor."""
+        from backend.database.engines import get_engine
+        
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.execute(get_engine().explain_sql(sql), params or ())
+            rows = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            return {
+                "captured_at": datetime.now().isoformat(timespec="seconds"),
+                "columns": columns,
+                "rows": [[None if value is None else str(value) for value in row] for row in rows],
+            }
+        except Exception as e:
+            print(f"⚠️ Could not EXPLAIN slow query: {e}")
+            return None
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+    
+    def snapshot(self) -> List[dict]:
+        """Statistics per fingerprint, most total time first."""
+        with self._lock:
+            entries = [dict(entry, operations=sorted(entry["operations"])) for entry in self._stats.values()]
+        
+        result = []
+        for entry in sorted(entries, key=lambda e: e["total_seconds"], reverse=True):
+            calls = entry["calls"]
+            result.append({
+                "fingerprint": entry["fingerprint"],
+                "operations": entry["operations"],
+                "calls": calls,
+                "total_ms": round(entry["total_seconds"] * 1000, 2),
+                "mean_ms": round(entry["total_seconds"] / calls * 1000, 2),
+                "max_ms": round(entry["max_seconds"] * 1000, 2),
+                "mean_rows": round(entry["rows"] / calls, 1),
+                "slow_calls": entry["slow_calls"],
+                "last_slow_at": entry["last_slow_at"],
+                "plan": entry["plan"],
+            })
+        return result
+    
+    def reset(self):
+        """Drop all statistics and plans."""
+        with self._lock:
+            self._stats.clear()
+            self._last_explain.clear()
+
+
+# Process-wide query log
+query_log = QueryLog()
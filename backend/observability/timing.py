@@ -0,0 +1,169 @@
+"""
+Per-request timing broken down by layer.
+
+Each request gets a RequestTiming (stored in a context variable) that the
+layers add to with `timed(layer)`. Nested layers record exclusive time, so
+"service" does not double count the SQL it triggers. Finished requests are
+folded into the request metrics (latency per route and per layer).
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from backend.observability.metrics import (
+    HTTP_IN_PROGRESS,
+    HTTP_LAYER_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_RESPONSE_BYTES,
+)
+
+
+# Layers reported in Server-Timing, in order
+LAYERS = ["db", "decode", "service", "serialize"]
+
+# Queries kept per request (the totals always include every query)
+MAX_QUERIES_PER_REQUEST = 200
+
+
+class QueryTiming:
+    """Time and rows for one SQL statement."""
+    
+    __slots__ = ("sql", "duration", "rows")
+    
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.duration = 0.0
+        self.rows = 0
+
+
+class RequestTiming:
+    """Timings collected while handling one request."""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.method = ""
+        self.route: Optional[str] = None
+        self.status = 500
+        self.response_bytes = 0
+        self.layers: Dict[str, float] = defaultdict(float)
+        self.queries: List[QueryTiming] = []
+        self.query_count = 0
+        self.rows = 0
+        # cProfile capture requested with the X-Profile header
+        self.profile: Optional[dict] = None
+        self._stack: List[float] = []
+    
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+    
+    def add_query(self, sql: str) -> Optional[QueryTiming]:
+        """Register a new statement; returns its record (None past the per-request cap)."""
+        self.query_count += 1
+        if len(self.queries) >= MAX_QUERIES_PER_REQUEST:
+            return None
+        query = QueryTiming(sql)
+        self.queries.append(query)
+        return query
+    
+    def server_timing_header(self) -> str:
+        """Format the timings as a Server-Timing header value (durations in ms)."""
+        parts = []
+        for layer in LAYERS:
+            if layer not in self.layers:
+                continue
+            entry = f"{layer};dur={self.layers[layer] * 1000:.1f}"
+            if layer == "db":
+                entry += f';desc="{self.query_count} queries, {self.rows} rows"'
+            parts.append(entry)
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """RequestTiming of the request being handled, or None outside requests."""
+    return _current.get()
+
+
+def start_request(method: str) -> Tuple[RequestTiming, object]:
+    """Start timing a request; returns (timing, token for end_request)."""
+    timing = RequestTiming()
+    timing.method = method
+    HTTP_IN_PROGRESS.inc()
+    return timing, _current.set(timing)
+
+
+def end_request(timing: RequestTiming, token):
+    """Stop timing a request and record it in the request metrics."""
+    _current.reset(token)
+    HTTP_IN_PROGRESS.dec()
+    
+    method, route = timing.method, timing.route or "unmatched"
+    HTTP_REQUESTS.inc(method=method, route=route, status=str(timing.status))
+    HTTP_REQUEST_SECONDS.observe(timing.elapsed(), method=method, route=route)
+    HTTP_RESPONSE_BYTES.observe(timing.response_bytes, method=method, route=route)
+    for layer, seconds in timing.layers.items():
+        HTTP_LAYER_SECONDS.observe(seconds, method=method, route=route, layer=layer)
+
+
+@contextmanager
+def timed(layer: str):
+    """
+    Attribute the time spent in the block to a layer of the current request.
+    
+    Time spent in nested timed blocks is subtracted, so every layer reports
+    exclusive time. No-op outside a request.
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    
+    started = time.perf_counter()
+    timing._stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        nested = timing._stack.pop()
+        timing.layers[layer] += elapsed - nested
+        if timing._stack:
+            timing._stack[-1] += elapsed
+
+
+def timings_snapshot() -> Dict[str, Dict[str, dict]]:
+    """
+    Latency summaries per route and layer (from the request metrics).
+    
+    Percentiles are histogram bucket upper bounds in ms (None above the last bucket).
+    """
+    def summary(histogram, entry):
+        def ms(quantile):
+            bound = histogram.quantile(entry, quantile)
+            return None if bound is None else round(bound * 1000, 2)
+        return {
+            "count": entry["count"],
+            "mean_ms": round(entry["sum"] / entry["count"] * 1000, 2),
+            "p50_ms": ms(0.50),
+            "p95_ms": ms(0.95),
+            "p99_ms": ms(0.99),
+        }
+    
+    result: Dict[str, Dict[str, dict]] = defaultdict(dict)
+    for labels, entry in HTTP_LAYER_SECONDS.series():
+        result[f"{labels['method']} {labels['route']}"][labels["layer"]] = summary(HTTP_LAYER_SECONDS, entry)
+    for labels, entry in HTTP_REQUEST_SECONDS.series():
+        result[f"{labels['method']} {labels['route']}"]["total"] = summary(HTTP_REQUEST_SECONDS, entry)
+    return dict(result)
+
+
+def reset_timings():
+    """Drop the request latency observations."""
+    HTTP_LAYER_SECONDS.reset()
+    HTTP_REQUEST_SECONDS.reset()
@@ -4,5 +4,7 @@ Contains abstractions for data access layer.
 """
 
 from .booking_repository import BookingRepository
+from .occupancy_repository import OccupancyRepository
+from .property_repository import PropertyRepository
 
-__all__ = ["BookingRepository"]
+__all__ = ["BookingRepository", "OccupancyRepository", "PropertyRepository"]
@@ -3,16 +3,70 @@ Repository for booking data access.
 Handles all database operations for bookings.
 """
 
-from typing import List, Optional, Tuple
-from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+import sqlite3
 import mysql.connector
-from backend.database.connection import get_connection
-from backend.models.booking import Booking, BookingCreate, BookingUpdate
+from backend.database.connection import (
+    discard_writer_connection,
+    get_connection,
+    new_connection,
+    writer_connection,
+)
+from backend.database.engines import get_engine
+from backend.exceptions import BookingConflictError, VersionConflictError
+from backend.observability.timing import timed
+from backend.models.booking import Booking, BookingCreate, BookingUpdate, BookingFilter
+from backend.models.job import Progress
 
 
 class BookingRepository:
-    """Repository for managing booking data in MySQL database."""
+    """Repository for managing booking data (MySQL or SQLite engine)."""
+    
+    # Columns used as group keys by get_stats (month is formatted by the engine)
+    STATS_GROUP_COLUMNS = {
+        'month': "`Check-In`",
+        'status': "`Status`",
+        'booking_id': "`Booking ID`",
+    }
+    
+    # Updatable booking fields -> columns
+    UPDATE_COLUMNS = {
+        'booking_id': '`Booking ID`',
+        'guest_name': '`Nombre,Apellidos`',
+        'check_in': '`Check-In`',
+        'check_out': '`Check-Out`',
+        'nights': '`Nº Noches`',
+        'persons': '`Nº Personas`',
+        'adults': '`Nº Adultos`',
+        'children': '`Nº Niños`',
+        'status': '`Status`',
+        'email': '`Email`',
+        'phone': '`Movil`',
+        'price': '`Precio`',
+        'charges': '`Comm y Cargos`',
+        'booking_number': '`Nº Booking`',
+        'property_id': 'property_id',
+    }
+    
+    # Night ledger: the (property_id, stay_date) primary key rejects a second
+    # booking of the same unit on the same night
+    LEDGER_COLUMNS = ["property_id", "stay_date", "record_id"]
+    
+    # Updates touching these fields move the booking's nights in the ledger
+    # (only when the stored values actually change)
+    LEDGER_FIELDS = ("property_id", "check_in", "check_out", "status")
+    
+    # Ledger rows are written in chunks to keep statements small
+    LEDGER_BATCH_SIZE = 1000
+    
+    # IDs per `WHERE ID IN (...)` statement in get_many
+    IN_BATCH_SIZE = 500
+    
+    # MySQL error raised when InnoDB breaks a lock cycle (two overlapping reservations)
+    MYSQL_DEADLOCK = 1213
     
     def __init__(self):
         """Initialize the repository."""
@@ -24,6 +78,35 @@ class BookingRepository:
             self.connection = get_connection()
         return self.connection
     
+    @contextmanager
+    def _transaction(self):
+        """
+        Cursor inside a transaction on this thread's writer connection.
+        
+        Committed when the block ends, rolled back on error. Writers do not
+        share the autocommit connection, so their transactions never mix.
+        """
+        conn = writer_connection()
+        try:
+            conn.start_transaction()
+        except Exception:
+            # Dropped while idle (e.g. MySQL wait_timeout): retry once on a new connection
+            discard_writer_connection()
+            conn = writer_connection()
+            conn.start_transaction()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard_writer_connection()
+            raise
+        finally:
+            cursor.close()
+    
     @staticmethod
     def _safe_convert_value(value):
         """Convert problematic values for serialization."""
@@ -38,12 +121,13 @@ class BookingRepository:
         else:
             return value
     
-    def get_all(self, limit: Optional[int] = None) -> List[Booking]:
+    def get_all(self, limit: Optional[int] = None, property_id: Optional[int] = None) -> List[Booking]:
         """
         Get all bookings from database.
         
         Args:
             limit: Optional limit for number of results
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of Booking objects
@@ -53,20 +137,18 @@ class BookingRepository:
         
         try:
             query = "SELECT * FROM bookings"
+            params = []
+            if property_id is not None:
+                query += " WHERE property_id = %s"
+                params.append(property_id)
             if limit:
                 query += f" LIMIT {limit}"
             
-            cursor.execute(query)
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             columns = [desc[0] for desc in cursor.description]
             
-            bookings = []
-            for row in rows:
-                booking_dict = self._row_to_dict(columns, row)
-                if booking_dict:
-                    bookings.append(Booking(**booking_dict))
-            
-            return bookings
+            return self._rows_to_bookings(columns, rows)
             
         finally:
             cursor.close()
@@ -93,20 +175,61 @@ class BookingRepository:
                 return None
             
             columns = [desc[0] for desc in cursor.description]
-            booking_dict = self._row_to_dict(columns, row)
+            bookings = self._rows_to_bookings(columns, [row])
             
-            return Booking(**booking_dict) if booking_dict else None
+            return bookings[0] if bookings else None
             
         finally:
             cursor.close()
     
-    def get_by_date_range(self, start_date: date, end_date: date) -> List[Booking]:
+    def get_many(self, record_ids: List[int]) -> Dict[int, Booking]:
+        """
+        Get several bookings by record ID in a few `WHERE ID IN (...)` queries.
+        
+        Args:
+            record_ids: Database record IDs
+            
+        Returns:
+            Dict of record ID -> Booking (IDs not found are absent)
+        """
+        ids = list(dict.fromkeys(record_ids))
+        found: Dict[int, Booking] = {}
+        if not ids:
+            return found
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            for i in range(0, len(ids), self.IN_BATCH_SIZE):
+                chunk = ids[i:i + self.IN_BATCH_SIZE]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"SELECT * FROM bookings WHERE ID IN ({placeholders})", chunk)
+                rows = cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description]
+                for booking in self._rows_to_bookings(columns, rows):
+                    found[booking.record_id] = booking
+            return found
+            
+        finally:
+            cursor.close()
+    
+    def get_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[int] = None
+    ) -> List[Booking]:
         """
         Get bookings within a date range.
         
+        With property_id only that property's rows are read, through the
+        (property_id, Check-In, Check-Out) index.
+        
         Args:
             start_date: Start of date range
             end_date: End of date range
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of Booking objects
@@ -115,130 +238,328 @@ class BookingRepository:
         cursor = conn.cursor()
         
         try:
-            query = """
+            property_sql = ""
+            params = [end_date, start_date]
+            if property_id is not None:
+                property_sql = "property_id = %s AND "
+                params = [property_id] + params
+            query = f"""
                 SELECT * FROM bookings 
-                WHERE (`Check-In` <= %s AND `Check-Out` >= %s)
+                WHERE {property_sql}(`Check-In` <= %s AND `Check-Out` >= %s)
                 ORDER BY `Check-In`
             """
-            cursor.execute(query, (end_date, start_date))
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             columns = [desc[0] for desc in cursor.description]
             
-            bookings = []
-            for row in rows:
-                booking_dict = self._row_to_dict(columns, row)
-                if booking_dict:
-                    bookings.append(Booking(**booking_dict))
-            
-            return bookings
+            return self._rows_to_bookings(columns, rows)
             
         finally:
             cursor.close()
     
-    def create(self, booking: BookingCreate) -> Booking:
+    def search(self, filters: Optional[BookingFilter] = None) -> List[Booking]:
         """
-        Create a new booking.
+        Search bookings using a BookingFilter.
         
         Args:
-            booking: BookingCreate object with booking data
+            filters: Optional BookingFilter to restrict the bookings
             
         Returns:
-            Created Booking object with record_id
+            List of Booking objects ordered by check-in
         """
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            query = """
-                INSERT INTO bookings 
-                (`Booking ID`, `Nombre,Apellidos`, `Check-In`, `Check-Out`, 
-                 `Nº Noches`, `Nº Personas`, `Nº Adultos`, `Nº Niños`, 
-                 `Status`, `Email`, `Movil`, `Precio`, `Comm y Cargos`, `Nº Booking`)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            values = (
-                booking.booking_id,
-                booking.guest_name,
-                booking.check_in,
-                booking.check_out,
-                booking.nights,
-                booking.persons,
-                booking.adults,
-                booking.children,
-                booking.status,
-                booking.email,
-                booking.phone,
-                booking.price,
-                booking.charges,
-                booking.booking_number
-            )
-            
-            cursor.execute(query, values)
-            conn.commit()
+            where_sql, params = self._build_filter_clause(filters)
+            query = f"SELECT * FROM bookings{where_sql} ORDER BY `Check-In`, ID"
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
             
-            # Get the created booking
-            record_id = cursor.lastrowid
-            return self.get_by_id(record_id)
+            return self._rows_to_bookings(columns, rows)
             
         finally:
             cursor.close()
     
-    def update(self, record_id: int, booking: BookingUpdate) -> Optional[Booking]:
+    def get_stats(
+        self,
+        filters: Optional[BookingFilter] = None,
+        group_by: Optional[str] = None
+    ) -> Tuple[dict, List[dict]]:
         """
-        Update an existing booking.
+        Get aggregated booking statistics computed in the database.
         
         Args:
-            record_id: Database record ID
-            booking: BookingUpdate object with fields to update
-            
+            filters: Optional BookingFilter to restrict the bookings
+            group_by: Optional grouping ('month', 'status' or 'booking_id')
+        
         Returns:
-            Updated Booking object or None if not found
+            Tuple of (summary dict, list of group dicts with 'key')
+        
+        Raises:
+            ValueError: If group_by is not supported
         """
+        if group_by is not None and group_by not in self.STATS_GROUP_COLUMNS:
+            raise ValueError(f"Unsupported group_by '{group_by}'")
+        
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            
-            field_mapping = {
-                'booking_id': '`Booking ID`',
-                'guest_name': '`Nombre,Apellidos`',
-                'check_in': '`Check-In`',
-                'check_out': '`Check-Out`',
-                'nights': '`Nº Noches`',
-                'persons': '`Nº Personas`',
-                'adults': '`Nº Adultos`',
-                'children': '`Nº Niños`',
-                'status': '`Status`',
-                'email': '`Email`',
-                'phone': '`Movil`',
-                'price': '`Precio`',
-                'charges': '`Comm y Cargos`',
-                'booking_number': '`Nº Booking`'
-            }
-            
-            for field, db_column in field_mapping.items():
-                value = getattr(booking, field)
-                if value is not None:
-                    update_fields.append(f"{db_column} = %s")
-                    values.append(value)
-            
-            if not update_fields:
-                return self.get_by_id(record_id)
+            where_sql, params = self._build_filter_clause(filters)
+            aggregates = """
+                COUNT(*),
+                COALESCE(SUM(`Nº Noches`), 0),
+                SUM(`Precio`),
+                AVG(`Precio`)
+            """
             
-            values.append(record_id)
-            query = f"UPDATE bookings SET {', '.join(update_fields)} WHERE ID = %s"
+            cursor.execute(f"SELECT {aggregates} FROM bookings{where_sql}", params)
+            summary = self._stats_row_to_dict(cursor.fetchone())
+            
+            groups = []
+            if group_by:
+                key_expr = self.STATS_GROUP_COLUMNS[group_by]
+                if group_by == 'month':
+                    key_expr = get_engine().month_expression(key_expr)
+                query = f"""
+                    SELECT {key_expr} AS group_key, {aggregates}
+                    FROM bookings{where_sql}
+                    GROUP BY group_key
+                    ORDER BY group_key
+                """
+                cursor.execute(query, params)
+                for row in cursor.fetchall():
+                    group = self._stats_row_to_dict(row[1:])
+                    group["key"] = None if row[0] is None else str(row[0])
+                    groups.append(group)
+            
+            return summary, groups
+        
+        finally:
+            cursor.close()
+    
+    def get_occupied_intervals(self, from_date: date) -> List[Tuple]:
+        """
+        Get the stays of every property that end after a date (cancelled excluded).
+        
+        Args:
+            from_date: Only stays checking out after this date
+        
+        Returns:
+            List of (property_id, check_in, check_out) tuples
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+                SELECT property_id, `Check-In`, `Check-Out` FROM bookings
+                WHERE property_id IS NOT NULL AND `Check-Out` > %s
+                  AND (`Status` IS NULL OR LOWER(`Status`) <> 'cancelled')
+            """
+            cursor.execute(query, (from_date,))
+            return cursor.fetchall()
+        
+        finally:
+            cursor.close()
+    
+    def iter_batches(
+        self,
+        columns: List[str],
+        filters: Optional[BookingFilter] = None,
+        batch_size: int = 5000,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        Stream raw booking rows in fixed-size batches.
+        
+        Uses a dedicated connection with an unbuffered (server-side) cursor,
+        so memory stays bounded by batch_size regardless of the result size.
+        
+        Args:
+            columns: Database column names to select, in output order
+            filters: Optional BookingFilter to restrict the bookings
+            batch_size: Number of rows per batch
+            limit: Optional maximum number of rows
+        
+        Yields:
+            Lists of row tuples (values in the order of columns)
+        """
+        conn = new_connection()
+        cursor = conn.cursor(buffered=False)
+        
+        try:
+            where_sql, params = self._build_filter_clause(filters)
+            select_sql = ", ".join(f"`{column}`" for column in columns)
+            query = f"SELECT {select_sql} FROM bookings{where_sql} ORDER BY `Check-In`, ID"
+            if limit:
+                query += " LIMIT %s"
+                params = params + [limit]
+            cursor.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        
+        finally:
+            # Closing the connection discards any unread rows if the consumer stopped early
+            try:
+                cursor.close()
+            except Exception:
+                pass
+            conn.close()
+    
+    def create(self, booking: BookingCreate) -> Booking:
+        """
+        Create a new booking.
+        
+        Args:
+            booking: BookingCreate object with booking data
             
+        Returns:
+            Created Booking object with record_id
+        
+        Raises:
+            BookingConflictError: If a night is already taken in the property
+        """
+        query = """
+            INSERT INTO bookings 
+            (`Booking ID`, `Nombre,Apellidos`, `Check-In`, `Check-Out`, 
+             `Nº Noches`, `Nº Personas`, `Nº Adultos`, `Nº Niños`, 
+             `Status`, `Email`, `Movil`, `Precio`, `Comm y Cargos`, `Nº Booking`, property_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        
+        values = (
+            booking.booking_id,
+            booking.guest_name,
+            booking.check_in,
+            booking.check_out,
+            booking.nights,
+            booking.persons,
+            booking.adults,
+            booking.children,
+            booking.status,
+            booking.email,
+            booking.phone,
+            booking.price,
+            booking.charges,
+            booking.booking_number,
+            booking.property_id
+        )
+        
+        # The booking and its nights are written in one transaction
+        with self._transaction() as cursor:
             cursor.execute(query, values)
-            conn.commit()
+            record_id = cursor.lastrowid
+            self._reserve_nights(
+                cursor, record_id, booking.property_id, booking.check_in, booking.check_out, booking.status
+            )
+        
+        # Get the created booking
+        return self.get_by_id(record_id)
+    
+    def update(
+        self,
+        record_id: int,
+        booking: BookingUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        """
+        Update an existing booking (fields left as None are not changed).
+        
+        Args:
+            record_id: Database record ID
+            booking: BookingUpdate object with fields to update
+            expected_version: Only update if the row is still at this version
             
-            return self.get_by_id(record_id)
+        Returns:
+            Updated Booking object or None if not found
+        
+        Raises:
+            BookingConflictError: If the new dates/property take an already taken night
+            VersionConflictError: If the row is no longer at expected_version
+        """
+        changes = {
+            field: getattr(booking, field)
+            for field in self.UPDATE_COLUMNS
+            if getattr(booking, field) is not None
+        }
+        return self.update_fields(record_id, changes, expected_version)
+    
+    def update_fields(
+        self,
+        record_id: int,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        """
+        Write only the given fields of a booking (None clears a column).
+        
+        Args:
+            record_id: Database record ID
+            changes: Booking field -> new value (keys of UPDATE_COLUMNS)
+            expected_version: Only update if the row is still at this version
             
-        finally:
-            cursor.close()
+        Returns:
+            Updated Booking object or None if not found
+        
+        Raises:
+            BookingConflictError: If the new dates/property take an already taken night
+            VersionConflictError: If the row is no longer at expected_version
+        """
+        # Build dynamic update query
+        update_fields = []
+        values = []
+        
+        for field, value in changes.items():
+            update_fields.append(f"{self.UPDATE_COLUMNS[field]} = %s")
+            values.append(value)
+        
+        if not update_fields:
+            return self.get_by_id(record_id)
+        
+        # Compare-and-set: every update bumps the version, and with an expected
+        # version the row only changes if nobody updated it in between
+        update_fields.append("version = version + 1")
+        where_sql = "ID = %s"
+        values.append(record_id)
+        if expected_version is not None:
+            where_sql += " AND version = %s"
+            values.append(expected_version)
+        query = f"UPDATE bookings SET {', '.join(update_fields)} WHERE {where_sql}"
+        stay_query = "SELECT property_id, `Check-In`, `Check-Out`, `Status` FROM bookings WHERE ID = %s"
+        
+        # The booking and its nights are updated in one transaction
+        with self._transaction() as cursor:
+            stay_before = None
+            if any(field in changes for field in self.LEDGER_FIELDS):
+                cursor.execute(stay_query, (record_id,))
+                stay_before = cursor.fetchone()
+            cursor.execute(query, values)
+            if cursor.rowcount == 0:
+                cursor.execute("SELECT version FROM bookings WHERE ID = %s", (record_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                raise VersionConflictError(
+                    f"Booking {record_id} was modified by someone else "
+                    f"(version {row[0]}, expected {expected_version})",
+                    row[0]
+                )
+            if stay_before is not None:
+                # Rewriting the same values (e.g. a full-form PUT) leaves the nights alone
+                cursor.execute(stay_query, (record_id,))
+                row = cursor.fetchone()
+                if row is not None and tuple(row) != tuple(stay_before):
+                    cursor.execute("DELETE FROM booking_nights WHERE record_id = %s", (record_id,))
+                    self._reserve_nights(cursor, record_id, *row)
+        
+        return self.get_by_id(record_id)
     
     def delete(self, record_id: int) -> bool:
         """
@@ -250,23 +571,249 @@ class BookingRepository:
         Returns:
             True if deleted, False if not found
         """
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM booking_nights WHERE record_id = %s", (record_id,))
+            cursor.execute("DELETE FROM bookings WHERE ID = %s", (record_id,))
+            return cursor.rowcount > 0
+    
+    def _reserve_nights(self, cursor, record_id: int, property_id, check_in, check_out, status):
+        """
+        Take the booking's nights in the ledger (inside the caller's transaction).
+        
+        Cancelled bookings and bookings without a property take no nights.
+        
+        Raises:
+            BookingConflictError: If a night is already taken in the property
+        """
+        if property_id is None or (status and status.lower() == 'cancelled'):
+            return
+        check_in, check_out = self._as_date(check_in), self._as_date(check_out)
+        # Ascending nights, so overlapping writers lock keys in the same order
+        nights = [
+            (property_id, check_in + timedelta(days=i), record_id)
+            for i in range((check_out - check_in).days)
+        ]
+        query = f"INSERT INTO booking_nights ({', '.join(self.LEDGER_COLUMNS)}) VALUES (%s, %s, %s)"
+        try:
+            for i in range(0, len(nights), self.LEDGER_BATCH_SIZE):
+                cursor.executemany(query, nights[i:i + self.LEDGER_BATCH_SIZE])
+        except (mysql.connector.Error, sqlite3.Error) as e:
+            if not self._is_conflict(e):
+                raise
+            conflicting = self.get_conflicting_ids(property_id, check_in, check_out, exclude_id=record_id)
+            raise self.conflict_error(property_id, check_in, check_out, conflicting) from None
+    
+    @staticmethod
+    def conflict_error(property_id: int, check_in, check_out, conflicting: List[int]) -> BookingConflictError:
+        """Error for a stay whose nights are held by the `conflicting` bookings."""
+        return BookingConflictError(
+            f"Property {property_id} is already booked between {check_in} and {check_out}"
+            + (f" (bookings {', '.join(map(str, conflicting))})" if conflicting else ""),
+            conflicting
+        )
+    
+    @classmethod
+    def _is_conflict(cls, error: Exception) -> bool:
+        """Duplicate ledger key, or a deadlock between overlapping reservations."""
+        return (
+            isinstance(error, (mysql.connector.IntegrityError, sqlite3.IntegrityError))
+            or getattr(error, "errno", None) == cls.MYSQL_DEADLOCK
+        )
+    
+    @staticmethod
+    def _as_date(value) -> date:
+        """Date from a DATE column value (date, datetime or ISO string)."""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
+    
+    def get_conflicting_ids(
+        self,
+        property_id: int,
+        check_in: date,
+        check_out: date,
+        exclude_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Get the bookings holding ledger nights of a property in [check_in, check_out).
+        
+        Args:
+            property_id: Property ID
+            check_in: First night
+            check_out: Night after the last one
+            exclude_id: Booking to leave out (the one being written)
+        
+        Returns:
+            Record IDs in ascending order
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            query = "DELETE FROM bookings WHERE ID = %s"
-            cursor.execute(query, (record_id,))
-            conn.commit()
-            
-            return cursor.rowcount > 0
-            
+            cursor.execute(
+                """
+                SELECT DISTINCT record_id FROM booking_nights
+                WHERE property_id = %s AND stay_date >= %s AND stay_date < %s AND record_id <> %s
+                ORDER BY record_id
+                """,
+                (property_id, check_in, check_out, exclude_id if exclude_id is not None else -1)
+            )
+            return [row[0] for row in cursor.fetchall()]
+        
         finally:
             cursor.close()
     
-    def _row_to_dict(self, columns: List[str], row: Tuple) -> Optional[dict]:
+    def rebuild_night_ledger(self, from_date: date, progress: Optional[Progress] = None) -> Tuple[int, int]:
+        """
+        Rebuild the night ledger from the bookings checking out after a date.
+        
+        Bookings are taken in ID order; nights already taken by an earlier
+        booking (double bookings made before the ledger existed) are skipped.
+        
+        Args:
+            from_date: Only bookings checking out after this date
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Tuple of (nights written, nights skipped as already taken)
+        """
+        insert = get_engine().insert_ignore("booking_nights", self.LEDGER_COLUMNS)
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM booking_nights")
+            cursor.execute(
+                """
+                SELECT ID, property_id, `Check-In`, `Check-Out` FROM bookings
+                WHERE property_id IS NOT NULL AND `Check-Out` > %s
+                  AND (`Status` IS NULL OR LOWER(`Status`) <> 'cancelled')
+                ORDER BY ID
+                """,
+                (from_date,)
+            )
+            nights = []
+            for record_id, property_id, check_in, check_out in cursor.fetchall():
+                check_in, check_out = self._as_date(check_in), self._as_date(check_out)
+                nights.extend(
+                    (property_id, check_in + timedelta(days=i), record_id)
+                    for i in range((check_out - check_in).days)
+                )
+            for i in range(0, len(nights), self.LEDGER_BATCH_SIZE):
+                cursor.executemany(insert, nights[i:i + self.LEDGER_BATCH_SIZE])
+                if progress:
+                    done = min(i + self.LEDGER_BATCH_SIZE, len(nights))
+                    progress(done / len(nights), f"{done}/{len(nights)} nights written")
+            cursor.execute("SELECT COUNT(*) FROM booking_nights")
+            written = cursor.fetchone()[0]
+        return written, len(nights) - written
+    
+    @staticmethod
+    def _build_filter_clause(filters: Optional[BookingFilter]) -> Tuple[str, list]:
+        """
+        Build a WHERE clause for a BookingFilter.
+        
+        Date predicates compare the raw `Check-In`/`Check-Out` columns so they
+        can use the date indexes.
+        
+        Args:
+            filters: BookingFilter or None
+        
+        Returns:
+            Tuple of (" WHERE ..." or empty string, list of parameters)
+        """
+        if filters is None:
+            return "", []
+        
+        conditions = []
+        params = []
+        
+        # Overlapping range (same semantics as get_by_date_range)
+        if filters.start_date:
+            conditions.append("`Check-Out` >= %s")
+            params.append(filters.start_date)
+        if filters.end_date:
+            conditions.append("`Check-In` <= %s")
+            params.append(filters.end_date)
+        
+        range_filters = [
+            ("`Check-In` >= %s", filters.check_in_from),
+            ("`Check-In` <= %s", filters.check_in_to),
+            ("`Check-Out` >= %s", filters.check_out_from),
+            ("`Check-Out` <= %s", filters.check_out_to),
+        ]
+        for condition, value in range_filters:
+            if value:
+                conditions.append(condition)
+                params.append(value)
+        
+        if filters.property_id is not None:
+            conditions.append("property_id = %s")
+            params.append(filters.property_id)
+        
+        if filters.booking_id:
+            conditions.append("`Booking ID` = %s")
+            params.append(filters.booking_id)
+        
+        if filters.status:
+            placeholders = ", ".join(["%s"] * len(filters.status))
+            conditions.append(f"`Status` IN ({placeholders})")
+            params.extend(filters.status)
+        
+        if filters.min_nights is not None:
+            conditions.append("`Nº Noches` >= %s")
+            params.append(filters.min_nights)
+        if filters.max_nights is not None:
+            conditions.append("`Nº Noches` <= %s")
+            params.append(filters.max_nights)
+        
+        text_filters = [
+            ("`Nombre,Apellidos`", filters.guest_name),
+            ("`Nº Booking`", filters.booking_number),
+            ("`Email`", filters.email),
+        ]
+        for column, value in text_filters:
+            if value:
+                conditions.append(f"LOWER({column}) LIKE %s")
+                params.append(f"%{value.lower()}%")
+        
+        if not conditions:
+            return "", []
+        
+        return " WHERE " + " AND ".join(conditions), params
+    
+    @staticmethod
+    def _stats_row_to_dict(row: Tuple) -> dict:
+        """Convert a (count, nights, revenue, average) row to a stats dictionary."""
+        count, nights, revenue, average = row
+        return {
+            "total_bookings": int(count or 0),
+            "total_nights": int(nights or 0),
+            "total_revenue": float(revenue) if revenue is not None else None,
+            "average_price": float(average) if average is not None else None,
+        }
+    
+    def _rows_to_bookings(self, columns: List[str], rows: List[Tuple]) -> List[Booking]:
+        """
+        Convert database rows to Booking objects, skipping rows that fail to convert.
+        
+        Timed as the "decode" layer of the current request.
+        """
+        with timed("decode"):
+            bookings = []
+            for row in rows:
+                booking_dict = self.row_to_dict(columns, row)
+                if booking_dict:
+                    bookings.append(Booking(**booking_dict))
+            return bookings
+    
+    def row_to_dict(self, columns: List[str], row: Tuple) -> Optional[dict]:
         """
         Convert database row to dictionary for Booking model.
         
+        Applies the defaults for missing values (guest name, status, persons,
+        adults, children). Every booking read goes through here, JSON and
+        Arrow/export alike, so they return the same rows and values.
+        
         Args:
             columns: List of column names
             row: Database row tuple
@@ -312,6 +859,8 @@ class BookingRepository:
                 "phone": self._safe_convert_value(row[col_map.get('Movil')]),
                 "price": self._safe_convert_value(row[col_map.get('Precio')]),
                 "charges": self._safe_convert_value(row[col_map.get('Comm y Cargos')]),
+                "property_id": row[col_map['property_id']] if 'property_id' in col_map else None,
+                "version": row[col_map['version']] if 'version' in col_map else None,
             }
             
         except Exception as e:
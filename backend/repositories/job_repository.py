@@ -0,0 +1,148 @@
+"""
+Repository for background job records.
+Jobs are stored so any worker can report a job started by another one.
+"""
+
+from typing import List, Optional
+from datetime import datetime
+import json
+import threading
+from backend.database.connection import new_connection
+from backend.models.job import Job
+
+
+class JobRepository:
+    """Repository for the `jobs` table (created on first use)."""
+    
+    TABLE_DDL = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id VARCHAR(32) NOT NULL PRIMARY KEY,
+            kind VARCHAR(64) NOT NULL,
+            status VARCHAR(16) NOT NULL,
+            progress DOUBLE NOT NULL DEFAULT 0,
+            message VARCHAR(255),
+            params TEXT,
+            result TEXT,
+            error TEXT,
+            created_at DATETIME NOT NULL,
+            started_at DATETIME NULL,
+            finished_at DATETIME NULL,
+            heartbeat_at DATETIME NULL
+        )
+    """
+    
+    COLUMNS = [
+        "id", "kind", "status", "progress", "message", "params", "result", "error",
+        "created_at", "started_at", "finished_at"
+    ]
+    
+    def __init__(self):
+        """Initialize the repository."""
+        # Used from job threads and request handlers: own connection, one statement at a time
+        self.connection = None
+        self._lock = threading.Lock()
+    
+    def _execute(self, query: str, params=(), fetch: bool = False):
+        with self._lock:
+            if self.connection is None or not self.connection.is_connected():
+                self.connection = new_connection()
+                cursor = self.connection.cursor()
+                try:
+                    cursor.execute(self.TABLE_DDL)
+                    self._add_heartbeat_column(cursor)
+                finally:
+                    cursor.close()
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall() if fetch else cursor.rowcount
+            finally:
+                cursor.close()
+    
+    @staticmethod
+    def _add_heartbeat_column(cursor):
+        """Add heartbeat_at to a jobs table created before it existed."""
+        try:
+            cursor.execute("SELECT heartbeat_at FROM jobs WHERE 1 = 0")
+            cursor.fetchall()
+        except Exception:
+            cursor.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at DATETIME NULL")
+    
+    def create(self, job: Job):
+        """Insert a new job."""
+        columns = self.COLUMNS + ["heartbeat_at"]
+        placeholders = ", ".join(["%s"] * len(columns))
+        self._execute(
+            f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders})",
+            self._values(job) + [self._now()]
+        )
+    
+    def update(self, job: Job):
+        """Write a job's status, progress and outcome (also a heartbeat)."""
+        columns = self.COLUMNS[1:] + ["heartbeat_at"]
+        assignments = ", ".join(f"{column} = %s" for column in columns)
+        self._execute(
+            f"UPDATE jobs SET {assignments} WHERE id = %s",
+            self._values(job)[1:] + [self._now(), job.id]
+        )
+    
+    def touch(self, job_ids: List[str]):
+        """Record that the worker running these jobs is still alive."""
+        placeholders = ", ".join(["%s"] * len(job_ids))
+        self._execute(f"UPDATE jobs SET heartbeat_at = %s WHERE id IN ({placeholders})", [self._now()] + job_ids)
+    
+    def fail_abandoned(self, stale_before: datetime, error: str) -> int:
+        """
+        Mark queued or running jobs without a heartbeat since `stale_before` as failed.
+        
+        Returns:
+            Number of jobs marked failed
+        """
+        return self._execute(
+            """
+            UPDATE jobs SET status = 'failed', error = %s, finished_at = %s
+            WHERE status IN ('queued', 'running')
+              AND (heartbeat_at IS NULL OR heartbeat_at < %s)
+            """,
+            (error, self._now(), stale_before.strftime("%Y-%m-%d %H:%M:%S.%f"))
+        )
+    
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by ID.
+        
+        Returns:
+            Job or None if not found
+        """
+        rows = self._execute(f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = %s", (job_id,), fetch=True)
+        return self._row_to_job(rows[0]) if rows else None
+    
+    def get_recent(self, limit: int = 50) -> List[Job]:
+        """Most recently created jobs first."""
+        rows = self._execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT %s", (limit,), fetch=True
+        )
+        return [self._row_to_job(row) for row in rows]
+    
+    @staticmethod
+    def _values(job: Job) -> list:
+        return [
+            job.id, job.kind, job.status, job.progress, (job.message or "")[:255] or None,
+            json.dumps(job.params, default=str),
+            json.dumps(job.result, default=str) if job.result is not None else None,
+            job.error,
+            job.created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            job.started_at.strftime("%Y-%m-%d %H:%M:%S.%f") if job.started_at else None,
+            job.finished_at.strftime("%Y-%m-%d %H:%M:%S.%f") if job.finished_at else None,
+        ]
+    
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        values = dict(zip(JobRepository.COLUMNS, row))
+        values["params"] = json.loads(values["params"]) if values["params"] else {}
+        values["result"] = json.loads(values["result"]) if values["result"] else None
+        return Job(**values)
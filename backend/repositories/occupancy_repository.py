@@ -0,0 +1,227 @@
+"""
+Repository for the daily occupancy rollup.
+Maintains one row per (night, booking ID/unit) so period analytics read
+O(days) rows instead of expanding every booking into nights.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import mysql.connector
+from backend.database.connection import get_connection
+from backend.database.engines import get_engine
+from backend.models.booking import Booking
+from backend.models.job import Progress
+
+
+class OccupancyRepository:
+    """Repository for the `occupancy_daily` rollup table."""
+    
+    TABLE_DDL = """
+        CREATE TABLE IF NOT EXISTS occupancy_daily (
+            stay_date DATE NOT NULL,
+            booking_id VARCHAR(64) NOT NULL,
+            nights_sold INT NOT NULL DEFAULT 0,
+            guests INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14, 4) NOT NULL DEFAULT 0,
+            PRIMARY KEY (stay_date, booking_id)
+        )
+    """
+    
+    # Rows are written in chunks to keep statements small
+    BATCH_SIZE = 1000
+    
+    def __init__(self):
+        """Initialize the repository."""
+        self.connection = None
+        self._table_ready = False
+    
+    def _get_connection(self) -> mysql.connector.MySQLConnection:
+        """Get database connection and make sure the rollup table exists."""
+        if self.connection is None or not self.connection.is_connected():
+            self.connection = get_connection()
+        if not self._table_ready:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(self.TABLE_DDL)
+                self._table_ready = True
+            finally:
+                cursor.close()
+        return self.connection
+    
+    @staticmethod
+    def counts_towards_occupancy(booking: Booking) -> bool:
+        """Cancelled bookings do not occupy nights."""
+        return not (booking.status and booking.status.lower() == 'cancelled')
+    
+    @staticmethod
+    def expand_nights(booking: Booking, sign: int = 1) -> List[Tuple]:
+        """
+        Expand a booking into per-night rollup rows.
+        
+        Args:
+            booking: Booking to expand
+            sign: 1 to add the booking, -1 to remove it
+        
+        Returns:
+            List of (stay_date, booking_id, nights_sold, guests, revenue) tuples
+        """
+        nights = (booking.check_out - booking.check_in).days
+        if nights <= 0:
+            return []
+        
+        revenue_per_night = Decimal("0")
+        if booking.price:
+            revenue_per_night = (Decimal(str(booking.price)) / nights).quantize(
+                Decimal("0.0001"), rounding=ROUND_HALF_UP
+            )
+        
+        booking_id = str(booking.booking_id).strip()
+        return [
+            (
+                booking.check_in + timedelta(days=offset),
+                booking_id,
+                sign,
+                sign * (booking.persons or 0),
+                sign * revenue_per_night,
+            )
+            for offset in range(nights)
+        ]
+    
+    def _upsert_rows(self, cursor, rows: List[Tuple], progress: Optional[Progress] = None):
+        """Add the given deltas to the rollup, inserting missing keys."""
+        query = get_engine().additive_upsert(
+            "occupancy_daily",
+            ["stay_date", "booking_id", "nights_sold", "guests", "revenue"],
+            ["stay_date", "booking_id"]
+        )
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            cursor.executemany(query, rows[start:start + self.BATCH_SIZE])
+            if progress:
+                done = min(start + self.BATCH_SIZE, len(rows))
+                progress(0.5 + 0.5 * done / len(rows), f"{done}/{len(rows)} rows written")
+    
+    def apply_booking(self, booking: Booking, sign: int = 1):
+        """
+        Add (sign=1) or remove (sign=-1) a booking from the rollup.
+        
+        Args:
+            booking: Booking whose nights are applied
+            sign: 1 to add, -1 to remove
+        """
+        if not self.counts_towards_occupancy(booking):
+            return
+        
+        rows = self.expand_nights(booking, sign)
+        if not rows:
+            return
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            self._upsert_rows(cursor, rows)
+            
+            # Drop rows that no longer hold any booking
+            if sign < 0:
+                cursor.execute(
+                    """
+                    DELETE FROM occupancy_daily
+                    WHERE booking_id = %s AND stay_date >= %s AND stay_date < %s
+                      AND nights_sold <= 0
+                    """,
+                    (rows[0][1], booking.check_in, booking.check_out)
+                )
+            conn.commit()
+        
+        finally:
+            cursor.close()
+    
+    def rebuild(self, bookings: Iterable[Booking], progress: Optional[Progress] = None) -> int:
+        """
+        Rebuild the whole rollup from scratch in one transaction.
+        
+        Args:
+            bookings: All bookings
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Number of booking nights written
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Aggregate in memory so each key is written once
+        totals = {}
+        for booking in bookings:
+            if not self.counts_towards_occupancy(booking):
+                continue
+            for stay_date, booking_id, nights_sold, guests, revenue in self.expand_nights(booking):
+                key = (stay_date, booking_id)
+                current = totals.get(key, (0, 0, Decimal("0")))
+                totals[key] = (current[0] + nights_sold, current[1] + guests, current[2] + revenue)
+        
+        rows = [key + values for key, values in sorted(totals.items())]
+        if progress:
+            progress(0.5, f"{len(rows)} rows to write")
+        
+        try:
+            conn.start_transaction()
+            cursor.execute("DELETE FROM occupancy_daily")
+            self._upsert_rows(cursor, rows, progress)
+            conn.commit()
+            return sum(row[2] for row in rows)
+        
+        except Exception:
+            conn.rollback()
+            raise
+        
+        finally:
+            cursor.close()
+    
+    def get_daily(
+        self,
+        start_date: date,
+        end_date: date,
+        booking_id: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Get per-night totals for a period.
+        
+        Args:
+            start_date: First night (inclusive)
+            end_date: Last night (inclusive)
+            booking_id: Optional booking ID/unit to restrict to
+        
+        Returns:
+            List of dicts with stay_date, in_house, guests and revenue, ordered by date
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            query = """
+                SELECT stay_date, SUM(nights_sold), SUM(guests), SUM(revenue)
+                FROM occupancy_daily
+                WHERE stay_date >= %s AND stay_date <= %s
+            """
+            params = [start_date, end_date]
+            if booking_id:
+                query += " AND booking_id = %s"
+                params.append(booking_id)
+            query += " GROUP BY stay_date ORDER BY stay_date"
+            
+            cursor.execute(query, params)
+            
+            return [
+                {
+                    "stay_date": stay_date,
+                    "in_house": int(in_house or 0),
+                    "guests": int(guests or 0),
+                    "revenue": float(revenue or 0),
+                }
+                for stay_date, in_house, guests, revenue in cursor.fetchall()
+            ]
+        
+        finally:
+            cursor.close()
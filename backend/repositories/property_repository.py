@@ -0,0 +1,177 @@
+"""
+Repository for property (unit) data access.
+Properties are keyed by the unit code bookings carry in `Booking ID`.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import sqlite3
+import mysql.connector
+from backend.database.connection import get_connection
+from backend.models.job import Progress
+from backend.models.property import Property, PropertyCreate
+
+
+class PropertyRepository:
+    """Repository for the `properties` table (schema applied by the storage engine)."""
+    
+    def __init__(self):
+        """Initialize the repository."""
+        self.connection = None
+        # Properties are never deleted, so known codes/IDs can be cached
+        self._ids_by_code: Dict[str, int] = {}
+    
+    def _get_connection(self) -> mysql.connector.MySQLConnection:
+        """Get database connection."""
+        if self.connection is None or not self.connection.is_connected():
+            self.connection = get_connection()
+        return self.connection
+    
+    def get_all(self) -> List[Property]:
+        """
+        Get all properties ordered by code.
+        
+        Returns:
+            List of Property objects
+        """
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT `ID`, `Code`, `Name`, `Capacity` FROM properties ORDER BY `Code`")
+            return [self._row_to_property(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    
+    def get_by_id(self, property_id: int) -> Optional[Property]:
+        """
+        Get a property by its ID.
+        
+        Args:
+            property_id: Database property ID
+        
+        Returns:
+            Property or None if not found
+        """
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT `ID`, `Code`, `Name`, `Capacity` FROM properties WHERE `ID` = %s", (property_id,))
+            row = cursor.fetchone()
+            return self._row_to_property(row) if row else None
+        finally:
+            cursor.close()
+    
+    def get_by_code(self, code: str) -> Optional[Property]:
+        """
+        Get a property by its unit code.
+        
+        Args:
+            code: Unit code (e.g. "R106")
+        
+        Returns:
+            Property or None if not found
+        """
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute("SELECT `ID`, `Code`, `Name`, `Capacity` FROM properties WHERE `Code` = %s", (code.strip(),))
+            row = cursor.fetchone()
+            return self._row_to_property(row) if row else None
+        finally:
+            cursor.close()
+    
+    def create(self, prop: PropertyCreate) -> Property:
+        """
+        Create a new property.
+        
+        Args:
+            prop: PropertyCreate with code and optional name
+        
+        Returns:
+            Created Property
+        
+        Raises:
+            ValueError: If a property with the same code exists
+        """
+        code = prop.code.strip()
+        if self.get_by_code(code):
+            raise ValueError(f"Property '{code}' already exists")
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO properties (`Code`, `Name`, `Capacity`) VALUES (%s, %s, %s)",
+                (code, prop.name, prop.capacity)
+            )
+            conn.commit()
+            property_id = cursor.lastrowid
+        finally:
+            cursor.close()
+        
+        self._ids_by_code[code] = property_id
+        return Property(property_id=property_id, code=code, name=prop.name, capacity=prop.capacity)
+    
+    def get_or_create_id(self, code: str) -> int:
+        """
+        Get the ID of the property with a unit code, creating it if missing.
+        
+        Args:
+            code: Unit code (e.g. "R106")
+        
+        Returns:
+            Property ID
+        """
+        code = code.strip()
+        property_id = self._ids_by_code.get(code)
+        if property_id is None:
+            existing = self.get_by_code(code)
+            if existing is None:
+                try:
+                    existing = self.create(PropertyCreate(code=code))
+                except (ValueError, mysql.connector.IntegrityError, sqlite3.IntegrityError):
+                    # Created concurrently by another worker (unique code)
+                    existing = self.get_by_code(code)
+                    if existing is None:
+                        raise
+            property_id = existing.property_id
+            self._ids_by_code[code] = property_id
+        return property_id
+    
+    def backfill_from_bookings(self, progress: Optional[Progress] = None) -> Tuple[int, int]:
+        """
+        Create properties for every unit code in bookings and link unlinked bookings.
+        
+        Args:
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Tuple of (properties created, bookings linked)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            if progress:
+                progress(0.0, "Creating properties")
+            cursor.execute("""
+                INSERT INTO properties (`Code`)
+                SELECT DISTINCT TRIM(b.`Booking ID`) FROM bookings b
+                WHERE b.`Booking ID` IS NOT NULL AND TRIM(b.`Booking ID`) <> ''
+                  AND NOT EXISTS (SELECT 1 FROM properties p WHERE p.`Code` = TRIM(b.`Booking ID`))
+            """)
+            created = cursor.rowcount
+            if progress:
+                progress(0.5, f"{created} properties created; linking bookings")
+            # Bumping the version expires per-version caches of the linked bookings
+            cursor.execute("""
+                UPDATE bookings SET property_id = (
+                    SELECT p.`ID` FROM properties p WHERE p.`Code` = TRIM(bookings.`Booking ID`)
+                ), version = version + 1
+                WHERE property_id IS NULL AND `Booking ID` IS NOT NULL
+            """)
+            linked = cursor.rowcount
+            conn.commit()
+            return created, linked
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _row_to_property(row: Tuple) -> Property:
+        """Convert an (ID, Code, Name, Capacity) row to a Property."""
+        return Property(property_id=row[0], code=row[1], name=row[2], capacity=row[3])
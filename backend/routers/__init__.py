@@ -3,5 +3,13 @@ API routers for FastAPI endpoints.
 """
 
 from .bookings import router as bookings_router
+from .analytics import router as analytics_router
+from .admin import router as admin_router
+from .health import router as health_router
+from .properties import router as properties_router
+from .availability import router as availability_router
+from .dashboard import router as dashboard_router
+from .jobs import router as jobs_router
 
-__all__ = ["bookings_router"]
+__all__ = ["bookings_router", "analytics_router", "admin_router", "health_router", "properties_router",
+           "availability_router", "dashboard_router", "jobs_router"]
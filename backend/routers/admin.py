@@ -0,0 +1,111 @@
+"""
+API router for operational endpoints (timings, diagnostics and profiling).
+"""
+
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from backend.config import settings
+from backend.observability.middleware import TimedRoute
+from backend.observability.profiler import collapsed_text, request_profiler, sampling_profiler
+from backend.observability.queries import query_log
+from backend.routers.dependencies import require_admin
+from backend.observability.timing import reset_timings, timings_snapshot
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    route_class=TimedRoute,
+    # Every endpoint exposes internals (SQL, plans, stacks): admin token required
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/timings")
+async def get_timings():
+    """
+    Get latency histograms per route and layer since process start.
+    
+    Layers: db (SQL execute/fetch), decode (rows to models), service (endpoint
+    and service logic), serialize (validation and response encoding) and total.
+    Percentiles are histogram bucket upper bounds in milliseconds.
+    """
+    return timings_snapshot()
+
+
+@router.delete("/timings", status_code=204)
+async def clear_timings():
+    """Reset the latency histograms."""
+    reset_timings()
+    return None
+
+
+@router.get("/queries")
+async def get_queries():
+    """
+    Get SQL statistics per query fingerprint (requires SLOW_QUERY_LOG).
+    
+    Fingerprints replace literals and parameters with '?'. Each entry has
+    calls, total/mean/max time, mean rows, how many calls exceeded
+    SLOW_QUERY_MS and the last sampled EXPLAIN plan, most total time first.
+    """
+    return {
+        "enabled": query_log.enabled,
+        "slow_query_ms": settings.SLOW_QUERY_MS,
+        "explain_sample_rate": settings.EXPLAIN_SAMPLE_RATE,
+        "queries": query_log.snapshot(),
+    }
+
+
+@router.delete("/queries", status_code=204)
+async def clear_queries():
+    """Reset the query statistics and captured plans."""
+    query_log.reset()
+    return None
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0, le=120, description="Sampling duration"),
+    interval_ms: float = Query(5, ge=1, le=1000, description="Milliseconds between samples"),
+    include_idle: bool = Query(False, description="Also count threads blocked waiting")
+):
+    """
+    Sample the stacks of every thread in this worker for `seconds`.
+    
+    Returns collapsed stacks ("thread;frame;...;frame count" per line), ready
+    for flamegraph.pl or speedscope. The request waits without blocking the
+    event loop, so the traffic being profiled keeps flowing.
+    """
+    try:
+        sampling_profiler.start(interval_ms / 1000, include_idle)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        result = sampling_profiler.stop()
+    
+    return PlainTextResponse(
+        collapsed_text(result["stacks"]),
+        headers={"X-Profile-Samples": str(result["samples"])}
+    )
+
+
+@router.get("/profile/requests")
+async def list_request_profiles():
+    """List the kept per-request cProfile reports (requests sent with X-Profile), newest first."""
+    return request_profiler.list()
+
+
+@router.get("/profile/requests/{report_id}", response_class=PlainTextResponse)
+async def get_request_profile(report_id: str):
+    """Get a per-request cProfile report (functions by cumulative time)."""
+    report = request_profiler.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Profile {report_id} not found")
+    return PlainTextResponse(
+        f"{report['method']} {report['path']} -> {report['status']} "
+        f"in {report['duration_ms']} ms ({report['captured_at']})\n\n{report['stats']}"
+    )
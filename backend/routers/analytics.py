@@ -0,0 +1,42 @@
+"""
+API router for analytics endpoints.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import date
+from backend.models.analytics import OccupancyReport
+from backend.observability.middleware import TimedRoute
+from backend.routers.dependencies import require_database
+from backend.services.analytics_service import AnalyticsService
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    route_class=TimedRoute,
+    # Fail fast with 503 while the database is down
+    dependencies=[Depends(require_database)]
+)
+
+# Service instance
+analytics_service = AnalyticsService()
+
+
+@router.get("/occupancy", response_model=OccupancyReport)
+async def get_occupancy(
+    start_date: date = Query(..., description="First night of the period"),
+    end_date: date = Query(..., description="Last night of the period (inclusive)"),
+    booking_id: Optional[str] = Query(None, description="Restrict to one booking ID/unit")
+):
+    """
+    Get nightly occupancy (in-house count, nights sold, revenue, ADR) for a period.
+    
+    Reads the daily occupancy rollup, so the cost grows with the number of days
+    in the period, not with the number of bookings.
+    """
+    try:
+        return analytics_service.get_occupancy(start_date, end_date, booking_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching occupancy: {str(e)}")
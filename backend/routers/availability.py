@@ -0,0 +1,64 @@
+"""
+API router for availability search.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import date
+from backend.models.availability import AvailabilityResponse, OccupancyGrid
+from backend.observability.middleware import TimedRoute
+from backend.routers.dependencies import require_database
+from backend.services.availability_service import AvailabilityService
+from backend.services.occupancy_engine import OccupancyEngineService
+
+router = APIRouter(
+    prefix="/availability",
+    tags=["availability"],
+    route_class=TimedRoute,
+    # Fail fast with 503 while the database is down
+    dependencies=[Depends(require_database)]
+)
+
+# Service instances
+availability_service = AvailabilityService()
+occupancy_engine_service = OccupancyEngineService()
+
+
+@router.get("", response_model=AvailabilityResponse)
+async def get_availability(
+    check_in: date = Query(..., description="Arrival date"),
+    check_out: date = Query(..., description="Departure date"),
+    guests: int = Query(1, ge=1, description="Guests to accommodate")
+):
+    """
+    Get the units free for the whole stay [check_in, check_out).
+    
+    Answered from the in-memory availability index (one binary search per
+    unit), so the cost does not grow with the number of bookings.
+    """
+    try:
+        return availability_service.find_available(check_in, check_out, guests)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching availability: {str(e)}")
+
+
+@router.get("/occupancy", response_model=OccupancyGrid)
+async def get_occupancy_grid(
+    start_date: date = Query(..., description="First night"),
+    end_date: date = Query(..., description="Last night (inclusive)"),
+    property_id: Optional[int] = Query(None, description="Restrict to one property")
+):
+    """
+    Get the taken nights of every unit and the units in house per night.
+    
+    Answered from the in-memory occupancy engine (per-unit night bitsets);
+    periods starting more than OCCUPANCY_HISTORY_DAYS ago are rejected.
+    """
+    try:
+        return occupancy_engine_service.get_grid(start_date, end_date, property_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching occupancy: {str(e)}")
@@ -2,20 +2,120 @@
 API router for booking endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from datetime import date
-from backend.models.booking import Booking, BookingCreate, BookingUpdate
+from datetime import date, timedelta
+from backend.exceptions import BookingConflictError, VersionConflictError
+from backend.models.booking import Booking, BookingBatchResponse, BookingCreate, BookingUpdate, BookingFilter
+from backend.models.stats import BookingStatsResponse
+from backend.observability.middleware import TimedRoute
+from backend.routers.dependencies import require_database
 from backend.services.booking_service import BookingService
+from backend.services.export_service import ExportService
 
-router = APIRouter(prefix="/bookings", tags=["bookings"])
+router = APIRouter(
+    prefix="/bookings",
+    tags=["bookings"],
+    route_class=TimedRoute,
+    # Fail fast with 503 while the database is down
+    dependencies=[Depends(require_database)]
+)
 
-# Service instance
+# Service instances
 booking_service = BookingService()
+export_service = ExportService()
+
+# Columnar response format negotiated through the Accept header
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(request: Request) -> bool:
+    """Check whether the client asked for an Arrow IPC stream."""
+    return ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def arrow_response(filters: Optional[BookingFilter] = None, limit: Optional[int] = None) -> StreamingResponse:
+    """
+    Stream bookings as an Arrow IPC stream (one record batch per DB batch).
+    
+    Raises:
+        HTTPException: 406 if pyarrow is not available on the server, 500 if
+            the query fails (it runs before the response starts)
+    """
+    try:
+        ExportService.check_format("arrow")
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    try:
+        chunks = export_service.stream("arrow", filters, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching bookings: {str(e)}")
+    return StreamingResponse(chunks, media_type=ARROW_STREAM_MEDIA_TYPE)
+
+
+def set_etag(response: Response, booking: Booking):
+    """Expose the booking's row version as its ETag."""
+    if booking.version is not None:
+        response.headers["ETag"] = f'"{booking.version}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Version from an If-Match header ('"3"', 'W/"3"' or '3'); None for '*' or no header.
+    
+    Raises:
+        HTTPException: 400 if the header is not a booking version
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid If-Match header: {if_match}")
+
+
+def get_booking_filter(
+    start_date: Optional[date] = Query(None, description="Bookings overlapping from this date"),
+    end_date: Optional[date] = Query(None, description="Bookings overlapping until this date"),
+    status: Optional[List[str]] = Query(None, description="One or more statuses"),
+    booking_id: Optional[str] = Query(None, description="Exact booking ID"),
+    property_filter: Optional[int] = Query(None, alias="property_id", description="Property (unit) ID"),
+    guest_name: Optional[str] = Query(None, description="Guest name contains"),
+    booking_number: Optional[str] = Query(None, description="Booking number contains"),
+    email: Optional[str] = Query(None, description="Email contains"),
+    check_in_from: Optional[date] = Query(None, description="Check-in on or after"),
+    check_in_to: Optional[date] = Query(None, description="Check-in on or before"),
+    check_out_from: Optional[date] = Query(None, description="Check-out on or after"),
+    check_out_to: Optional[date] = Query(None, description="Check-out on or before"),
+    min_nights: Optional[int] = Query(None, ge=0, description="Minimum nights"),
+    max_nights: Optional[int] = Query(None, ge=0, description="Maximum nights")
+) -> BookingFilter:
+    """Build a BookingFilter from the search query parameters."""
+    return BookingFilter(
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        booking_id=booking_id,
+        property_id=property_filter,
+        guest_name=guest_name,
+        booking_number=booking_number,
+        email=email,
+        check_in_from=check_in_from,
+        check_in_to=check_in_to,
+        check_out_from=check_out_from,
+        check_out_to=check_out_to,
+        min_nights=min_nights,
+        max_nights=max_nights
+    )
 
 
 @router.get("/", response_model=List[Booking])
 async def get_bookings(
+    request: Request,
     limit: Optional[int] = Query(None, description="Limit number of results"),
     start_date: Optional[date] = Query(None, description="Filter from this date"),
     end_date: Optional[date] = Query(None, description="Filter until this date"),
@@ -28,7 +128,19 @@ async def get_bookings(
     - **start_date**: Start date for filtering (defaults to today if days is provided)
     - **end_date**: End date for filtering
     - **days**: Number of days from start_date (alternative to end_date)
+    
+    Send `Accept: application/vnd.apache.arrow.stream` to receive an Arrow IPC
+    stream instead of JSON.
     """
+    if wants_arrow(request):
+        if start_date and end_date:
+            return arrow_response(BookingFilter(start_date=start_date, end_date=end_date))
+        if days:
+            period_start = start_date or date.today()
+            period_end = period_start + timedelta(days=days)
+            return arrow_response(BookingFilter(start_date=period_start, end_date=period_end))
+        return arrow_response(limit=limit)
+    
     try:
         # Custom date range
         if start_date and end_date:
@@ -81,20 +193,122 @@ async def get_calendar_events(
     start_date: Optional[date] = Query(None, description="Start date (defaults to today)"),
     days: int = Query(90, description="Number of days to include")
 ):
-    """Get bookings formatted as calendar events."""
+    """
+    Get bookings formatted as calendar events.
+    
+    The body is joined from per-booking JSON fragments cached by
+    (record ID, version), so unchanged bookings are not re-rendered.
+    """
     try:
-        return booking_service.get_calendar_events(start_date, days)
+        return Response(
+            content=booking_service.get_calendar_events_json(start_date, days),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching calendar events: {str(e)}")
 
 
+@router.get("/search", response_model=List[Booking])
+async def search_bookings(
+    request: Request,
+    filters: BookingFilter = Depends(get_booking_filter)
+):
+    """
+    Search bookings with the search-page filters, ordered by check-in.
+    
+    Send `Accept: application/vnd.apache.arrow.stream` to receive an Arrow IPC
+    stream instead of JSON.
+    """
+    if wants_arrow(request):
+        return arrow_response(filters)
+    
+    try:
+        return booking_service.search_bookings(filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching bookings: {str(e)}")
+
+
+@router.get("/stats", response_model=BookingStatsResponse)
+async def get_booking_stats(
+    filters: BookingFilter = Depends(get_booking_filter),
+    group_by: Optional[str] = Query(
+        None,
+        pattern="^(month|status|booking_id)$",
+        description="Group results by month, status or booking_id"
+    )
+):
+    """
+    Get aggregated booking statistics computed in the database.
+    
+    Accepts the same filters as the booking search and returns total bookings,
+    total nights, total revenue and average price, optionally grouped.
+    """
+    try:
+        return booking_service.get_booking_stats(filters, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching booking stats: {str(e)}")
+
+
+@router.get("/export")
+async def export_bookings(
+    filters: BookingFilter = Depends(get_booking_filter),
+    format: str = Query("csv", pattern="^(csv|parquet|ndjson|arrow)$", description="csv, parquet, ndjson or arrow")
+):
+    """
+    Export bookings matching the search filters.
+    
+    Rows are streamed from a server-side cursor in fixed-size batches
+    (Parquet is written one row group per batch), so memory stays bounded.
+    The query runs before the response starts, so database errors are a 500
+    rather than a truncated file.
+    """
+    try:
+        ExportService.check_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        chunks = export_service.stream(format, filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting bookings: {str(e)}")
+    
+    media_type, extension = ExportService.FORMATS[format]
+    filename = f"bookings_export_{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/batch", response_model=BookingBatchResponse)
+async def get_bookings_batch(
+    ids: str = Query(..., description="Comma-separated record IDs (e.g. 12,15,40)")
+):
+    """
+    Get several bookings by record ID in one request.
+    
+    Bookings come back in the order requested; IDs that do not exist are
+    listed in `missing`.
+    """
+    try:
+        record_ids = [int(part) for part in ids.split(",") if part.strip()]
+        return booking_service.get_bookings_by_ids(record_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ids: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching bookings: {str(e)}")
+
+
 @router.get("/{record_id}", response_model=Booking)
-async def get_booking(record_id: int):
-    """Get a specific booking by ID."""
+async def get_booking(record_id: int, response: Response):
+    """Get a specific booking by ID (ETag header carries its version)."""
     try:
         booking = booking_service.get_booking_by_id(record_id)
         if not booking:
             raise HTTPException(status_code=404, detail=f"Booking with ID {record_id} not found")
+        set_etag(response, booking)
         return booking
     except HTTPException:
         raise
@@ -107,6 +321,8 @@ async def create_booking(booking: BookingCreate):
     """Create a new booking."""
     try:
         return booking_service.create_booking(booking)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -114,15 +330,70 @@ async def create_booking(booking: BookingCreate):
 
 
 @router.put("/{record_id}", response_model=Booking)
-async def update_booking(record_id: int, booking: BookingUpdate):
-    """Update an existing booking."""
+async def update_booking(
+    record_id: int,
+    booking: BookingUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag (version) the update is based on")
+):
+    """
+    Update an existing booking.
+    
+    With an If-Match header (or `version` in the body) the update only applies
+    if the booking is still at that version; otherwise 409 Conflict, so two
+    people editing the same booking cannot silently overwrite each other.
+    """
     try:
-        updated_booking = booking_service.update_booking(record_id, booking)
+        updated_booking = booking_service.update_booking(record_id, booking, parse_if_match(if_match))
         if not updated_booking:
             raise HTTPException(status_code=404, detail=f"Booking with ID {record_id} not found")
+        set_etag(response, updated_booking)
         return updated_booking
     except HTTPException:
         raise
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"ETag": f'"{e.current_version}"'} if e.current_version is not None else None
+        )
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating booking: {str(e)}")
+
+
+@router.patch("/{record_id}", response_model=Booking)
+async def patch_booking(
+    record_id: int,
+    booking: BookingUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="ETag (version) the change is based on")
+):
+    """
+    Change only the fields sent (null clears a field).
+    
+    Only the changed columns are written, and nights is only recomputed when
+    a date changes. If-Match / `version` work as in PUT.
+    """
+    try:
+        patched_booking = booking_service.patch_booking(record_id, booking, parse_if_match(if_match))
+        if not patched_booking:
+            raise HTTPException(status_code=404, detail=f"Booking with ID {record_id} not found")
+        set_etag(response, patched_booking)
+        return patched_booking
+    except HTTPException:
+        raise
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"ETag": f'"{e.current_version}"'} if e.current_version is not None else None
+        )
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -0,0 +1,44 @@
+"""
+API router for the overview dashboard.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from datetime import date
+from backend.models.dashboard import DashboardResponse
+from backend.observability.middleware import TimedRoute
+from backend.routers.dependencies import require_database
+from backend.services.booking_service import BookingService
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"],
+    route_class=TimedRoute,
+    # Fail fast with 503 while the database is down
+    dependencies=[Depends(require_database)]
+)
+
+# Service instance
+booking_service = BookingService()
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    start_date: Optional[date] = Query(None, description="First day of the calendar period (default: 1st of this month)"),
+    end_date: Optional[date] = Query(None, description="Last day of the calendar period (default: end of that month)"),
+    days: int = Query(7, ge=1, le=90, description="Look-ahead days for check-ins/check-outs"),
+    property_id: Optional[int] = Query(None, description="Restrict to one property")
+):
+    """
+    Get active stays, upcoming check-ins/check-outs, calendar events and
+    counts in one response.
+    
+    Replaces calling /bookings/active, /upcoming-checkins, /upcoming-checkouts
+    and /calendar-events separately: a single bookings query covers them all.
+    """
+    try:
+        return booking_service.get_dashboard(start_date, end_date, days, property_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching dashboard: {str(e)}")
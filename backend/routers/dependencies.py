@@ -0,0 +1,42 @@
+"""
+Shared router dependencies.
+"""
+
+from typing import Optional
+import hmac
+from fastapi import Header, HTTPException
+from backend.config import settings
+from backend.database.health import database_probe
+
+
+def require_database():
+    """
+    Fail fast with 503 while the readiness probe reports the database down.
+    
+    Raises:
+        HTTPException: 503 with Retry-After when the database is unavailable
+    """
+    if not database_probe.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Database unavailable",
+            headers={"Retry-After": str(max(1, int(settings.DB_PROBE_INTERVAL)))}
+        )
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """True if `token` matches ADMIN_TOKEN (always False while ADMIN_TOKEN is unset)."""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode())
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Restrict an endpoint to callers sending the admin token.
+    
+    Raises:
+        HTTPException: 403 when ADMIN_TOKEN is unset or X-Admin-Token does not match
+    """
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
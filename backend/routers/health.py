@@ -0,0 +1,37 @@
+"""
+API router for liveness and readiness checks.
+"""
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from backend.database.health import database_probe
+from backend.observability.middleware import TimedRoute
+
+router = APIRouter(prefix="/health", tags=["health"], route_class=TimedRoute)
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness: the process is up and serving requests (no dependencies checked)."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness: the database is reachable, according to the background probe.
+    
+    Returns 503 while the database is down. Before the first background check
+    the probe runs once inline (bounded by DB_PROBE_TIMEOUT).
+    """
+    if database_probe.status == "unknown":
+        database = await run_in_threadpool(database_probe.check)
+    else:
+        database = database_probe.snapshot()
+    
+    ready = database["status"] == "up"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "unavailable", "database": database}
+    )
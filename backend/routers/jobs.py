@@ -0,0 +1,77 @@
+"""
+API router for background jobs (exports, rebuilds, backfills).
+"""
+
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from typing import List
+from backend.config import settings
+from backend.exceptions import JobQueueFullError
+from backend.models.job import Job, JobCreate
+from backend.observability.middleware import TimedRoute
+from backend.routers.dependencies import require_admin, require_database
+from backend.services.job_runner import job_runner
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    route_class=TimedRoute,
+    # Full-table rebuilds/backfills and guest exports are operator-only;
+    # fail fast with 503 while the database is down
+    dependencies=[Depends(require_admin), Depends(require_database)]
+)
+
+
+@router.post("", response_model=Job, status_code=202)
+async def create_job(job: JobCreate):
+    """
+    Start a background job and return it right away (poll GET /jobs/{id}).
+    
+    Kinds: export (params: format, filters, limit), rebuild_occupancy,
+    rebuild_night_ledger (params: from_date) and backfill_properties.
+    """
+    try:
+        return job_runner.submit(job.kind, job.params)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "10"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error starting job: {str(e)}")
+
+
+@router.get("", response_model=List[Job])
+async def list_jobs(limit: int = Query(50, ge=1, le=500, description="Maximum number of jobs")):
+    """Get the most recent jobs, newest first."""
+    try:
+        return job_runner.get_recent(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """Get a job's status, progress and result."""
+    try:
+        job = job_runner.get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching job: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/{job_id}/result")
+async def download_job_result(job_id: str):
+    """Download the file written by a finished export job."""
+    job = job_runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status != "succeeded" or not (job.result or {}).get("file"):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has no file to download (status: {job.status})")
+    
+    path = os.path.join(settings.JOB_OUTPUT_DIR, job.result["file"])
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Output of job {job_id} is no longer available")
+    return FileResponse(path, media_type=job.result.get("media_type"), filename=f"bookings.{path.rsplit('.', 1)[-1]}")
@@ -0,0 +1,163 @@
+"""
+API router for property endpoints and property-scoped booking queries.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Optional
+from datetime import date
+from backend.models.booking import Booking, BookingFilter
+from backend.models.property import Property, PropertyCreate
+from backend.models.stats import BookingStatsResponse
+from backend.observability.middleware import TimedRoute
+from backend.routers.bookings import booking_service, get_booking_filter
+from backend.routers.dependencies import require_database
+from backend.services.property_service import PropertyService
+
+router = APIRouter(
+    prefix="/properties",
+    tags=["properties"],
+    route_class=TimedRoute,
+    # Fail fast with 503 while the database is down
+    dependencies=[Depends(require_database)]
+)
+
+# Service instances (bookings share the bookings router's service)
+property_service = PropertyService()
+
+
+def get_property_or_404(property_id: int) -> Property:
+    """Resolve the property in the path, or fail with 404."""
+    try:
+        prop = property_service.get_property(property_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching property: {str(e)}")
+    if not prop:
+        raise HTTPException(status_code=404, detail=f"Property with ID {property_id} not found")
+    return prop
+
+
+@router.get("/", response_model=List[Property])
+async def get_properties():
+    """Get all properties (units) ordered by code."""
+    try:
+        return property_service.get_all_properties()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching properties: {str(e)}")
+
+
+@router.post("/", response_model=Property, status_code=201)
+async def create_property(prop: PropertyCreate):
+    """Create a new property."""
+    try:
+        return property_service.create_property(prop)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating property: {str(e)}")
+
+
+@router.get("/{property_id}", response_model=Property)
+async def get_property(prop: Property = Depends(get_property_or_404)):
+    """Get a specific property by ID."""
+    return prop
+
+
+@router.get("/{property_id}/bookings", response_model=List[Booking])
+async def get_property_bookings(
+    prop: Property = Depends(get_property_or_404),
+    limit: Optional[int] = Query(None, description="Limit number of results"),
+    start_date: Optional[date] = Query(None, description="Filter from this date"),
+    end_date: Optional[date] = Query(None, description="Filter until this date"),
+    days: Optional[int] = Query(None, description="Get bookings for next N days from start_date")
+):
+    """Get the property's bookings, optionally for a date range (same parameters as /bookings/)."""
+    try:
+        if start_date and end_date:
+            return booking_service.get_bookings_for_date_range(start_date, end_date, prop.property_id)
+        if days:
+            return booking_service.get_bookings_for_period(start_date, days, prop.property_id)
+        return booking_service.get_all_bookings(limit=limit, property_id=prop.property_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching bookings: {str(e)}")
+
+
+@router.get("/{property_id}/bookings/active", response_model=List[Booking])
+async def get_property_active_bookings(prop: Property = Depends(get_property_or_404)):
+    """Get the property's currently active bookings."""
+    try:
+        return booking_service.get_active_bookings(prop.property_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching active bookings: {str(e)}")
+
+
+@router.get("/{property_id}/bookings/upcoming-checkins", response_model=List[Booking])
+async def get_property_upcoming_checkins(
+    prop: Property = Depends(get_property_or_404),
+    days: int = Query(7, description="Number of days to look ahead")
+):
+    """Get the property's bookings with upcoming check-ins."""
+    try:
+        return booking_service.get_upcoming_checkins(days, prop.property_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching upcoming check-ins: {str(e)}")
+
+
+@router.get("/{property_id}/bookings/upcoming-checkouts", response_model=List[Booking])
+async def get_property_upcoming_checkouts(
+    prop: Property = Depends(get_property_or_404),
+    days: int = Query(7, description="Number of days to look ahead")
+):
+    """Get the property's bookings with upcoming check-outs."""
+    try:
+        return booking_service.get_upcoming_checkouts(days, prop.property_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching upcoming check-outs: {str(e)}")
+
+
+@router.get("/{property_id}/calendar-events")
+async def get_property_calendar_events(
+    prop: Property = Depends(get_property_or_404),
+    start_date: Optional[date] = Query(None, description="Start date (defaults to today)"),
+    days: int = Query(90, description="Number of days to include")
+):
+    """Get the property's bookings formatted as calendar events (per-unit calendar)."""
+    try:
+        return Response(
+            content=booking_service.get_calendar_events_json(start_date, days, prop.property_id),
+            media_type="application/json"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching calendar events: {str(e)}")
+
+
+@router.get("/{property_id}/bookings/search", response_model=List[Booking])
+async def search_property_bookings(
+    prop: Property = Depends(get_property_or_404),
+    filters: BookingFilter = Depends(get_booking_filter)
+):
+    """Search the property's bookings with the search-page filters."""
+    try:
+        filters.property_id = prop.property_id
+        return booking_service.search_bookings(filters)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching bookings: {str(e)}")
+
+
+@router.get("/{property_id}/bookings/stats", response_model=BookingStatsResponse)
+async def get_property_booking_stats(
+    prop: Property = Depends(get_property_or_404),
+    filters: BookingFilter = Depends(get_booking_filter),
+    group_by: Optional[str] = Query(
+        None,
+        pattern="^(month|status)$",
+        description="Group results by month or status"
+    )
+):
+    """Get aggregated statistics of the property's bookings."""
+    try:
+        filters.property_id = prop.property_id
+        return booking_service.get_booking_stats(filters, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching booking stats: {str(e)}")
@@ -0,0 +1,4 @@
+"""
+Maintenance commands for the backend.
+Run with `python -m backend.scripts.<command>`.
+"""
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Create properties for the unit codes used in bookings and link bookings to them.
+
+The schema (properties table, bookings.property_id and its index) is applied
+by the storage engine on first connection; run this once after upgrading, and
+after bulk imports that do not set property_id:
+    
+    python -m backend.scripts.backfill_properties
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.property_service import PropertyService
+
+
+def main():
+    """Backfill properties and report what was created and linked."""
+    print("🔄 Backfilling properties from bookings...")
+    started = time.perf_counter()
+    try:
+        result = PropertyService().backfill_from_bookings()
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        return 1
+    
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Properties backfilled - {result['properties_created']} properties created, "
+        f"{result['bookings_linked']} bookings linked in {elapsed:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Rebuild the night ledger (one row per property and night taken).
+
+Writes keep the ledger up to date and rely on it to reject double bookings;
+run this once after upgrading (after backfill_properties), and after bulk
+imports or manual SQL edits:
+    
+    python -m backend.scripts.rebuild_night_ledger
+
+Only bookings checking out from today on are loaded. Nights double-booked
+before the ledger existed stay with the booking with the lowest ID.
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.booking_service import BookingService
+
+
+def main():
+    """Rebuild the ledger and report how many nights were written."""
+    print("🔄 Rebuilding night ledger...")
+    started = time.perf_counter()
+    try:
+        result = BookingService().rebuild_night_ledger()
+    except Exception as e:
+        print(f"❌ Rebuild failed: {e}")
+        return 1
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ Night ledger rebuilt - {result['nights_written']} nights in {elapsed:.2f}s")
+    if result["nights_skipped"]:
+        print(f"⚠️ {result['nights_skipped']} nights were already double-booked (kept by the earliest booking)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
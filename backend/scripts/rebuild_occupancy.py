@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily occupancy rollup from all bookings.
+
+The rollup is kept up to date incrementally by BookingService; run this after
+bulk imports, manual SQL edits or to repair drift:
+    
+    python -m backend.scripts.rebuild_occupancy
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.analytics_service import AnalyticsService
+
+
+def main():
+    """Rebuild the rollup and report how many booking nights were written."""
+    print("🔄 Rebuilding occupancy rollup...")
+    started = time.perf_counter()
+    try:
+        nights = AnalyticsService().rebuild_occupancy()
+    except Exception as e:
+        print(f"❌ Rebuild failed: {e}")
+        return 1
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ Occupancy rollup rebuilt - {nights} booking nights in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,5 +4,7 @@ Contains use cases and business rules.
 """
 
 from .booking_service import BookingService
+from .analytics_service import AnalyticsService
+from .property_service import PropertyService
 
-__all__ = ["BookingService"]
+__all__ = ["BookingService", "AnalyticsService", "PropertyService"]
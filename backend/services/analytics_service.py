@@ -0,0 +1,110 @@
+"""
+Business logic service for analytics.
+Reads pre-aggregated occupancy data from the daily rollup.
+"""
+
+from typing import Optional
+from datetime import date, timedelta
+from backend.coordination import get_coordinator
+from backend.repositories.booking_repository import BookingRepository
+from backend.repositories.occupancy_repository import OccupancyRepository
+from backend.models.analytics import OccupancyDay, OccupancyReport
+from backend.models.job import Progress
+
+
+class AnalyticsService:
+    """Service for occupancy and revenue analytics."""
+    
+    # Guard against accidentally huge reports
+    MAX_PERIOD_DAYS = 366 * 5
+    
+    def __init__(
+        self,
+        occupancy_repository: Optional[OccupancyRepository] = None,
+        booking_repository: Optional[BookingRepository] = None
+    ):
+        """
+        Initialize the service.
+        
+        Args:
+            occupancy_repository: OccupancyRepository instance (optional)
+            booking_repository: BookingRepository instance used for rebuilds (optional)
+        """
+        self.occupancy_repository = occupancy_repository or OccupancyRepository()
+        self.booking_repository = booking_repository or BookingRepository()
+    
+    def get_occupancy(
+        self,
+        start_date: date,
+        end_date: date,
+        booking_id: Optional[str] = None
+    ) -> OccupancyReport:
+        """
+        Get nightly occupancy, revenue and ADR for a period.
+        
+        Args:
+            start_date: First night (inclusive)
+            end_date: Last night (inclusive)
+            booking_id: Optional booking ID/unit to restrict to
+        
+        Returns:
+            OccupancyReport with one entry per night (zero-filled)
+        
+        Raises:
+            ValueError: If the period is empty or too long
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must be on or after start_date")
+        if (end_date - start_date).days >= self.MAX_PERIOD_DAYS:
+            raise ValueError(f"Period cannot exceed {self.MAX_PERIOD_DAYS} days")
+        
+        rows = {
+            row["stay_date"]: row
+            for row in self.occupancy_repository.get_daily(start_date, end_date, booking_id)
+        }
+        
+        days = []
+        current = start_date
+        while current <= end_date:
+            row = rows.get(current)
+            if row and row["in_house"] > 0:
+                days.append(OccupancyDay(
+                    stay_date=current,
+                    in_house=row["in_house"],
+                    guests=row["guests"],
+                    revenue=round(row["revenue"], 2),
+                    adr=round(row["revenue"] / row["in_house"], 2)
+                ))
+            else:
+                days.append(OccupancyDay(stay_date=current))
+            current += timedelta(days=1)
+        
+        nights_sold = sum(day.in_house for day in days)
+        revenue = sum(row["revenue"] for row in rows.values())
+        
+        return OccupancyReport(
+            start_date=start_date,
+            end_date=end_date,
+            booking_id=booking_id,
+            nights_sold=nights_sold,
+            revenue=round(revenue, 2),
+            adr=round(revenue / nights_sold, 2) if nights_sold else None,
+            days=days
+        )
+    
+    def rebuild_occupancy(self, progress: Optional[Progress] = None) -> int:
+        """
+        Rebuild the occupancy rollup from all bookings.
+        
+        Args:
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Number of booking nights written
+        """
+        if progress:
+            progress(0.0, "Loading bookings")
+        bookings = self.booking_repository.get_all()
+        nights = self.occupancy_repository.rebuild(bookings, progress)
+        get_coordinator().bump("occupancy", {"action": "rebuilt"})
+        return nights
@@ -0,0 +1,423 @@
+"""
+Business logic service for availability search ("which units are free").
+
+Answers from an in-memory per-unit interval index instead of scanning
+bookings: each unit keeps its stays sorted by check-in plus the running
+maximum check-out, so "does anything overlap [check_in, check_out)?" is one
+binary search per unit. The index holds stays that end after the day it was
+built, is updated in place from the "bookings" change events (writes in any
+worker) and is rebuilt in the background once it is LIVE_INDEX_MAX_AGE
+seconds old (writes made outside the API).
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left
+from datetime import date, timedelta
+import threading
+import time
+from backend.config import settings
+from backend.coordination import get_coordinator
+from backend.database.connection import dedicated_connections
+from backend.models.availability import AvailabilityResponse
+from backend.models.booking import Booking
+from backend.repositories.booking_repository import BookingRepository
+from backend.repositories.property_repository import PropertyRepository
+
+
+def _ordinal(value) -> int:
+    """Day number of a date (or ISO date string)."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+class _UnitStays:
+    """Stays of one unit as [start, end) day ordinals sorted by start."""
+    
+    __slots__ = ("starts", "ends", "_max_ends")
+    
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self._max_ends: Optional[List[int]] = None
+    
+    def add(self, start: int, end: int):
+        index = bisect_left(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self._max_ends = None
+    
+    def remove(self, start: int, end: int) -> bool:
+        index = bisect_left(self.starts, start)
+        while index < len(self.starts) and self.starts[index] == start:
+            if self.ends[index] == end:
+                del self.starts[index]
+                del self.ends[index]
+                self._max_ends = None
+                return True
+            index += 1
+        return False
+    
+    def overlaps(self, start: int, end: int) -> bool:
+        """True if any stay overlaps [start, end)."""
+        # Stays starting before `end` overlap unless all of them end by `start`
+        count = bisect_left(self.starts, end)
+        if count == 0:
+            return False
+        if self._max_ends is None:
+            self._max_ends = self._running_max(self.ends)
+        return self._max_ends[count - 1] > start
+    
+    @staticmethod
+    def _running_max(values: List[int]) -> List[int]:
+        result, current = [], 0
+        for value in values:
+            current = value if value > current else current
+            result.append(current)
+        return result
+
+
+class UnitIntervalIndex:
+    """Per-unit interval index answering overlap queries in O(log n) per unit."""
+    
+    def __init__(self):
+        self._units: Dict[int, _UnitStays] = {}
+        self.size = 0
+    
+    @classmethod
+    def build(cls, stays: Iterable[Tuple]) -> "UnitIntervalIndex":
+        """
+        Build an index from (property_id, check_in, check_out) tuples.
+        """
+        index = cls()
+        grouped: Dict[int, List[Tuple[int, int]]] = {}
+        for property_id, check_in, check_out in stays:
+            grouped.setdefault(property_id, []).append((_ordinal(check_in), _ordinal(check_out)))
+        for property_id, intervals in grouped.items():
+            intervals.sort()
+            unit = _UnitStays()
+            unit.starts = [start for start, _ in intervals]
+            unit.ends = [end for _, end in intervals]
+            index._units[property_id] = unit
+            index.size += len(intervals)
+        return index
+    
+    def add(self, property_id: int, check_in: date, check_out: date):
+        self._units.setdefault(property_id, _UnitStays()).add(_ordinal(check_in), _ordinal(check_out))
+        self.size += 1
+    
+    def remove(self, property_id: int, check_in: date, check_out: date):
+        unit = self._units.get(property_id)
+        if unit is not None and unit.remove(_ordinal(check_in), _ordinal(check_out)):
+            self.size -= 1
+    
+    def is_free(self, property_id: int, check_in: date, check_out: date) -> bool:
+        """True if the unit has no stay overlapping [check_in, check_out)."""
+        unit = self._units.get(property_id)
+        return unit is None or not unit.overlaps(_ordinal(check_in), _ordinal(check_out))
+    
+    def free_units(self, property_ids: Iterable[int], check_in: date, check_out: date) -> List[int]:
+        """Units among property_ids with no stay overlapping [check_in, check_out)."""
+        start, end = _ordinal(check_in), _ordinal(check_out)
+        units = self._units
+        return [
+            property_id for property_id in property_ids
+            if property_id not in units or not units[property_id].overlaps(start, end)
+        ]
+
+
+class LiveIndex:
+    """
+    Process-wide in-memory index of stays kept in step with the "bookings"
+    change events.
+    
+    Every booking write, in any worker, publishes the stay it removed and the
+    stay it added; the index applies them in place in version order. It is
+    rebuilt in a background thread when an event cannot be applied (a version
+    gap, a bulk change) and once it is `max_age` seconds old (writes made
+    outside the API publish nothing). Readers keep the current index until
+    the new one is swapped in; only the first lookup builds on the request.
+    
+    The index type only needs `build(stays)`, `add(...)` and `remove(...)`
+    taking (property_id, check_in, check_out).
+    """
+    
+    # Seconds the index may trail the change version (events still being
+    # delivered by the coordinator) before it is rebuilt
+    LAG_GRACE = 2.0
+    
+    def __init__(
+        self,
+        build: Callable[[Iterable[Tuple]], object],
+        history_days: Callable[[], int] = lambda: 0,
+        max_age: Callable[[], float] = lambda: settings.LIVE_INDEX_MAX_AGE
+    ):
+        """
+        Args:
+            build: Builds the index from (property_id, check_in, check_out) tuples
+            history_days: Nights before today to load (read at every rebuild)
+            max_age: Seconds an index is used before it is rebuilt (read at every lookup; 0 disables)
+        """
+        self._build = build
+        self._history_days = history_days
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._index = None
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+        self._stale = False
+        self._behind_since: Optional[float] = None
+        # Events received while a rebuild runs, replayed onto the new index
+        self._pending: Optional[List[Tuple]] = None
+        self._refreshing = False
+        self._coordinator = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self.built_from: Optional[date] = None
+    
+    def get(self, repository: BookingRepository):
+        """
+        Get the index, building it on the first lookup.
+        
+        Later rebuilds run in the background (see `_needs_refresh`); the
+        current index is returned meanwhile.
+        
+        Args:
+            repository: Repository used to load the stays when building on this request
+        """
+        self._follow()
+        version = get_coordinator().version("bookings")
+        with self._lock:
+            if self._index is not None:
+                if self._needs_refresh(version):
+                    self._refresh_in_background()
+                return self._index
+        
+        # First lookup: one build at a time; requests waiting on it reuse the result
+        with self._build_lock:
+            with self._lock:
+                if self._index is not None:
+                    return self._index
+            return self._rebuild(repository)
+    
+    def current(self):
+        """
+        Get the index only if it reflects the latest "bookings" version, else
+        None. Never builds or waits on a build (for write paths); a due
+        rebuild is started in the background.
+        """
+        self._follow()
+        version = get_coordinator().version("bookings")
+        with self._lock:
+            if self._index is None:
+                return None
+            if self._needs_refresh(version):
+                self._refresh_in_background()
+            if self._stale or self._version != version:
+                return None
+            return self._index
+    
+    def apply_change(self, removed: Optional[Tuple], added: Optional[Tuple], version: Optional[int]):
+        """
+        Apply a booking write made by this worker (stays from `stay_of`).
+        
+        Its change event does the same when it is delivered; whichever comes
+        second is ignored.
+        """
+        if version is None:
+            return
+        with self._lock:
+            self._apply(version, removed, added)
+    
+    def invalidate(self):
+        """Drop the index (rebuilt on the next query)."""
+        with self._lock:
+            self._index = None
+            self._version = None
+    
+    def _follow(self):
+        """Subscribe to the "bookings" events of the configured coordinator."""
+        coordinator = get_coordinator()
+        if coordinator is self._coordinator:
+            return
+        with self._lock:
+            if coordinator is self._coordinator:
+                return
+            if self._unsubscribe is not None:
+                self._unsubscribe()
+            self._unsubscribe = coordinator.subscribe("bookings", self._on_event)
+            self._coordinator = coordinator
+    
+    def _on_event(self, channel: str, payload: dict):
+        version = payload.get("version")
+        if version is None:
+            return
+        with self._lock:
+            if "added" not in payload:
+                # Bulk change: the stays are not in the event
+                if self._version is not None and version > self._version:
+                    self._stale = True
+                    self._refresh_in_background()
+                return
+            self._apply(version, payload.get("removed"), payload.get("added"))
+            if self._stale:
+                self._refresh_in_background()
+    
+    def _apply(self, version: int, removed: Optional[Tuple], added: Optional[Tuple]):
+        """Apply one change in version order (call with the lock held)."""
+        if self._pending is not None:
+            self._pending.append((version, removed, added))
+        if self._index is None or self._version is None or version <= self._version:
+            return
+        if version != self._version + 1:
+            self._stale = True
+            return
+        for stay, apply in ((removed, self._index.remove), (added, self._index.add)):
+            if stay is not None:
+                apply(*stay)
+        self._version = version
+    
+    def _needs_refresh(self, version: int) -> bool:
+        """
+        Whether the index should be rebuilt: an event could not be applied,
+        it has trailed `version` for LAG_GRACE seconds, or it is older than
+        `max_age` (call with the lock held).
+        """
+        now = time.monotonic()
+        if self._version == version:
+            self._behind_since = None
+        elif self._behind_since is None:
+            self._behind_since = now
+        max_age = self._max_age()
+        return (
+            self._stale
+            or (self._behind_since is not None and now - self._behind_since >= self.LAG_GRACE)
+            or (max_age > 0 and now - self._built_at >= max_age)
+        )
+    
+    def _refresh_in_background(self):
+        """Start a background rebuild unless one is running (call with the lock held)."""
+        if self._refreshing:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._refresh, name="live-index-rebuild", daemon=True).start()
+    
+    def _refresh(self):
+        repository = BookingRepository()
+        try:
+            with self._build_lock, dedicated_connections(repository):
+                self._rebuild(repository)
+        except Exception as e:
+            print(f"⚠️ Error rebuilding in-memory index: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def _rebuild(self, repository: BookingRepository):
+        """Build a new index and swap it in (call with the build lock held)."""
+        with self._lock:
+            self._pending = []
+        try:
+            version = get_coordinator().version("bookings")
+            built_from = date.today() - timedelta(days=self._history_days())
+            index = self._build(repository.get_occupied_intervals(built_from))
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._index, self._version, self.built_from = index, version, built_from
+            self._built_at = time.monotonic()
+            self._stale = False
+            self._behind_since = None
+            for change in pending:
+                self._apply(*change)
+        return index
+
+
+def stay_of(booking: Optional[Booking]) -> Optional[Tuple[int, str, str]]:
+    """
+    (property_id, check_in, check_out) of a booking as published in the
+    "bookings" change events, or None if it takes no nights.
+    """
+    if booking is None or booking.property_id is None or _is_cancelled(booking):
+        return None
+    return booking.property_id, booking.check_in.isoformat(), booking.check_out.isoformat()
+
+
+def _is_cancelled(booking: Booking) -> bool:
+    return bool(booking.status) and booking.status.lower() == "cancelled"
+
+
+# Process-wide index (shared by the services of this worker)
+availability_index = LiveIndex(UnitIntervalIndex.build)
+
+
+class AvailabilityService:
+    """Service for finding free units."""
+    
+    def __init__(
+        self,
+        booking_repository: Optional[BookingRepository] = None,
+        property_repository: Optional[PropertyRepository] = None,
+        index: Optional[LiveIndex] = None
+    ):
+        """
+        Initialize the service.
+        
+        Args:
+            booking_repository: BookingRepository used to build the index (optional)
+            property_repository: PropertyRepository listing the units (optional)
+            index: LiveIndex of UnitIntervalIndex (defaults to the process-wide index)
+        """
+        self.booking_repository = booking_repository or BookingRepository()
+        self.property_repository = property_repository or PropertyRepository()
+        self.index = index or availability_index
+    
+    def find_available(
+        self,
+        check_in: date,
+        check_out: date,
+        guests: int = 1,
+        property_ids: Optional[List[int]] = None
+    ) -> AvailabilityResponse:
+        """
+        Find the units free for a whole stay.
+        
+        Args:
+            check_in: Arrival date (today or later)
+            check_out: Departure date (after check_in)
+            guests: Guests to accommodate (units with a lower capacity are excluded)
+            property_ids: Optional subset of units to consider
+        
+        Returns:
+            Available units and counts
+        
+        Raises:
+            ValueError: If the dates are invalid
+        """
+        if check_out <= check_in:
+            raise ValueError("check_out must be after check_in")
+        if check_in < date.today():
+            raise ValueError("check_in must not be in the past")
+        
+        properties = self.property_repository.get_all()
+        if property_ids is not None:
+            wanted = set(property_ids)
+            properties = [p for p in properties if p.property_id in wanted]
+        candidates = [p for p in properties if p.capacity is None or p.capacity >= guests]
+        
+        index = self.index.get(self.booking_repository)
+        free = set(index.free_units([p.property_id for p in candidates], check_in, check_out))
+        available = [p for p in candidates if p.property_id in free]
+        
+        return AvailabilityResponse(
+            check_in=check_in,
+            check_out=check_out,
+            nights=(check_out - check_in).days,
+            guests=guests,
+            total_units=len(properties),
+            available_count=len(available),
+            available=available,
+        )
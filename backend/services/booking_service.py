@@ -3,43 +3,173 @@ Business logic service for bookings.
 Handles use cases and business rules.
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
 from datetime import date, timedelta
+import threading
+import time
+from backend.config import settings
+from backend.coordination import get_coordinator
+from backend.observability import record_cache_lookup
+from backend.observability.metrics import OCCUPANCY_ROLLUP_ERRORS
 from backend.repositories.booking_repository import BookingRepository
-from backend.models.booking import Booking, BookingCreate, BookingUpdate
+from backend.repositories.occupancy_repository import OccupancyRepository
+from backend.repositories.property_repository import PropertyRepository
+from backend.services.availability_service import availability_index, stay_of
+from backend.services.event_fragments import event_fragment_cache
+from backend.services.occupancy_engine import occupancy_engine
+from backend.models.booking import Booking, BookingBatchResponse, BookingCreate, BookingUpdate, BookingFilter
+from backend.models.dashboard import DashboardCounts, DashboardResponse
+from backend.models.job import Progress
+from backend.models.stats import BookingStatsResponse
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+class BookingWindow:
+    """
+    Bookings touching [start, end], sorted by check-in and by check-out so
+    narrower windows are sliced out by binary search.
+    """
+    
+    def __init__(self, start: date, end: date, bookings: List[Booking]):
+        self.start = start
+        self.end = end
+        self.by_check_in = sorted(bookings, key=lambda b: b.check_in)
+        self.check_ins = [b.check_in for b in self.by_check_in]
+        self.by_check_out = sorted(bookings, key=lambda b: b.check_out)
+        self.check_outs = [b.check_out for b in self.by_check_out]
+    
+    def covers(self, start: date, end: date) -> bool:
+        return self.start <= start and end <= self.end
+    
+    def overlapping(self, start: date, end: date) -> List[Booking]:
+        """Bookings with check_in <= end and check_out >= start, by check-in."""
+        arrived = bisect_right(self.check_ins, end)
+        staying = len(self.check_outs) - bisect_left(self.check_outs, start)
+        # Filter whichever side of the window is smaller
+        if arrived <= staying:
+            return [b for b in self.by_check_in[:arrived] if b.check_out >= start]
+        ids = {id(b) for b in self.by_check_out[len(self.check_outs) - staying:] if b.check_in <= end}
+        return [b for b in self.by_check_in[:arrived] if id(b) in ids]
+    
+    def checking_in(self, start: date, end: date) -> List[Booking]:
+        """Bookings with start <= check_in <= end, by check-in."""
+        return self.by_check_in[bisect_left(self.check_ins, start):bisect_right(self.check_ins, end)]
+    
+    def checking_out(self, start: date, end: date) -> List[Booking]:
+        """Bookings with start <= check_out <= end, by check-out."""
+        return self.by_check_out[bisect_left(self.check_outs, start):bisect_right(self.check_outs, end)]
+
+
+class BookingRangeMemo:
+    """
+    Process-wide memo of the last fetched BookingWindow per property filter.
+    
+    A window is reused while the "bookings" change version is unchanged
+    (writes in any worker) and for at most `ttl` seconds (catches writes
+    made outside the API).
+    """
+    
+    def __init__(self, ttl: Callable[[], float], max_entries: int = 64):
+        """
+        Args:
+            ttl: Seconds a window may be reused (read at every lookup; 0 disables)
+            max_entries: Property filters kept (oldest dropped first)
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Optional[int], Tuple[int, float, BookingWindow]] = {}
+    
+    def get(
+        self,
+        start: date,
+        end: date,
+        property_id: Optional[int],
+        load: Callable[[], BookingWindow]
+    ) -> BookingWindow:
+        """
+        Get a window covering [start, end], calling `load` on a miss.
+        """
+        ttl = self._ttl()
+        version = get_coordinator().version("bookings")
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(property_id)
+        if ttl > 0 and entry and entry[0] == version and entry[1] > now and entry[2].covers(start, end):
+            record_cache_lookup("booking_range", True)
+            return entry[2]
+        
+        record_cache_lookup("booking_range", False)
+        window = load()
+        if ttl > 0:
+            with self._lock:
+                self._entries.pop(property_id, None)
+                if len(self._entries) >= self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[property_id] = (version, now + ttl, window)
+        return window
+    
+    def invalidate(self):
+        """Drop every window (refetched on the next lookup)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide memo (shared by the services of this worker)
+booking_range_memo = BookingRangeMemo(lambda: settings.BOOKING_RANGE_TTL)
+
+
 class BookingService:
     """Service for managing booking business logic."""
     
-    def __init__(self, repository: Optional[BookingRepository] = None):
+    # Most record IDs a batch fetch accepts
+    MAX_BATCH_IDS = 1000
+    
+    # Fields a PATCH cannot clear: required, or defaulted when read (a cleared
+    # status/persons/adults/children would read back as Confirmed/1/1/0)
+    REQUIRED_FIELDS = (
+        "booking_id", "guest_name", "check_in", "check_out", "nights",
+        "status", "persons", "adults", "children"
+    )
+    
+    def __init__(
+        self,
+        repository: Optional[BookingRepository] = None,
+        occupancy_repository: Optional[OccupancyRepository] = None,
+        property_repository: Optional[PropertyRepository] = None
+    ):
         """
         Initialize the service.
         
         Args:
             repository: BookingRepository instance (optional, creates one if not provided)
+            occupancy_repository: OccupancyRepository kept in sync on writes (optional)
+            property_repository: PropertyRepository used to link bookings to properties (optional)
         """
         self.repository = repository or BookingRepository()
+        self.occupancy_repository = occupancy_repository or OccupancyRepository()
+        self.property_repository = property_repository or PropertyRepository()
         
         # Get electric booking IDs from environment
         electric_str = os.getenv('ELECTRIC', '')
         self.electric_bookings = set(b.strip() for b in electric_str.split(',') if b.strip())
     
-    def get_all_bookings(self, limit: Optional[int] = None) -> List[Booking]:
+    def get_all_bookings(self, limit: Optional[int] = None, property_id: Optional[int] = None) -> List[Booking]:
         """
         Get all bookings.
         
         Args:
             limit: Optional limit for results
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of bookings
         """
-        bookings = self.repository.get_all(limit=limit)
+        bookings = self.repository.get_all(limit=limit, property_id=property_id)
         return self._add_electric_allowance(bookings)
     
     def get_booking_by_id(self, record_id: int) -> Optional[Booking]:
@@ -57,10 +187,36 @@ class BookingService:
             booking = self._calculate_electric_allowance(booking)
         return booking
     
+    def get_bookings_by_ids(self, record_ids: List[int]) -> BookingBatchResponse:
+        """
+        Get several bookings by ID in one call.
+        
+        Args:
+            record_ids: Database record IDs (duplicates are returned once)
+            
+        Returns:
+            Bookings in request order plus the IDs not found
+            
+        Raises:
+            ValueError: If no IDs or more than MAX_BATCH_IDS are requested
+        """
+        record_ids = list(dict.fromkeys(record_ids))
+        if not record_ids:
+            raise ValueError("At least one record ID is required")
+        if len(record_ids) > self.MAX_BATCH_IDS:
+            raise ValueError(f"Too many record IDs (max {self.MAX_BATCH_IDS})")
+        
+        found = self.repository.get_many(record_ids)
+        return BookingBatchResponse(
+            bookings=self._add_electric_allowance([found[i] for i in record_ids if i in found]),
+            missing=[i for i in record_ids if i not in found]
+        )
+    
     def get_bookings_for_period(
         self, 
         start_date: Optional[date] = None, 
-        days: int = 14
+        days: int = 14,
+        property_id: Optional[int] = None
     ) -> List[Booking]:
         """
         Get bookings for a specific period.
@@ -68,6 +224,7 @@ class BookingService:
         Args:
             start_date: Start date (defaults to today)
             days: Number of days from start_date (default 14)
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of bookings in the period
@@ -77,13 +234,14 @@ class BookingService:
         
         end_date = start_date + timedelta(days=days)
         
-        bookings = self.repository.get_by_date_range(start_date, end_date)
+        bookings = self.repository.get_by_date_range(start_date, end_date, property_id)
         return self._add_electric_allowance(bookings)
     
     def get_bookings_for_date_range(
         self, 
         start_date: date, 
-        end_date: date
+        end_date: date,
+        property_id: Optional[int] = None
     ) -> List[Booking]:
         """
         Get bookings for a custom date range.
@@ -91,37 +249,36 @@ class BookingService:
         Args:
             start_date: Start date
             end_date: End date
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of bookings in the range
         """
-        bookings = self.repository.get_by_date_range(start_date, end_date)
+        bookings = self.repository.get_by_date_range(start_date, end_date, property_id)
         return self._add_electric_allowance(bookings)
     
-    def get_active_bookings(self) -> List[Booking]:
+    def get_active_bookings(self, property_id: Optional[int] = None) -> List[Booking]:
         """
         Get currently active bookings (guests currently staying).
         
+        Args:
+            property_id: Optional property to restrict the bookings to
+        
         Returns:
             List of active bookings
         """
         today = date.today()
-        all_bookings = self.repository.get_by_date_range(today, today)
         
-        # Filter for active bookings (check-in <= today <= check-out)
-        active = [
-            b for b in all_bookings 
-            if b.check_in <= today <= b.check_out
-        ]
-        
-        return self._add_electric_allowance(active)
+        # Active bookings: check-in <= today <= check-out
+        return self._bookings_window(today, today, property_id).overlapping(today, today)
     
-    def get_upcoming_checkins(self, days: int = 7) -> List[Booking]:
+    def get_upcoming_checkins(self, days: int = 7, property_id: Optional[int] = None) -> List[Booking]:
         """
         Get bookings with upcoming check-ins.
         
         Args:
             days: Number of days to look ahead (default 7)
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of bookings with upcoming check-ins
@@ -129,25 +286,16 @@ class BookingService:
         today = date.today()
         end_date = today + timedelta(days=days)
         
-        all_bookings = self.repository.get_by_date_range(today, end_date)
-        
-        # Filter for upcoming check-ins
-        upcoming = [
-            b for b in all_bookings 
-            if today <= b.check_in <= end_date
-        ]
-        
-        # Sort by check-in date
-        upcoming.sort(key=lambda b: b.check_in)
-        
-        return self._add_electric_allowance(upcoming)
+        # Check-ins in [today, end_date], sorted by check-in date
+        return self._bookings_window(today, end_date, property_id).checking_in(today, end_date)
     
-    def get_upcoming_checkouts(self, days: int = 7) -> List[Booking]:
+    def get_upcoming_checkouts(self, days: int = 7, property_id: Optional[int] = None) -> List[Booking]:
         """
         Get bookings with upcoming check-outs.
         
         Args:
             days: Number of days to look ahead (default 7)
+            property_id: Optional property to restrict the bookings to
             
         Returns:
             List of bookings with upcoming check-outs
@@ -155,18 +303,44 @@ class BookingService:
         today = date.today()
         end_date = today + timedelta(days=days)
         
-        all_bookings = self.repository.get_by_date_range(today, end_date)
+        # Check-outs in [today, end_date], sorted by check-out date
+        return self._bookings_window(today, end_date, property_id).checking_out(today, end_date)
+    
+    def search_bookings(self, filters: Optional[BookingFilter] = None) -> List[Booking]:
+        """
+        Search bookings with the search-page filters.
         
-        # Filter for upcoming check-outs
-        upcoming = [
-            b for b in all_bookings 
-            if today <= b.check_out <= end_date
-        ]
+        Args:
+            filters: Optional filters (dates, status, text matches, nights)
+            
+        Returns:
+            List of matching bookings ordered by check-in
+        """
+        bookings = self.repository.search(filters)
+        return self._add_electric_allowance(bookings)
+    
+    def get_booking_stats(
+        self,
+        filters: Optional[BookingFilter] = None,
+        group_by: Optional[str] = None
+    ) -> BookingStatsResponse:
+        """
+        Get aggregated statistics (count, nights, revenue, average price).
         
-        # Sort by check-out date
-        upcoming.sort(key=lambda b: b.check_out)
+        Aggregates are computed by the database, so no booking rows are loaded.
         
-        return self._add_electric_allowance(upcoming)
+        Args:
+            filters: Optional filters (same as booking search)
+            group_by: Optional grouping ('month', 'status' or 'booking_id')
+            
+        Returns:
+            Statistics with overall summary and optional groups
+            
+        Raises:
+            ValueError: If group_by is not supported
+        """
+        summary, groups = self.repository.get_stats(filters, group_by)
+        return BookingStatsResponse(summary=summary, group_by=group_by, groups=groups)
     
     def create_booking(self, booking_data: BookingCreate) -> Booking:
         """
@@ -180,6 +354,7 @@ class BookingService:
             
         Raises:
             ValueError: If validation fails
+            BookingConflictError: If a night is already taken in the property
         """
         # Additional business validations
         if booking_data.check_out <= booking_data.check_in:
@@ -189,34 +364,114 @@ class BookingService:
         if not booking_data.nights:
             booking_data.nights = (booking_data.check_out - booking_data.check_in).days
         
-        # Check for overlapping bookings (optional business rule)
-        # overlapping = self._check_overlapping_bookings(
-        #     booking_data.check_in, 
-        #     booking_data.check_out
-        # )
-        # if overlapping:
-        #     raise ValueError("Booking overlaps with existing booking")
-        
+        # Overlaps are rejected by the repository: the booking and its nights
+        # in the night ledger are written in one transaction
+        self._resolve_property(booking_data)
+        self._precheck_nights(
+            booking_data.property_id, booking_data.check_in, booking_data.check_out, booking_data.status
+        )
         booking = self.repository.create(booking_data)
+        self._update_occupancy(added=booking)
+        self._publish_change("created", booking.record_id, added=booking)
         return self._calculate_electric_allowance(booking)
     
-    def update_booking(self, record_id: int, booking_data: BookingUpdate) -> Optional[Booking]:
+    def update_booking(
+        self,
+        record_id: int,
+        booking_data: BookingUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
         """
         Update an existing booking.
         
         Args:
             record_id: Database record ID
             booking_data: Fields to update
+            expected_version: Version the client read (If-Match); defaults to booking_data.version
             
         Returns:
             Updated booking or None if not found
+            
+        Raises:
+            BookingConflictError: If the new dates/property take an already taken night
+            VersionConflictError: If the booking changed since expected_version
         """
         # Auto-calculate nights if dates are being updated
         if booking_data.check_in and booking_data.check_out:
             booking_data.nights = (booking_data.check_out - booking_data.check_in).days
         
-        booking = self.repository.update(record_id, booking_data)
+        if booking_data.booking_id or booking_data.property_id is not None:
+            self._resolve_property(booking_data)
+        
+        previous = self.repository.get_by_id(record_id)
+        if previous is not None:
+            self._precheck_stay_change(previous, booking_data.model_dump(exclude_none=True))
+        if expected_version is None:
+            expected_version = booking_data.version
+        booking = self.repository.update(record_id, booking_data, expected_version)
         if booking:
+            self._update_occupancy(removed=previous, added=booking)
+            self._publish_change("updated", record_id, removed=previous, added=booking)
+            booking = self._calculate_electric_allowance(booking)
+        return booking
+    
+    def patch_booking(
+        self,
+        record_id: int,
+        patch: BookingUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[Booking]:
+        """
+        Partially update a booking: only the fields present in the request are written.
+        
+        Fields sent as null are cleared (required fields cannot be). nights is
+        recomputed only when a date changes, and the unit is re-linked only
+        when booking_id changes.
+        
+        Args:
+            record_id: Database record ID
+            patch: Fields to change (unset fields are left alone)
+            expected_version: Version the client read (If-Match); defaults to patch.version
+            
+        Returns:
+            Updated booking or None if not found
+            
+        Raises:
+            ValueError: If a required field is cleared or the dates are invalid
+            BookingConflictError: If the new dates/property take an already taken night
+            VersionConflictError: If the booking changed since expected_version
+        """
+        changes = patch.model_dump(exclude_unset=True)
+        body_version = changes.pop("version", None)
+        if expected_version is None:
+            expected_version = body_version
+        
+        cleared = [field for field in self.REQUIRED_FIELDS if field in changes and changes[field] is None]
+        if cleared:
+            raise ValueError(f"Cannot clear required fields: {', '.join(cleared)}")
+        
+        previous = self.repository.get_by_id(record_id)
+        if previous is None:
+            return None
+        
+        if "check_in" in changes or "check_out" in changes:
+            check_in = changes.get("check_in", previous.check_in)
+            check_out = changes.get("check_out", previous.check_out)
+            if check_out <= check_in:
+                raise ValueError("Check-out must be after check-in")
+            changes["nights"] = (check_out - check_in).days
+        
+        if changes.get("property_id") is not None:
+            if not self.property_repository.get_by_id(changes["property_id"]):
+                raise ValueError(f"Property {changes['property_id']} not found")
+        elif "property_id" not in changes and changes.get("booking_id", "").strip():
+            changes["property_id"] = self.property_repository.get_or_create_id(changes["booking_id"])
+        
+        self._precheck_stay_change(previous, changes)
+        booking = self.repository.update_fields(record_id, changes, expected_version)
+        if booking:
+            self._update_occupancy(removed=previous, added=booking)
+            self._publish_change("updated", record_id, removed=previous, added=booking)
             booking = self._calculate_electric_allowance(booking)
         return booking
     
@@ -230,12 +485,32 @@ class BookingService:
         Returns:
             True if deleted, False if not found
         """
-        return self.repository.delete(record_id)
+        previous = self.repository.get_by_id(record_id)
+        deleted = self.repository.delete(record_id)
+        if deleted:
+            self._update_occupancy(removed=previous)
+            self._publish_change("deleted", record_id, removed=previous)
+        return deleted
+    
+    def rebuild_night_ledger(self, from_date: Optional[date] = None, progress: Optional[Progress] = None) -> dict:
+        """
+        Rebuild the night ledger used to reject double bookings.
+        
+        Args:
+            from_date: Only bookings checking out after this date (defaults to today)
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Dictionary with nights_written and nights_skipped (already taken)
+        """
+        written, skipped = self.repository.rebuild_night_ledger(from_date or date.today(), progress)
+        return {"nights_written": written, "nights_skipped": skipped}
     
     def get_calendar_events(
         self, 
         start_date: Optional[date] = None, 
-        days: int = 90
+        days: int = 90,
+        property_id: Optional[int] = None
     ) -> List[dict]:
         """
         Get bookings formatted as calendar events.
@@ -243,49 +518,179 @@ class BookingService:
         Args:
             start_date: Start date (defaults to today)
             days: Number of days to include (default 90)
+            property_id: Optional property (per-unit calendar)
             
         Returns:
             List of calendar event dictionaries
         """
-        bookings = self.get_bookings_for_period(start_date, days)
+        bookings = self.get_bookings_for_period(start_date, days, property_id)
+        return self._to_calendar_events(bookings)
+    
+    def get_calendar_events_json(
+        self,
+        start_date: Optional[date] = None,
+        days: int = 90,
+        property_id: Optional[int] = None
+    ) -> bytes:
+        """
+        Get the calendar events as an encoded JSON array.
+        
+        Same events as get_calendar_events, joined from per-booking JSON
+        fragments cached by (record ID, version): only bookings changed
+        since the last call are rendered and encoded.
         
-        events = []
-        for booking in bookings:
-            # Skip cancelled bookings close to check-in
-            if booking.status and booking.status.lower() == 'cancelled':
-                if (booking.check_in - date.today()).days < 3:
-                    continue
+        Args:
+            start_date: Start date (defaults to today)
+            days: Number of days to include (default 90)
+            property_id: Optional property (per-unit calendar)
+            
+        Returns:
+            JSON array (UTF-8)
+        """
+        bookings = self.get_bookings_for_period(start_date, days, property_id)
+        today = date.today()
+        visible = [b for b in bookings if not self._hidden_on_calendar(b, today)]
+        return event_fragment_cache.join(visible, self._calendar_event)
+    
+    def get_dashboard(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        days: int = 7,
+        property_id: Optional[int] = None
+    ) -> DashboardResponse:
+        """
+        Get all the overview data with a single bookings query.
+        
+        One range query covers the union of the calendar period and the
+        today..today+days window; active stays, upcoming check-ins and
+        check-outs, calendar events and counts are derived from it in memory
+        (same rules as the separate endpoints).
+        
+        Args:
+            start_date: First day of the calendar period (defaults to the 1st of this month)
+            end_date: Last day of the calendar period (defaults to the end of that month)
+            days: Look-ahead window for check-ins/check-outs (default 7)
+            property_id: Optional property to restrict the bookings to
+            
+        Returns:
+            DashboardResponse
             
-            event = {
-                "id": f"booking-{booking.record_id}",
-                "title": f"{booking.booking_id} - {booking.guest_name}",
-                "start": booking.check_in.isoformat(),
-                "end": booking.check_out.isoformat(),
-                "allDay": True,
-                "classNames": ["reserva"] + (["cancelled"] if booking.status and booking.status.lower() == 'cancelled' else []),
-                "extendedProps": {
-                    "record_id": booking.record_id,
-                    "booking_id": booking.booking_id,
-                    "booking_number": booking.booking_number,
-                    "guest_name": booking.guest_name,
-                    "check_in": booking.check_in.isoformat(),
-                    "check_out": booking.check_out.isoformat(),
-                    "status": booking.status,
-                    "nights": booking.nights,
-                    "persons": booking.persons,
-                    "adults": booking.adults,
-                    "children": booking.children,
-                    "email": booking.email,
-                    "phone": booking.phone,
-                    "price": booking.price,
-                    "charges": booking.charges,
-                    "electric_allowance": booking.electric_allowance,
-                    "source": "database"
-                }
+        Raises:
+            ValueError: If the period is invalid
+        """
+        today = date.today()
+        if start_date is None:
+            start_date = today.replace(day=1)
+        if end_date is None:
+            next_month = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+            end_date = next_month - timedelta(days=1)
+        if end_date < start_date:
+            raise ValueError("end_date must be on or after start_date")
+        if (end_date - start_date).days > 366:
+            raise ValueError("Period too long (max 1 year)")
+        horizon = today + timedelta(days=days)
+        
+        window = self._bookings_window(min(start_date, today), max(end_date, horizon), property_id)
+        
+        active = window.overlapping(today, today)
+        checkins = window.checking_in(today, horizon)
+        checkouts = window.checking_out(today, horizon)
+        period = window.overlapping(start_date, end_date)
+        
+        return DashboardResponse(
+            today=today,
+            start_date=start_date,
+            end_date=end_date,
+            days=days,
+            counts=DashboardCounts(
+                in_house=len(active),
+                arrivals_today=sum(1 for b in checkins if b.check_in == today),
+                departures_today=sum(1 for b in checkouts if b.check_out == today),
+                upcoming_checkins=len(checkins),
+                upcoming_checkouts=len(checkouts),
+                period_bookings=len(period),
+                period_cancelled=sum(1 for b in period if b.status and b.status.lower() == 'cancelled')
+            ),
+            active=active,
+            upcoming_checkins=checkins,
+            upcoming_checkouts=checkouts,
+            calendar_events=self._to_calendar_events(period)
+        )
+    
+    def _bookings_window(self, start: date, end: date, property_id: Optional[int] = None) -> BookingWindow:
+        """
+        Bookings touching [start, end] from one range query, shared through
+        the range memo by the views derived from it.
+        
+        Fetches extend to today + BOOKING_RANGE_LOOKAHEAD_DAYS so the usual
+        active/upcoming windows are answered by the same fetch.
+        """
+        def load() -> BookingWindow:
+            fetch_end = max(end, date.today() + timedelta(days=settings.BOOKING_RANGE_LOOKAHEAD_DAYS))
+            bookings = self.repository.get_by_date_range(start, fetch_end, property_id)
+            return BookingWindow(start, fetch_end, self._add_electric_allowance(bookings))
+        
+        return booking_range_memo.get(start, end, property_id, load)
+    
+    def _to_calendar_events(self, bookings: List[Booking]) -> List[dict]:
+        """Format bookings as calendar events (skipping cancellations close to check-in)."""
+        today = date.today()
+        return [self._calendar_event(b) for b in bookings if not self._hidden_on_calendar(b, today)]
+    
+    @staticmethod
+    def _hidden_on_calendar(booking: Booking, today: date) -> bool:
+        """Cancelled bookings are hidden from the calendar close to check-in."""
+        return bool(booking.status) and booking.status.lower() == 'cancelled' and (booking.check_in - today).days < 3
+    
+    @staticmethod
+    def _calendar_event(booking: Booking) -> dict:
+        """Calendar event of a booking."""
+        return {
+            "id": f"booking-{booking.record_id}",
+            "title": f"{booking.booking_id} - {booking.guest_name}",
+            "start": booking.check_in.isoformat(),
+            "end": booking.check_out.isoformat(),
+            "allDay": True,
+            "classNames": ["reserva"] + (["cancelled"] if booking.status and booking.status.lower() == 'cancelled' else []),
+            "extendedProps": {
+                "record_id": booking.record_id,
+                "version": booking.version,
+                "booking_id": booking.booking_id,
+                "booking_number": booking.booking_number,
+                "property_id": booking.property_id,
+                "guest_name": booking.guest_name,
+                "check_in": booking.check_in.isoformat(),
+                "check_out": booking.check_out.isoformat(),
+                "status": booking.status,
+                "nights": booking.nights,
+                "persons": booking.persons,
+                "adults": booking.adults,
+                "children": booking.children,
+                "email": booking.email,
+                "phone": booking.phone,
+                "price": booking.price,
+                "charges": booking.charges,
+                "electric_allowance": booking.electric_allowance,
+                "source": "database"
             }
-            events.append(event)
+        }
+    
+    def _resolve_property(self, booking_data):
+        """
+        Link a booking to its property.
+        
+        An explicit property_id must exist; otherwise the property is looked
+        up (or created) by the unit code in booking_id.
         
-        return events
+        Raises:
+            ValueError: If property_id does not exist
+        """
+        if booking_data.property_id is not None:
+            if not self.property_repository.get_by_id(booking_data.property_id):
+                raise ValueError(f"Property {booking_data.property_id} not found")
+        elif booking_data.booking_id and booking_data.booking_id.strip():
+            booking_data.property_id = self.property_repository.get_or_create_id(booking_data.booking_id)
     
     def _calculate_electric_allowance(self, booking: Booking) -> Booking:
         """Calculate electric allowance for a single booking."""
@@ -295,23 +700,111 @@ class BookingService:
             booking.electric_allowance = None
         return booking
     
+    def _update_occupancy(
+        self,
+        removed: Optional[Booking] = None,
+        added: Optional[Booking] = None
+    ):
+        """
+        Apply a booking change to the daily occupancy rollup.
+        
+        A failure here must not fail the booking write; it is counted in
+        pms_occupancy_rollup_errors_total so the drift is visible, and the
+        rollup can always be rebuilt (rebuild_occupancy job or script).
+        """
+        for operation, booking, sign in (("remove", removed, -1), ("add", added, 1)):
+            if not booking:
+                continue
+            try:
+                self.occupancy_repository.apply_booking(booking, sign=sign)
+            except Exception as e:
+                OCCUPANCY_ROLLUP_ERRORS.inc(operation=operation)
+                print(f"⚠️ Error updating occupancy rollup: {e}")
+    
+    @staticmethod
+    def _publish_change(
+        action: str,
+        record_id: Optional[int],
+        removed: Optional[Booking] = None,
+        added: Optional[Booking] = None
+    ):
+        """
+        Bump the "bookings" change version with the stay removed and added,
+        so every worker applies the write to its in-memory indexes, and
+        apply it to this worker's right away.
+        
+        A coordination failure does not fail the write; caches in other
+        workers may then serve stale data until the next change.
+        """
+        removed, added = stay_of(removed), stay_of(added)
+        try:
+            version = get_coordinator().bump(
+                "bookings", {"action": action, "record_id": record_id, "removed": removed, "added": added}
+            )
+        except Exception as e:
+            print(f"⚠️ Error publishing booking change: {e}")
+            availability_index.invalidate()
+            occupancy_engine.invalidate()
+            booking_range_memo.invalidate()
+            return
+        availability_index.apply_change(removed, added, version)
+        occupancy_engine.apply_change(removed, added, version)
+    
+    @staticmethod
+    def publish_bulk_change(action: str):
+        """
+        Publish a write to many bookings made outside this service (backfills).
+        
+        Bumps the "bookings" change version without stays, so every worker
+        rebuilds its in-memory indexes in the background.
+        """
+        try:
+            get_coordinator().bump("bookings", {"action": action})
+        except Exception as e:
+            print(f"⚠️ Error publishing booking change: {e}")
+            availability_index.invalidate()
+            occupancy_engine.invalidate()
+        booking_range_memo.invalidate()
+    
     def _add_electric_allowance(self, bookings: List[Booking]) -> List[Booking]:
         """Add electric allowance to a list of bookings."""
         return [self._calculate_electric_allowance(b) for b in bookings]
     
-    def _check_overlapping_bookings(
-        self, 
-        check_in: date, 
-        check_out: date, 
+    def _precheck_nights(
+        self,
+        property_id: Optional[int],
+        check_in: date,
+        check_out: date,
+        status: Optional[str],
         exclude_id: Optional[int] = None
-    ) -> List[Booking]:
-        """Check for overlapping bookings (helper for validation)."""
-        all_bookings = self.repository.get_by_date_range(check_in, check_out)
+    ):
+        """
+        Reject a stay whose nights are taken before opening the write transaction.
         
-        overlapping = [
-            b for b in all_bookings 
-            if (exclude_id is None or b.record_id != exclude_id) and
-               not (b.check_out <= check_in or b.check_in >= check_out)
-        ]
+        The occupancy engine answers the usual case (every night free) from
+        memory when it is current; taken nights, or an engine that is not
+        built or behind, go to the night ledger (writes never wait on an
+        engine rebuild). The ledger insert stays the authority, so a booking
+        written in between still fails.
         
-        return overlapping
+        Raises:
+            BookingConflictError: If a night is already taken in the property
+        """
+        if property_id is None or (status and status.lower() == 'cancelled'):
+            return
+        engine = occupancy_engine.current()
+        try:
+            if engine is not None and engine.is_free(property_id, check_in, check_out):
+                return
+        except ValueError:
+            pass  # Window before the engine's history: the ledger decides
+        conflicting = self.repository.get_conflicting_ids(property_id, check_in, check_out, exclude_id=exclude_id)
+        if conflicting:
+            raise BookingRepository.conflict_error(property_id, check_in, check_out, conflicting)
+    
+    def _precheck_stay_change(self, previous: Booking, changes: Dict):
+        """Pre-check the nights of an update, if it moves the stay (see _precheck_nights)."""
+        stay = ("property_id", "check_in", "check_out", "status")
+        after = {field: changes.get(field, getattr(previous, field)) for field in stay}
+        if after != {field: getattr(previous, field) for field in stay}:
+            self._precheck_nights(**after, exclude_id=previous.record_id)
@@ -0,0 +1,85 @@
+"""
+Calendar events cached as pre-serialized JSON fragments.
+
+Each booking's event is rendered and encoded once per row version (the
+optimistic-concurrency `version` column, bumped by every API update); a
+calendar response is the fragments of its window joined into a JSON array,
+so only bookings that changed since the last call are rendered again and
+nothing is serialized a second time by FastAPI.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Tuple
+import json
+import threading
+from backend.models.booking import Booking
+from backend.observability import record_cache_lookup
+
+
+def encode_json(value) -> bytes:
+    """Encode like FastAPI's JSONResponse (compact, UTF-8)."""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class EventFragmentCache:
+    """Bounded LRU of encoded events keyed by record ID, valid for one row version."""
+    
+    def __init__(self, max_entries: int = 50000):
+        """
+        Args:
+            max_entries: Bookings kept (least recently used dropped first)
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+    
+    def fragments(self, bookings: Iterable[Booking], render: Callable[[Booking], dict]) -> List[bytes]:
+        """
+        Encoded events of the bookings, in order, rendering only the misses.
+        
+        Args:
+            bookings: Bookings to show
+            render: Builds the event dictionary of a booking
+        """
+        bookings = list(bookings)
+        fragments: List[bytes] = [b""] * len(bookings)
+        misses = []
+        with self._lock:
+            for i, booking in enumerate(bookings):
+                entry = self._entries.get(booking.record_id)
+                if entry is not None and entry[0] == booking.version:
+                    self._entries.move_to_end(booking.record_id)
+                    fragments[i] = entry[1]
+                else:
+                    misses.append(i)
+        
+        rendered = []
+        for i in misses:
+            fragments[i] = encode_json(render(bookings[i]))
+            if bookings[i].version is not None:
+                rendered.append((bookings[i].record_id, bookings[i].version, fragments[i]))
+        
+        if rendered:
+            with self._lock:
+                for record_id, version, fragment in rendered:
+                    self._entries[record_id] = (version, fragment)
+                    self._entries.move_to_end(record_id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        
+        record_cache_lookup("calendar_event", True, len(bookings) - len(misses))
+        record_cache_lookup("calendar_event", False, len(misses))
+        return fragments
+    
+    def join(self, bookings: Iterable[Booking], render: Callable[[Booking], dict]) -> bytes:
+        """JSON array of the bookings' events."""
+        return b"[" + b",".join(self.fragments(bookings, render)) + b"]"
+    
+    def clear(self):
+        """Drop every fragment."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache (shared by the services of this worker)
+event_fragment_cache = EventFragmentCache()
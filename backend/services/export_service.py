@@ -0,0 +1,304 @@
+"""
+Business logic service for booking exports.
+Streams bookings as CSV, NDJSON or Parquet in bounded memory.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+from datetime import date
+import csv
+import io
+import itertools
+import json
+import os
+from dotenv import load_dotenv
+from backend.config import settings
+from backend.repositories.booking_repository import BookingRepository
+from backend.models.booking import BookingFilter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+load_dotenv()
+
+
+class ExportService:
+    """Service for streaming booking exports."""
+    
+    # (output field, database column) in export order
+    EXPORT_COLUMNS: List[Tuple[str, str]] = [
+        ("record_id", "ID"),
+        ("booking_id", "Booking ID"),
+        ("booking_number", "Nº Booking"),
+        ("guest_name", "Nombre,Apellidos"),
+        ("check_in", "Check-In"),
+        ("check_out", "Check-Out"),
+        ("nights", "Nº Noches"),
+        ("persons", "Nº Personas"),
+        ("adults", "Nº Adultos"),
+        ("children", "Nº Niños"),
+        ("status", "Status"),
+        ("email", "Email"),
+        ("phone", "Movil"),
+        ("price", "Precio"),
+        ("charges", "Comm y Cargos"),
+        ("property_id", "property_id"),
+        ("version", "version"),
+    ]
+    
+    # Supported formats: format -> (media type, file extension)
+    FORMATS = {
+        "csv": ("text/csv", "csv"),
+        "ndjson": ("application/x-ndjson", "ndjson"),
+        "parquet": ("application/vnd.apache.parquet", "parquet"),
+        "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    }
+    
+    def __init__(self, repository: Optional[BookingRepository] = None):
+        """
+        Initialize the service.
+        
+        Args:
+            repository: BookingRepository instance (optional, creates one if not provided)
+        """
+        self.repository = repository or BookingRepository()
+        self.batch_size = settings.EXPORT_BATCH_SIZE
+        
+        # Get electric booking IDs from environment
+        electric_str = os.getenv('ELECTRIC', '')
+        self.electric_bookings = set(b.strip() for b in electric_str.split(',') if b.strip())
+    
+    @property
+    def field_names(self) -> List[str]:
+        """Output field names, including the computed electric allowance."""
+        return [field for field, _ in self.EXPORT_COLUMNS] + ["electric_allowance"]
+    
+    @classmethod
+    def check_format(cls, fmt: str):
+        """
+        Check that a format can be exported.
+        
+        Raises:
+            ValueError: If the format is unsupported or unavailable
+        """
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        if fmt in ("parquet", "arrow") and pa is None:
+            raise ValueError(f"{fmt.capitalize()} export requires pyarrow to be installed")
+    
+    def stream(
+        self,
+        fmt: str,
+        filters: Optional[BookingFilter] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream an export in the requested format.
+        
+        Args:
+            fmt: 'csv', 'ndjson', 'parquet' or 'arrow' (Arrow IPC stream)
+            filters: Optional filters (same as booking search)
+            limit: Optional maximum number of rows
+        
+        Returns:
+            Iterator of encoded chunks (one or more per batch)
+        
+        Raises:
+            ValueError: If the format is unsupported or unavailable
+            Exception: Connection or SQL errors (the query and first batch run
+                before this returns, so they surface before any byte is sent)
+        """
+        self.check_format(fmt)
+        
+        writers = {
+            "csv": self._stream_csv,
+            "ndjson": self._stream_ndjson,
+            "parquet": self._stream_parquet,
+            "arrow": self._stream_arrow,
+        }
+        batches = self._batches(filters, limit)
+        first = next(batches, None)
+        prefetched = itertools.chain([first] if first is not None else [], batches)
+        return self._log_failures(writers[fmt](prefetched), fmt)
+    
+    @staticmethod
+    def _log_failures(chunks: Iterator[bytes], fmt: str) -> Iterator[bytes]:
+        """Pass chunks through, logging an error that cuts the export short."""
+        written = 0
+        try:
+            for chunk in chunks:
+                written += len(chunk)
+                yield chunk
+        except Exception as e:
+            # Headers are already sent: the client only sees a truncated body
+            print(f"❌ {fmt} export failed after {written} bytes: {e}")
+            raise
+    
+    def _batches(
+        self,
+        filters: Optional[BookingFilter],
+        limit: Optional[int] = None
+    ) -> Iterator[List[list]]:
+        """Yield batches of normalized rows (plain Python values)."""
+        db_columns = [column for _, column in self.EXPORT_COLUMNS]
+        for rows in self.repository.iter_batches(db_columns, filters, self.batch_size, limit):
+            batch = [values for values in (self._normalize_row(db_columns, row) for row in rows) if values]
+            if batch:
+                yield batch
+    
+    def _normalize_row(self, db_columns: List[str], row: Tuple) -> Optional[list]:
+        """
+        Convert a database row like the JSON endpoints do and append the electric allowance.
+        
+        Returns:
+            Values in field_names order, or None for rows the JSON endpoints skip
+        """
+        booking = self.repository.row_to_dict(db_columns, row)
+        if booking is None:
+            return None
+        values = [booking[field] for field, _ in self.EXPORT_COLUMNS]
+        
+        booking_id, nights = booking["booking_id"], booking["nights"]
+        if str(booking_id).strip() in self.electric_bookings and nights is not None:
+            values.append(nights * 4)
+        else:
+            values.append(None)
+        return values
+    
+    def _stream_csv(self, batches: Iterator[List[list]]) -> Iterator[bytes]:
+        """Stream CSV, one chunk per batch."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        writer.writerow(self.field_names)
+        yield buffer.getvalue().encode('utf-8')
+        
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode('utf-8')
+    
+    def _stream_ndjson(self, batches: Iterator[List[list]]) -> Iterator[bytes]:
+        """Stream newline-delimited JSON, one chunk per batch."""
+        names = self.field_names
+        for batch in batches:
+            lines = [
+                json.dumps(dict(zip(names, row)), default=self._json_default, ensure_ascii=False)
+                for row in batch
+            ]
+            yield ("\n".join(lines) + "\n").encode('utf-8')
+    
+    def _stream_parquet(self, batches: Iterator[List[list]]) -> Iterator[bytes]:
+        """Stream Parquet, writing one row group per batch."""
+        sink = _ChunkSink()
+        schema = self.arrow_schema()
+        
+        with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+            for batch in batches:
+                writer.write_batch(self.to_record_batch(batch, schema))
+                yield sink.drain()
+        
+        # Footer is written when the writer closes
+        yield sink.drain()
+    
+    def _stream_arrow(self, batches: Iterator[List[list]]) -> Iterator[bytes]:
+        """Stream an Arrow IPC stream, one record batch per batch."""
+        sink = _ChunkSink()
+        schema = self.arrow_schema()
+        
+        with pa.ipc.new_stream(sink, schema) as writer:
+            # Schema message first, so empty results still decode
+            yield sink.drain()
+            for batch in batches:
+                writer.write_batch(self.to_record_batch(batch, schema))
+                yield sink.drain()
+        
+        # End-of-stream marker is written when the writer closes
+        yield sink.drain()
+    
+    @staticmethod
+    def arrow_schema():
+        """Arrow schema for exported bookings."""
+        return pa.schema([
+            ("record_id", pa.int64()),
+            ("booking_id", pa.string()),
+            ("booking_number", pa.string()),
+            ("guest_name", pa.string()),
+            ("check_in", pa.date32()),
+            ("check_out", pa.date32()),
+            ("nights", pa.int32()),
+            ("persons", pa.int32()),
+            ("adults", pa.int32()),
+            ("children", pa.int32()),
+            ("status", pa.string()),
+            ("email", pa.string()),
+            ("phone", pa.string()),
+            ("price", pa.float64()),
+            ("charges", pa.float64()),
+            ("property_id", pa.int64()),
+            ("version", pa.int64()),
+            ("electric_allowance", pa.float64()),
+        ])
+    
+    @staticmethod
+    def to_record_batch(rows: List[list], schema) -> "pa.RecordBatch":
+        """
+        Build an Arrow record batch from normalized rows.
+        
+        Args:
+            rows: Rows in schema field order
+            schema: Arrow schema (see arrow_schema)
+        
+        Returns:
+            pyarrow.RecordBatch
+        """
+        columns = list(zip(*rows)) if rows else [[] for _ in schema]
+        arrays = [
+            pa.array([_as_str(v) for v in column] if field.type == pa.string() else column,
+                     type=field.type)
+            for field, column in zip(schema, columns)
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    
+    @staticmethod
+    def _json_default(value):
+        """JSON encoder for dates."""
+        if isinstance(value, date):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _as_str(value):
+    """Coerce non-null values to str (some string columns hold numbers)."""
+    return None if value is None else str(value)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers written bytes until drained."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,312 @@
+"""
+In-process runner for heavy operations (exports, rebuilds, backfills).
+
+Jobs are submitted with POST /jobs and run off the request path on a small
+thread pool (JOB_WORKERS per worker process, at most JOB_QUEUE_LIMIT queued
+or running). Handlers are plain synchronous functions doing the same work
+as the scripts in backend/scripts; each job gets its own database
+connections, since the shared request connection is not thread-safe.
+Status and progress are kept in memory and, with JOB_PERSIST, in the
+`jobs` table so any worker can report them.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+import os
+import threading
+import time
+import uuid
+from backend.config import settings
+from backend.database.connection import dedicated_connections
+from backend.exceptions import JobQueueFullError
+from backend.models.booking import BookingFilter
+from backend.models.job import Job, Progress
+from backend.repositories.job_repository import JobRepository
+from backend.services.analytics_service import AnalyticsService
+from backend.services.booking_service import BookingService
+from backend.services.export_service import ExportService
+from backend.services.property_service import PropertyService
+
+Handler = Callable[[Job, Progress], Optional[Dict[str, Any]]]
+
+
+class JobRunner:
+    """Bounded in-process job queue."""
+    
+    # Progress is written to the jobs table at most this often (seconds), by a
+    # background thread so jobs never wait on it (with SQLite the write would
+    # wait for the job's own transaction)
+    PERSIST_INTERVAL = 1.0
+    
+    # Unfinished jobs of this worker are marked alive in the jobs table every
+    # HEARTBEAT_INTERVAL seconds; a queued or running job not marked for
+    # HEARTBEAT_TIMEOUT belongs to a worker that stopped
+    HEARTBEAT_INTERVAL = 30.0
+    HEARTBEAT_TIMEOUT = 120.0
+    
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+        self._validators: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sync_stop: Optional[threading.Event] = None
+        # Jobs whose progress changed since it was last written
+        self._dirty: Set[str] = set()
+        # Keeps job writes in order (a stale progress snapshot never lands last)
+        self._persist_lock = threading.Lock()
+        self._repository: Optional[JobRepository] = None
+    
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._handlers)
+    
+    def register(self, kind: str, handler: Handler, validate: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Register a job kind.
+        
+        Args:
+            kind: Name used in POST /jobs
+            handler: Runs the job; returns its result dictionary
+            validate: Checks the params at submit time (raises ValueError)
+        """
+        self._handlers[kind] = handler
+        if validate:
+            self._validators[kind] = validate
+    
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Queue a job.
+        
+        Returns:
+            The queued Job
+        
+        Raises:
+            ValueError: If the kind is unknown or the params are invalid
+            JobQueueFullError: If JOB_QUEUE_LIMIT jobs are already queued or running
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}' (available: {', '.join(self.kinds)})")
+        params = params or {}
+        if kind in self._validators:
+            self._validators[kind](params)
+        
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params, created_at=datetime.now())
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if not j.finished)
+            if pending >= settings.JOB_QUEUE_LIMIT:
+                raise JobQueueFullError(f"Too many jobs queued or running ({pending}); try again later")
+            self._jobs[job.id] = job
+            self._trim()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+                self._sync_stop = threading.Event()
+                threading.Thread(target=self._sync, args=(self._sync_stop,), name="job-sync", daemon=True).start()
+            executor = self._executor
+        
+        self._persist(job, created=True)
+        executor.submit(self._run, job)
+        return job.model_copy()
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job of this worker, or of any worker when jobs are persisted."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.model_copy()
+        repository = self._get_repository()
+        return repository.get(job_id) if repository else None
+    
+    def get_recent(self, limit: int = 50) -> List[Job]:
+        """Most recent jobs first (of all workers when jobs are persisted)."""
+        repository = self._get_repository()
+        if repository:
+            return repository.get_recent(limit)
+        with self._lock:
+            return [job.model_copy() for job in reversed(self._jobs.values())][:limit]
+    
+    def fail_abandoned(self) -> int:
+        """
+        Mark persisted jobs left queued or running by a worker that stopped
+        (no heartbeat for HEARTBEAT_TIMEOUT) as failed. Run at startup.
+        
+        Returns:
+            Number of jobs marked failed
+        """
+        repository = self._get_repository()
+        if repository is None:
+            return 0
+        stale_before = datetime.now() - timedelta(seconds=self.HEARTBEAT_TIMEOUT)
+        try:
+            failed = repository.fail_abandoned(stale_before, "Worker stopped before the job finished")
+        except Exception as e:
+            print(f"⚠️ Could not check for abandoned jobs: {e}")
+            return 0
+        if failed:
+            print(f"⚠️ Marked {failed} abandoned job(s) as failed")
+        return failed
+    
+    def shutdown(self):
+        """Stop taking jobs; queued jobs are dropped, running ones finish in the background."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            sync_stop, self._sync_stop = self._sync_stop, None
+        if sync_stop is not None:
+            sync_stop.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _sync(self, stop: threading.Event):
+        """Write changed progress, and heartbeats of unfinished jobs (background thread)."""
+        last_heartbeat = time.monotonic()
+        while not stop.wait(self.PERSIST_INTERVAL):
+            with self._lock:
+                dirty = [self._jobs[job_id] for job_id in self._dirty if job_id in self._jobs]
+                self._dirty.clear()
+                unfinished = [job.id for job in self._jobs.values() if not job.finished]
+            for job in dirty:
+                self._persist(job)
+            
+            repository = self._get_repository()
+            if repository is None or time.monotonic() - last_heartbeat < self.HEARTBEAT_INTERVAL:
+                continue
+            last_heartbeat = time.monotonic()
+            if unfinished:
+                try:
+                    repository.touch(unfinished)
+                except Exception as e:
+                    print(f"⚠️ Could not update job heartbeats: {e}")
+    
+    def _run(self, job: Job):
+        def progress(fraction: Optional[float] = None, message: Optional[str] = None):
+            with self._lock:
+                if fraction is not None:
+                    job.progress = min(max(fraction, 0.0), 1.0)
+                if message is not None:
+                    job.message = message
+                self._dirty.add(job.id)
+        
+        with self._lock:
+            job.status, job.started_at = "running", datetime.now()
+        self._persist(job)
+        try:
+            result = self._handlers[job.kind](job, progress)
+            with self._lock:
+                job.status, job.progress, job.result = "succeeded", 1.0, result or {}
+                job.finished_at = datetime.now()
+        except Exception as e:
+            print(f"❌ Job {job.id} ({job.kind}) failed: {e}")
+            with self._lock:
+                job.status, job.error, job.finished_at = "failed", str(e), datetime.now()
+        self._persist(job)
+    
+    def _trim(self):
+        """
+        Forget the oldest finished jobs beyond JOB_HISTORY and delete their
+        output files (call with the lock held).
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - settings.JOB_HISTORY, 0)]:
+            _remove_output(self._jobs.pop(job_id).result)
+    
+    def _get_repository(self) -> Optional[JobRepository]:
+        if not settings.JOB_PERSIST:
+            return None
+        if self._repository is None:
+            self._repository = JobRepository()
+        return self._repository
+    
+    def _persist(self, job: Job, created: bool = False):
+        """Write the job to the jobs table (failures only cost cross-worker visibility)."""
+        repository = self._get_repository()
+        if repository is None:
+            return
+        with self._persist_lock:
+            with self._lock:
+                snapshot = job.model_copy()
+            try:
+                if created:
+                    repository.create(snapshot)
+                else:
+                    repository.update(snapshot)
+            except Exception as e:
+                print(f"⚠️ Could not persist job {job.id}: {e}")
+
+
+def _remove_output(result: Optional[Dict[str, Any]]):
+    """Delete the file in JOB_OUTPUT_DIR named by a job result, if any."""
+    name = (result or {}).get("file")
+    if not name:
+        return
+    try:
+        os.remove(os.path.join(settings.JOB_OUTPUT_DIR, name))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ Could not delete job output {name}: {e}")
+
+
+def _optional_date(params: Dict[str, Any], key: str) -> Optional[date]:
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except TypeError:
+        raise ValueError(f"{key} must be an ISO date string (YYYY-MM-DD)") from None
+
+
+def _validate_export(params: Dict[str, Any]):
+    fmt = params.get("format", "csv")
+    if fmt not in ExportService.FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'")
+    BookingFilter(**(params.get("filters") or {}))
+
+
+def _run_export(job: Job, progress: Progress) -> Dict[str, Any]:
+    """Write a bookings export to JOB_OUTPUT_DIR (downloaded from GET /jobs/{id}/result)."""
+    fmt = job.params.get("format", "csv")
+    filters = BookingFilter(**(job.params.get("filters") or {}))
+    media_type, extension = ExportService.FORMATS[fmt]
+    
+    os.makedirs(settings.JOB_OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(settings.JOB_OUTPUT_DIR, f"{job.id}.{extension}")
+    written = 0
+    try:
+        with open(path, "wb") as output:
+            for chunk in ExportService().stream(fmt, filters, job.params.get("limit")):
+                output.write(chunk)
+                written += len(chunk)
+                progress(None, f"{written} bytes written")
+    except Exception:
+        _remove_output({"file": os.path.basename(path)})  # Partial file
+        raise
+    return {"file": os.path.basename(path), "bytes": written, "media_type": media_type, "format": fmt}
+
+
+def _run_rebuild_occupancy(job: Job, progress: Progress) -> Dict[str, Any]:
+    service = AnalyticsService()
+    with dedicated_connections(service.booking_repository, service.occupancy_repository):
+        return {"booking_nights": service.rebuild_occupancy(progress)}
+
+
+def _run_rebuild_night_ledger(job: Job, progress: Progress) -> Dict[str, Any]:
+    service = BookingService()
+    with dedicated_connections(service.repository):
+        return service.rebuild_night_ledger(_optional_date(job.params, "from_date"), progress)
+
+
+def _run_backfill_properties(job: Job, progress: Progress) -> Dict[str, Any]:
+    service = PropertyService()
+    with dedicated_connections(service.repository):
+        return service.backfill_from_bookings(progress)
+
+
+# Process-wide runner (shared by the routers of this worker)
+job_runner = JobRunner()
+job_runner.register("export", _run_export, _validate_export)
+job_runner.register("rebuild_occupancy", _run_rebuild_occupancy)
+job_runner.register("rebuild_night_ledger", _run_rebuild_night_ledger, lambda p: _optional_date(p, "from_date"))
+job_runner.register("backfill_properties", _run_backfill_properties)
@@ -0,0 +1,269 @@
+"""
+In-memory occupancy engine: which nights each unit has taken.
+
+Each unit is a row of day-indexed bits (NumPy uint8, 8 nights per byte) in
+one matrix, so occupied/free/in-house questions over any window are a slice,
+an unpack and a reduction. 500 units x 10 years is about 230 KB.
+
+Built once from the bookings (from OCCUPANCY_HISTORY_DAYS before today on)
+and kept in step with the "bookings" change events, like the availability index.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+import numpy as np
+from backend.config import settings
+from backend.models.availability import OccupancyGrid, UnitOccupancy
+from backend.repositories.booking_repository import BookingRepository
+from backend.repositories.property_repository import PropertyRepository
+from backend.services.availability_service import LiveIndex, _ordinal
+
+
+class OccupancyBitmap:
+    """
+    Per-unit night bitsets starting at `origin`.
+    
+    A night taken by more than one stay (overbooking) is counted in
+    `_extra`, so removing one of the stays keeps the night taken.
+    """
+    
+    # Nights added past the last stay when the matrix grows
+    GROW_DAYS = 365
+    
+    def __init__(self, origin: date, days: int = 0):
+        self.origin = origin.toordinal()
+        self._rows: Dict[int, int] = {}
+        self._bits = np.zeros((0, (days + 7) // 8), dtype=np.uint8)
+        self._extra: Dict[int, Dict[int, int]] = {}
+    
+    @classmethod
+    def build(cls, stays: Iterable[Tuple], origin: Optional[date] = None) -> "OccupancyBitmap":
+        """
+        Build the bitmap from (property_id, check_in, check_out) tuples.
+        
+        Nights before `origin` (default: earliest check-in) are dropped.
+        """
+        pids, starts, ends = [], [], []
+        for pid, check_in, check_out in stays:
+            pids.append(pid)
+            starts.append(_ordinal(check_in))
+            ends.append(_ordinal(check_out))
+        if origin is None:
+            origin = date.fromordinal(min(starts, default=date.today().toordinal()))
+        first = origin.toordinal()
+        bitmap = cls(origin, max(ends, default=first) - first + cls.GROW_DAYS)
+        if not pids:
+            return bitmap
+        
+        rows = np.array([bitmap._row(pid) for pid in pids], dtype=np.int64)
+        starts = np.maximum(np.array(starts, dtype=np.int64) - first, 0)
+        ends = np.maximum(np.array(ends, dtype=np.int64) - first, 0)
+        
+        # Stays per night via a difference array: +1 at check-in, -1 at check-out
+        days = bitmap._bits.shape[1] * 8
+        counts = np.zeros((len(bitmap._rows), days + 1), dtype=np.int32)
+        np.add.at(counts, (rows, starts), 1)
+        np.add.at(counts, (rows, ends), -1)
+        counts = np.cumsum(counts[:, :days], axis=1)
+        
+        bitmap._bits = np.packbits(counts > 0, axis=1)
+        for row, day in zip(*np.nonzero(counts > 1)):
+            bitmap._extra.setdefault(int(row), {})[int(day)] = int(counts[row, day]) - 1
+        return bitmap
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bitsets."""
+        return self._bits.nbytes
+    
+    @property
+    def end(self) -> date:
+        """First night not covered (all later nights are free)."""
+        return date.fromordinal(self.origin + self._bits.shape[1] * 8)
+    
+    def _row(self, property_id: int) -> int:
+        """Row of a unit, adding it if new."""
+        row = self._rows.get(property_id)
+        if row is None:
+            row = self._rows[property_id] = len(self._rows)
+            if row >= self._bits.shape[0]:
+                grown = np.zeros((max(2 * self._bits.shape[0], 16), self._bits.shape[1]), dtype=np.uint8)
+                grown[:self._bits.shape[0]] = self._bits
+                self._bits = grown
+        return row
+    
+    def _span(self, check_in, check_out) -> Tuple[int, int]:
+        """Night indexes [start, end) of a window (ValueError before the origin)."""
+        start, end = _ordinal(check_in) - self.origin, _ordinal(check_out) - self.origin
+        if start < 0:
+            raise ValueError(f"Window starts before the occupancy engine ({date.fromordinal(self.origin)})")
+        return start, max(end, start)
+    
+    def _window(self, rows, start: int, end: int) -> np.ndarray:
+        """Unpacked nights [start, end) of the given rows (bool matrix)."""
+        columns = self._bits.shape[1] * 8
+        first_byte, last_byte = start // 8, (min(end, columns) + 7) // 8
+        nights = np.unpackbits(self._bits[rows, first_byte:last_byte], axis=-1).astype(bool)
+        nights = nights[..., start - first_byte * 8:min(end, columns) - first_byte * 8]
+        if end > columns:
+            # Beyond the matrix nothing is taken
+            pad = [(0, 0)] * (nights.ndim - 1) + [(0, end - max(columns, start))]
+            nights = np.pad(nights, pad)
+        return nights
+    
+    def _write(self, row: int, start: int, end: int, taken: bool):
+        """Set or clear nights [start, end) of a row, keeping overbooked nights."""
+        if end > self._bits.shape[1] * 8:
+            extra_bytes = (end + self.GROW_DAYS + 7) // 8 - self._bits.shape[1]
+            self._bits = np.pad(self._bits, ((0, 0), (0, extra_bytes)))
+        first_byte, last_byte = start // 8, (end + 7) // 8
+        nights = np.unpackbits(self._bits[row, first_byte:last_byte])
+        lo, hi = start - first_byte * 8, end - first_byte * 8
+        extra = self._extra.setdefault(row, {})
+        if taken:
+            for day in np.nonzero(nights[lo:hi])[0] + start:
+                extra[int(day)] = extra.get(int(day), 0) + 1
+            nights[lo:hi] = 1
+        else:
+            clear = np.ones(hi - lo, dtype=bool)
+            for day in [d for d in extra if start <= d < end]:
+                clear[day - start] = False
+                extra[day] -= 1
+                if not extra[day]:
+                    del extra[day]
+            nights[lo:hi][clear] = 0
+        self._bits[row, first_byte:last_byte] = np.packbits(nights)
+    
+    def add(self, property_id: int, check_in, check_out):
+        start, end = _ordinal(check_in) - self.origin, _ordinal(check_out) - self.origin
+        if end > max(start, 0):
+            self._write(self._row(property_id), max(start, 0), end, True)
+    
+    def remove(self, property_id: int, check_in, check_out):
+        row = self._rows.get(property_id)
+        start, end = _ordinal(check_in) - self.origin, _ordinal(check_out) - self.origin
+        if row is not None and end > max(start, 0):
+            self._write(row, max(start, 0), end, False)
+    
+    def occupied(self, property_id: int, check_in, check_out) -> np.ndarray:
+        """Taken nights of a unit in [check_in, check_out) as a bool array."""
+        start, end = self._span(check_in, check_out)
+        row = self._rows.get(property_id)
+        if row is None:
+            return np.zeros(end - start, dtype=bool)
+        return self._window(row, start, end)
+    
+    def is_free(self, property_id: int, check_in, check_out) -> bool:
+        """True if no night of [check_in, check_out) is taken (no conflict)."""
+        return not self.occupied(property_id, check_in, check_out).any()
+    
+    def free_units(self, property_ids: Iterable[int], check_in, check_out) -> List[int]:
+        """Units among property_ids with every night of [check_in, check_out) free."""
+        start, end = self._span(check_in, check_out)
+        property_ids = list(property_ids)
+        known = [pid for pid in property_ids if pid in self._rows]
+        if not known:
+            return property_ids
+        taken = self._window(np.array([self._rows[pid] for pid in known]), start, end).any(axis=1)
+        busy = {pid for pid, is_taken in zip(known, taken) if is_taken}
+        return [pid for pid in property_ids if pid not in busy]
+    
+    def grid(self, property_ids: Iterable[int], check_in, check_out) -> np.ndarray:
+        """Taken nights of several units (units x nights bool matrix)."""
+        start, end = self._span(check_in, check_out)
+        property_ids = list(property_ids)
+        grid = np.zeros((len(property_ids), end - start), dtype=bool)
+        known = [(i, self._rows[pid]) for i, pid in enumerate(property_ids) if pid in self._rows]
+        if known:
+            positions, rows = zip(*known)
+            grid[list(positions)] = self._window(np.array(rows), start, end)
+        return grid
+    
+    def in_house(self, check_in, check_out, property_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Units taken per night of [check_in, check_out) (all units by default)."""
+        if property_ids is not None:
+            return self.grid(property_ids, check_in, check_out).sum(axis=0)
+        start, end = self._span(check_in, check_out)
+        rows = np.arange(len(self._rows))
+        return self._window(rows, start, end).sum(axis=0)
+
+
+# Process-wide engine (shared by the services of this worker)
+occupancy_engine = LiveIndex(
+    lambda stays: OccupancyBitmap.build(stays, date.today() - timedelta(days=settings.OCCUPANCY_HISTORY_DAYS)),
+    history_days=lambda: settings.OCCUPANCY_HISTORY_DAYS
+)
+
+
+class OccupancyEngineService:
+    """Service answering occupancy questions from the occupancy engine."""
+    
+    def __init__(
+        self,
+        booking_repository: Optional[BookingRepository] = None,
+        property_repository: Optional[PropertyRepository] = None
+    ):
+        """
+        Initialize the service.
+        
+        Args:
+            booking_repository: BookingRepository used to build the engine (optional)
+            property_repository: PropertyRepository listing the units (optional)
+        """
+        self.booking_repository = booking_repository or BookingRepository()
+        self.property_repository = property_repository or PropertyRepository()
+    
+    def bitmap(self) -> OccupancyBitmap:
+        """The up-to-date bitmap of this worker."""
+        return occupancy_engine.get(self.booking_repository)
+    
+    def get_grid(
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[int] = None
+    ) -> OccupancyGrid:
+        """
+        Get taken nights per unit and units in house per night.
+        
+        Args:
+            start_date: First night
+            end_date: Last night (inclusive)
+            property_id: Optional unit to restrict to
+        
+        Returns:
+            OccupancyGrid
+        
+        Raises:
+            ValueError: If the period is invalid or before the engine's window
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must be on or after start_date")
+        if (end_date - start_date).days >= 3660:
+            raise ValueError("Period too long (max 10 years)")
+        
+        properties = self.property_repository.get_all()
+        if property_id is not None:
+            properties = [p for p in properties if p.property_id == property_id]
+        
+        stop = end_date + timedelta(days=1)
+        grid = self.bitmap().grid([p.property_id for p in properties], start_date, stop)
+        taken = grid.sum(axis=1)
+        nights = grid.shape[1]
+        
+        return OccupancyGrid(
+            start_date=start_date,
+            end_date=end_date,
+            in_house=grid.sum(axis=0).tolist(),
+            occupied_nights=int(taken.sum()),
+            occupancy_rate=round(float(taken.sum()) / (nights * len(properties)), 4) if properties else None,
+            units=[
+                UnitOccupancy(
+                    property_id=p.property_id,
+                    code=p.code,
+                    occupied_nights=int(taken[i]),
+                    nights="".join("1" if night else "0" for night in grid[i])
+                )
+                for i, p in enumerate(properties)
+            ]
+        )
@@ -0,0 +1,62 @@
+"""
+Business logic service for properties (units).
+"""
+
+from typing import List, Optional
+from backend.repositories.property_repository import PropertyRepository
+from backend.models.job import Progress
+from backend.models.property import Property, PropertyCreate
+from backend.services.booking_service import BookingService
+
+
+class PropertyService:
+    """Service for managing properties."""
+    
+    def __init__(self, repository: Optional[PropertyRepository] = None):
+        """
+        Initialize the service.
+        
+        Args:
+            repository: PropertyRepository instance (optional, creates one if not provided)
+        """
+        self.repository = repository or PropertyRepository()
+    
+    def get_all_properties(self) -> List[Property]:
+        """Get all properties ordered by code."""
+        return self.repository.get_all()
+    
+    def get_property(self, property_id: int) -> Optional[Property]:
+        """
+        Get a property by ID.
+        
+        Args:
+            property_id: Database property ID
+            
+        Returns:
+            Property or None
+        """
+        return self.repository.get_by_id(property_id)
+    
+    def create_property(self, prop: PropertyCreate) -> Property:
+        """
+        Create a new property.
+        
+        Raises:
+            ValueError: If the code is already used
+        """
+        return self.repository.create(prop)
+    
+    def backfill_from_bookings(self, progress: Optional[Progress] = None) -> dict:
+        """
+        Create properties for the unit codes found in bookings and link unlinked bookings.
+        
+        Args:
+            progress: Optional progress callback (see backend.models.job.Progress)
+        
+        Returns:
+            Dictionary with properties_created and bookings_linked
+        """
+        created, linked = self.repository.backfill_from_bookings(progress)
+        if linked:
+            BookingService.publish_bulk_change("properties_backfilled")
+        return {"properties_created": created, "bookings_linked": linked}
@@ -0,0 +1,108 @@
+"""
+Optimistic concurrency on bookings: row versions, If-Match and 409 + ETag.
+"""
+
+import pytest
+from fastapi import HTTPException
+from backend.exceptions import VersionConflictError
+from backend.repositories.booking_repository import BookingRepository
+from backend.routers.bookings import parse_if_match
+
+
+def test_update_fields_compare_and_set(make_booking):
+    booking = make_booking()
+    repository = BookingRepository()
+    version = booking["version"]
+    
+    updated = repository.update_fields(booking["record_id"], {"guest_name": "First"}, version)
+    assert updated.guest_name == "First"
+    assert updated.version == version + 1
+    
+    # A writer still holding the old version loses and learns the current one
+    with pytest.raises(VersionConflictError) as conflict:
+        repository.update_fields(booking["record_id"], {"guest_name": "Second"}, version)
+    assert conflict.value.current_version == version + 1
+    assert repository.get_by_id(booking["record_id"]).guest_name == "First"
+
+
+def test_update_fields_without_version_always_applies(make_booking):
+    booking = make_booking()
+    repository = BookingRepository()
+    
+    repository.update_fields(booking["record_id"], {"guest_name": "A"})
+    updated = repository.update_fields(booking["record_id"], {"guest_name": "B"})
+    assert updated.guest_name == "B"
+    assert updated.version == booking["version"] + 2
+
+
+def test_update_fields_missing_booking(sqlite_db):
+    assert BookingRepository().update_fields(999, {"guest_name": "X"}, 1) is None
+
+
+def test_get_sets_etag(client, make_booking):
+    booking = make_booking()
+    response = client.get(f"/api/v1/bookings/{booking['record_id']}")
+    assert response.headers["ETag"] == f'"{booking["version"]}"'
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_stale_if_match_is_409_with_current_etag(client, make_booking, method):
+    booking = make_booking()
+    url = f"/api/v1/bookings/{booking['record_id']}"
+    stale = f'"{booking["version"]}"'
+    
+    first = getattr(client, method)(url, json={"guest_name": "First"}, headers={"If-Match": stale})
+    assert first.status_code == 200
+    assert first.headers["ETag"] == f'"{booking["version"] + 1}"'
+    
+    second = getattr(client, method)(url, json={"guest_name": "Second"}, headers={"If-Match": stale})
+    assert second.status_code == 409
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert client.get(url).json()["guest_name"] == "First"
+
+
+def test_body_version_is_checked_like_if_match(client, make_booking):
+    booking = make_booking()
+    url = f"/api/v1/bookings/{booking['record_id']}"
+    assert client.patch(url, json={"guest_name": "A", "version": booking["version"]}).status_code == 200
+    assert client.patch(url, json={"guest_name": "B", "version": booking["version"]}).status_code == 409
+
+
+def test_weak_etag_and_wildcard(client, make_booking):
+    booking = make_booking()
+    url = f"/api/v1/bookings/{booking['record_id']}"
+    
+    weak = client.patch(url, json={"guest_name": "A"}, headers={"If-Match": f'W/"{booking["version"]}"'})
+    assert weak.status_code == 200
+    
+    # "*" matches any version
+    wildcard = client.patch(url, json={"guest_name": "B"}, headers={"If-Match": "*"})
+    assert wildcard.status_code == 200
+    assert wildcard.json()["version"] == booking["version"] + 2
+
+
+def test_garbage_if_match_is_400(client, make_booking):
+    booking = make_booking()
+    url = f"/api/v1/bookings/{booking['record_id']}"
+    response = client.patch(url, json={"guest_name": "A"}, headers={"If-Match": "garbage"})
+    assert response.status_code == 400
+    assert client.get(url).json()["guest_name"] == booking["guest_name"]
+
+
+@pytest.mark.parametrize("header, version", [
+    (None, None),
+    ("*", None),
+    (' * ', None),
+    ('"3"', 3),
+    ('W/"3"', 3),
+    ("3", 3),
+])
+def test_parse_if_match(header, version):
+    assert parse_if_match(header) == version
+
+
+@pytest.mark.parametrize("header", ["garbage", '"abc"', 'W/"', ""])
+def test_parse_if_match_rejects_garbage(header):
+    with pytest.raises(HTTPException) as error:
+        parse_if_match(header)
+    assert error.value.status_code == 400
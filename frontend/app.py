@@ -25,7 +25,7 @@ sys.path.insert(0, str(current_dir))
 # Import frontend modules using relative imports to avoid conflicts
 from frontend.config import APP_TITLE, APP_VERSION
 from frontend.services.state_manager import initialize_session_state, load_db_data_once, reset_bookings_state
-from frontend.services.booking_service import load_bookings, auto_load_bookings_if_needed
+from frontend.services.booking_service import load_bookings, auto_load_bookings_if_needed, refresh_row_classification_if_stale
 from frontend.services.data_transformer import convert_db_to_events, fix_calendar_events_dates
 from frontend.components.date_range_selector import render_date_range_selector
 from frontend.components.bookings_table import render_bookings_table
@@ -133,7 +133,7 @@ if page == "📋 Bookings Overview":
     
     # Display table if visible
     if st.session_state.bookings_table_visible and st.session_state.bookings_data:
-        data = st.session_state.bookings_data
+        data = refresh_row_classification_if_stale(st.session_state.bookings_data)
         df = data['df'].copy()
         
         # Render table and capture click
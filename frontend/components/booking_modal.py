@@ -6,15 +6,10 @@ Displays booking details in view or edit mode.
 import streamlit as st
 from datetime import date
 import time
-import sys
-import os
 
-# Add parent directory to access root services
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, parent_dir)
-
-from shared.database_utils import fetch_table
 from ..config import STATUS_OPTIONS, STATUS_COLORS, STATUS_EMOJIS
+from ..services.api_client import APIError, api_client
+from ..services.booking_service import refresh_calendar_rows, save_booking_changes
 from ..utils.formatters import format_monetary_value, format_phone_for_whatsapp
 
 
@@ -29,7 +24,7 @@ def render_booking_detail_view(ev: dict):
     
     # Main information in columns
     col1, col2 = st.columns(2)
-
+    
     with col1:
         st.markdown("#### 📅 Stay Dates")
         st.markdown(f"**Check-In:** {ext.get('check_in', 'N/A')}")
@@ -91,6 +86,18 @@ def render_booking_detail_edit(ev: dict, record_id):
     """
     ext = ev.get("extendedProps", {}) or {}
     
+    # Edit the booking as it is now (and remember its version), not the
+    # possibly stale copy the calendar was drawn from
+    edit_key = f"edit_booking_{record_id}"
+    if edit_key not in st.session_state:
+        try:
+            st.session_state[edit_key] = api_client.get_booking(record_id)
+        except Exception as e:
+            st.error(f"❌ Error loading booking: {e}")
+            return False
+    current = {**ext, **{k: v for k, v in st.session_state[edit_key].items() if v is not None}}
+    ext = current
+    
     with st.form("edit_booking_modal"):
         col1, col2 = st.columns(2)
         
@@ -150,52 +157,50 @@ def render_booking_detail_edit(ev: dict, record_id):
         
         if cancel_button:
             st.session_state.edit_mode = False
+            st.session_state.pop(edit_key, None)
             st.rerun()
         
         if save_button:
             if new_booking_id and new_guest_name and new_check_in and new_check_out and new_check_out > new_check_in:
                 try:
-                    # Use shared database utils (available in both containers)
-                    import mysql.connector
-                    from shared.constants import get_db_config
-                    
-                    conn = mysql.connector.connect(**get_db_config())
-                    cursor = conn.cursor()
-                    
-                    query = """
-                    UPDATE bookings 
-                    SET `Booking ID` = %s, `Nombre,Apellidos` = %s, `Check-In` = %s, `Check-Out` = %s,
-                        `Nº Noches` = %s, `Nº Personas` = %s, `Nº Adultos` = %s, `Nº Niños` = %s,
-                        `Status` = %s, `Email` = %s, `Movil` = %s, `Precio` = %s, 
-                        `Comm y Cargos` = %s, `Nº Booking` = %s
-                    WHERE ID = %s
-                    """
-                    
-                    values = (
-                        new_booking_id, new_guest_name, new_check_in, new_check_out,
-                        new_nights, new_persons, new_adults, new_children,
-                        new_status, new_email, new_phone, new_price, new_charges, 
-                        new_booking_number, record_id
-                    )
+                    booking_data = {
+                        "booking_id": new_booking_id,
+                        "guest_name": new_guest_name,
+                        "check_in": new_check_in.isoformat(),
+                        "check_out": new_check_out.isoformat(),
+                        "persons": new_persons,
+                        "adults": new_adults,
+                        "children": new_children,
+                        "status": new_status,
+                        "email": new_email,
+                        "phone": new_phone,
+                        "price": new_price,
+                        "charges": new_charges,
+                        "booking_number": new_booking_number,
+                    }
                     
-                    cursor.execute(query, values)
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
+                    # Only the changed fields are sent (nights is derived by the server);
+                    # rejected with 409 if someone else changed the same fields meanwhile
+                    save_booking_changes(record_id, st.session_state[edit_key], booking_data)
                     
                     st.success(f"✅ Booking {new_booking_id} updated successfully!")
                     
-                    # Reload data
-                    cols, rows = fetch_table("bookings")
-                    st.session_state.db_cols = cols
-                    st.session_state.db_rows = rows
-                    st.session_state.bookings_data = None
+                    # Refresh only this booking in the calendar data
+                    refresh_calendar_rows([record_id], st.session_state)
                     st.session_state.edit_mode = False
                     st.session_state.show_modal = False
+                    st.session_state.pop(edit_key, None)
                     
                     time.sleep(1)
                     st.rerun()
                     
+                except APIError as e:
+                    if e.status_code == 409:
+                        # Changed by someone else (or overlapping): reload the latest version
+                        st.session_state.pop(edit_key, None)
+                        st.warning(f"⚠️ Changes not saved - {e}. The form shows the latest version after the next refresh.")
+                    else:
+                        st.error(f"❌ Error updating booking: {e}")
                 except Exception as e:
                     st.error(f"❌ Error updating booking: {e}")
             else:
@@ -5,9 +5,8 @@ Displays a custom-styled table of bookings with view buttons.
 """
 import streamlit as st
 import pandas as pd
-from datetime import date
 from ..styles.custom_styles import get_table_styles
-from ..config import TABLE_HEADER_LABELS, CHECKOUT_SOON_DAYS, CHECKIN_SOON_DAYS
+from ..config import TABLE_HEADER_LABELS, ROW_CLASS_STYLES
 
 
 def render_bookings_table(df: pd.DataFrame) -> dict:
@@ -15,7 +14,7 @@ def render_bookings_table(df: pd.DataFrame) -> dict:
     Renders a custom-styled bookings table with action buttons.
     
     Args:
-        df: DataFrame with booking data
+        df: DataFrame with booking data (with 'row_class' column from add_row_classification)
         
     Returns:
         dict: Selected event data if button clicked, None otherwise
@@ -36,41 +35,14 @@ def render_bookings_table(df: pd.DataFrame) -> dict:
     
     # Table rows
     for idx, row_data in df.iterrows():
-        # Determine row class based on dates
-        row_class = ""
-        try:
-            checkout_str = row_data['Check-Out']
-            checkin_str = row_data['Check-In']
-            
-            if isinstance(checkout_str, str):
-                checkout_date = date.fromisoformat(checkout_str)
-            else:
-                checkout_date = checkout_str
-                
-            if isinstance(checkin_str, str):
-                checkin_date = date.fromisoformat(checkin_str)
-            else:
-                checkin_date = checkin_str
-            
-            days_until_checkout = (checkout_date - date.today()).days
-            days_until_checkin = (checkin_date - date.today()).days
-            
-            if days_until_checkout <= CHECKOUT_SOON_DAYS:
-                row_class = "row-checkout-soon"
-            elif (days_until_checkin <= CHECKIN_SOON_DAYS) and (days_until_checkin >= 0):
-                row_class = "row-checkin-soon"
-        except:
-            pass
+        # Row class is precomputed when the data is loaded (see add_row_classification)
+        row_class = row_data.get('row_class', "")
         
         # Create columns for each row
         row_cols = st.columns([1.5, 2.5, 1.5, 1.5, 1, 1.2])
         
-        # Determine cell background color based on dates
-        cell_bg = ""
-        if row_class == "row-checkout-soon":
-            cell_bg = "background-color: #ffebee;"
-        elif row_class == "row-checkin-soon":
-            cell_bg = "background-color: #e8f5e9;"
+        # Determine cell background color based on row class
+        cell_bg = ROW_CLASS_STYLES.get(row_class, "")
         
         with row_cols[0]:
             st.markdown(f'<div class="custom-table-cell" style="{cell_bg}"><span class="booking-id">{row_data["Booking ID"]}</span></div>', unsafe_allow_html=True)
@@ -5,15 +5,10 @@ Form to create a new booking or edit an existing one.
 """
 import streamlit as st
 from datetime import date, timedelta
-import sys
-import os
 
-# Add parent directory to access shared modules
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
-
-from shared.database_utils import fetch_table
 from ..config import STATUS_OPTIONS
+from ..services.api_client import APIError, api_client
+from ..services.booking_service import refresh_calendar_rows, save_booking_changes
 from ..utils.validators import validate_booking_data, calculate_nights
 
 
@@ -32,19 +27,20 @@ def render_booking_form(mode="create", booking_data=None):
     
     # Get initial values
     if booking_data:
-        initial_booking_id = booking_data.get('booking_id', '')
-        initial_guest_name = booking_data.get('guest_name', '')
-        initial_check_in = date.fromisoformat(booking_data.get('check_in', str(date.today())))
-        initial_check_out = date.fromisoformat(booking_data.get('check_out', str(date.today() + timedelta(days=1))))
-        initial_persons = booking_data.get('persons', 2)
-        initial_adults = booking_data.get('adults', 2)
-        initial_children = booking_data.get('children', 0)
-        initial_booking_number = booking_data.get('booking_number', '')
-        initial_status = booking_data.get('status', 'Confirmed')
-        initial_price = booking_data.get('price', 0.0)
-        initial_charges = booking_data.get('charges', 0.0)
-        initial_email = booking_data.get('email', '')
-        initial_phone = booking_data.get('phone', '')
+        # Missing and null fields fall back to the create defaults
+        initial_booking_id = booking_data.get('booking_id') or ''
+        initial_guest_name = booking_data.get('guest_name') or ''
+        initial_check_in = date.fromisoformat(booking_data.get('check_in') or str(date.today()))
+        initial_check_out = date.fromisoformat(booking_data.get('check_out') or str(date.today() + timedelta(days=1)))
+        initial_persons = booking_data.get('persons') or 2
+        initial_adults = booking_data.get('adults') or 2
+        initial_children = booking_data.get('children') or 0
+        initial_booking_number = booking_data.get('booking_number') or ''
+        initial_status = booking_data.get('status') or 'Confirmed'
+        initial_price = booking_data.get('price') or 0.0
+        initial_charges = booking_data.get('charges') or 0.0
+        initial_email = booking_data.get('email') or ''
+        initial_phone = booking_data.get('phone') or ''
         record_id = booking_data.get('record_id')
     else:
         initial_booking_id = ''
@@ -130,66 +126,62 @@ def render_booking_form(mode="create", booking_data=None):
             # Validate
             if validate_booking_data(booking_id, guest_name, check_in, check_out):
                 try:
-                    # Note: This still uses direct DB access via shared.database_utils
-                    # For full API integration, you would need to add create/update endpoints
-                    # and use api_client here. For now, keeping shared.database_utils
-                    # since it's available in both containers.
-                    
-                    import mysql.connector
-                    from shared.constants import get_db_config
-                    
-                    conn = mysql.connector.connect(**get_db_config())
-                    cursor = conn.cursor()
-                    
-                    if mode == "create":
-                        # INSERT new booking
-                        query = """
-                        INSERT INTO bookings 
-                        (`Booking ID`, `Nombre,Apellidos`, `Check-In`, `Check-Out`, 
-                         `Nº Noches`, `Nº Personas`, `Nº Adultos`, `Nº Niños`, 
-                         `Status`, `Email`, `Movil`, `Precio`, `Comm y Cargos`, `Nº Booking`)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """
-                        
-                        values = (
-                            booking_id, guest_name, check_in, check_out,
-                            nights, persons, adults, children,
-                            status, email, phone, price, charges, booking_number
-                        )
+                    if mode == "edit":
+                        # Only the fields that changed are sent (nights is derived by the server)
+                        updated = save_booking_changes(record_id, booking_data, {
+                            "booking_id": booking_id,
+                            "guest_name": guest_name,
+                            "check_in": check_in,
+                            "check_out": check_out,
+                            "persons": persons,
+                            "adults": adults,
+                            "children": children,
+                            "status": status,
+                            "email": email,
+                            "phone": phone,
+                            "price": price,
+                            "charges": charges,
+                            "booking_number": booking_number,
+                        })
+                        if updated:
+                            # Next edit is based on the new version
+                            st.session_state['edit_booking_data'] = updated
+                        saved_id = record_id
                     else:
-                        # UPDATE existing booking
-                        query = """
-                        UPDATE bookings 
-                        SET `Booking ID` = %s, `Nombre,Apellidos` = %s, `Check-In` = %s, `Check-Out` = %s,
-                            `Nº Noches` = %s, `Nº Personas` = %s, `Nº Adultos` = %s, `Nº Niños` = %s,
-                            `Status` = %s, `Email` = %s, `Movil` = %s, `Precio` = %s, 
-                            `Comm y Cargos` = %s, `Nº Booking` = %s
-                        WHERE ID = %s
-                        """
-                        
-                        values = (
-                            booking_id, guest_name, check_in, check_out,
-                            nights, persons, adults, children,
-                            status, email, phone, price, charges, booking_number,
-                            record_id
-                        )
-                    
-                    cursor.execute(query, values)
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
+                        # Created through the API so the night ledger rejects overlaps
+                        created = api_client.create_booking({
+                            "booking_id": booking_id,
+                            "guest_name": guest_name,
+                            "check_in": check_in.isoformat(),
+                            "check_out": check_out.isoformat(),
+                            "nights": nights,
+                            "persons": persons,
+                            "adults": adults,
+                            "children": children,
+                            "status": status,
+                            "email": email or None,
+                            "phone": phone or None,
+                            "price": price,
+                            "charges": charges,
+                            "booking_number": booking_number or None,
+                        })
+                        saved_id = created['record_id']
                     
-                    # Reload data
-                    cols, rows = fetch_table("bookings")
-                    st.session_state.db_cols = cols
-                    st.session_state.db_rows = rows
-                    st.session_state.bookings_data = None
+                    # Refresh only the saved booking in the calendar data
+                    refresh_calendar_rows([saved_id], st.session_state)
                     
                     st.success(f"✅ Booking {booking_id} {'created' if mode == 'create' else 'updated'} successfully!")
                     st.balloons()
                     
                     return True
                     
+                except APIError as e:
+                    if e.status_code == 409:
+                        # Nights already taken (or, when editing, changed by someone else)
+                        st.warning(f"⚠️ Booking not saved - {e}")
+                    else:
+                        st.error(f"❌ Error saving booking: {e}")
+                    return False
                 except Exception as e:
                     st.error(f"❌ Error saving booking: {e}")
                     return False
@@ -232,45 +224,23 @@ def render_create_edit_page():
         if st.button("🔎 Search", use_container_width=True):
             if search_value:
                 try:
-                    # Load all bookings and search in memory
-                    columns, rows = fetch_table("bookings")
-                    col_map = {col: idx for idx, col in enumerate(columns)}
-                    
-                    result = None
-                    if search_by == "Booking ID":
-                        for row in rows:
-                            if row[col_map['Booking ID']] == search_value:
-                                result = row
-                                break
-                    elif search_by == "Guest Name":
-                        for row in rows:
-                            if search_value.lower() in str(row[col_map['Nombre,Apellidos']]).lower():
-                                result = row
-                                break
-                    else:  # Record ID
-                        for row in rows:
-                            if str(row[col_map['ID']]) == search_value:
-                                result = row
-                                break
+                    # Edit the booking as the API has it, with its version, so
+                    # concurrent edits are detected (409) instead of overwritten
+                    booking_data = None
+                    if search_by == "Record ID":
+                        try:
+                            booking_data = api_client.get_booking(int(search_value))
+                        except (ValueError, APIError):
+                            pass  # Not a number, or no such booking
+                    else:
+                        field = "booking_id" if search_by == "Booking ID" else "guest_name"
+                        matches = api_client.search_bookings({field: search_value.strip()})
+                        if matches:
+                            booking_data = matches[0]
+                            if len(matches) > 1:
+                                st.info(f"ℹ️ {len(matches)} bookings match; editing the one with the earliest check-in")
                     
-                    if result:
-                        booking_data = {
-                            'record_id': result[col_map['ID']],
-                            'booking_id': result[col_map['Booking ID']],
-                            'guest_name': result[col_map['Nombre,Apellidos']],
-                            'check_in': str(result[col_map['Check-In']]),
-                            'check_out': str(result[col_map['Check-Out']]),
-                            'persons': result[col_map['Nº Personas']],
-                            'adults': result[col_map['Nº Adultos']],
-                            'children': result[col_map['Nº Niños']],
-                            'booking_number': result[col_map['Nº Booking']],
-                            'status': result[col_map['Status']],
-                            'price': result[col_map['Precio']],
-                            'charges': result[col_map['Comm y Cargos']],
-                            'email': result[col_map['Email']],
-                            'phone': result[col_map['Movil']],
-                        }
-                        
+                    if booking_data:
                         st.session_state['edit_booking_data'] = booking_data
                         st.success(f"✅ Found booking: {booking_data['guest_name']}")
                     else:
@@ -6,16 +6,24 @@ Advanced search functionality with multiple filters.
 import streamlit as st
 import pandas as pd
 from datetime import date, timedelta
-import sys
-import os
 
-# Add parent directory to access shared modules
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
-
-from shared.database_utils import fetch_table
 from ..config import STATUS_OPTIONS
-from ..utils.converters import safe_convert_value
+from ..services.api_client import api_client
+
+
+# API booking fields -> search result columns
+SEARCH_RESULT_COLUMNS = {
+    "record_id": "ID",
+    "booking_id": "Booking ID",
+    "guest_name": "Guest Name",
+    "check_in": "Check-In",
+    "check_out": "Check-Out",
+    "nights": "Nights",
+    "status": "Status",
+    "price": "Price",
+    "email": "Email",
+    "phone": "Phone",
+}
 
 
 def render_search_bookings_page():
@@ -25,15 +33,10 @@ def render_search_bookings_page():
     st.title("🔍 Search Bookings")
     st.caption("Find bookings using advanced filters")
     
-    # Load all unique Booking IDs from database
+    # Load all unique Booking IDs (grouped in SQL by the backend)
     try:
-        # Use shared database utils instead of direct connection
-        cols, rows = fetch_table("bookings")
-        booking_id_idx = cols.index('Booking ID') if 'Booking ID' in cols else None
-        if booking_id_idx is not None:
-            booking_ids = sorted(list(set([row[booking_id_idx] for row in rows if row[booking_id_idx]])))
-        else:
-            booking_ids = []
+        stats = api_client.get_booking_stats(group_by="booking_id")
+        booking_ids = sorted(group["key"] for group in stats["groups"] if group["key"])
     except Exception as e:
         st.error(f"Error loading Booking IDs: {e}")
         booking_ids = []
@@ -132,109 +135,39 @@ def render_search_bookings_page():
     if search_button or 'search_results' in st.session_state:
         if search_button:
             try:
-                # Load all bookings from database using shared utils
-                cols, rows = fetch_table("bookings")
-                col_map = {col: idx for idx, col in enumerate(cols)}
-                
-                # Filter results based on criteria
-                filtered_results = []
+                # Filters are applied by the backend in SQL
+                filters = {
+                    "booking_id": booking_id_filter if booking_id_filter != "All" else None,
+                    "guest_name": guest_name_filter or None,
+                    "booking_number": booking_number_filter or None,
+                    "email": email_filter or None,
+                    "check_in_from": check_in_start,
+                    "check_in_to": check_in_end,
+                    "check_out_from": check_out_start,
+                    "check_out_to": check_out_end,
+                    "start_date": date_range_start if date_range_start and date_range_end else None,
+                    "end_date": date_range_end if date_range_start and date_range_end else None,
+                    "status": status_filter or None,
+                    "min_nights": min_nights if min_nights > 0 else None,
+                    "max_nights": max_nights if max_nights > 0 else None,
+                }
                 
-                # Apply filters in Python
-                for row in rows:
-                    # Booking ID filter
-                    if booking_id_filter and booking_id_filter != "All":
-                        if row[col_map.get('Booking ID')] != booking_id_filter:
-                            continue
-                    
-                    # Guest name filter
-                    if guest_name_filter:
-                        guest_name = str(row[col_map.get('Nombre,Apellidos', '')] or '')
-                        if guest_name_filter.lower() not in guest_name.lower():
-                            continue
-                    
-                    # Booking number filter
-                    if booking_number_filter:
-                        booking_num = str(row[col_map.get('Nº Booking', '')] or '')
-                        if booking_number_filter.lower() not in booking_num.lower():
-                            continue
-                    
-                    # Check-In Range filter
-                    if check_in_start:
-                        row_checkin = row[col_map.get('Check-In')]
-                        if row_checkin:
-                            if isinstance(row_checkin, str):
-                                from datetime import datetime
-                                row_checkin = datetime.strptime(row_checkin, '%Y-%m-%d').date()
-                            if check_in_end:
-                                if not (check_in_start <= row_checkin <= check_in_end):
-                                    continue
-                            else:
-                                if row_checkin < check_in_start:
-                                    continue
-                    
-                    # Check-Out Range filter
-                    if check_out_start:
-                        row_checkout = row[col_map.get('Check-Out')]
-                        if row_checkout:
-                            if isinstance(row_checkout, str):
-                                from datetime import datetime
-                                row_checkout = datetime.strptime(row_checkout, '%Y-%m-%d').date()
-                            if check_out_end:
-                                if not (check_out_start <= row_checkout <= check_out_end):
-                                    continue
-                            else:
-                                if row_checkout < check_out_start:
-                                    continue
+                # Columnar result (Arrow) straight into a DataFrame
+                api_df = api_client.search_bookings_df(filters)
+                if api_df.empty:
+                    df = pd.DataFrame(columns=list(SEARCH_RESULT_COLUMNS.values()))
+                else:
+                    df = api_df[list(SEARCH_RESULT_COLUMNS)].rename(columns=SEARCH_RESULT_COLUMNS)
                     
-                    # Any Date Range filter (overlapping bookings)
-                    if date_range_start and date_range_end:
-                        row_checkin = row[col_map.get('Check-In')]
-                        row_checkout = row[col_map.get('Check-Out')]
-                        if row_checkin and row_checkout:
-                            if isinstance(row_checkin, str):
-                                from datetime import datetime
-                                row_checkin = datetime.strptime(row_checkin, '%Y-%m-%d').date()
-                            if isinstance(row_checkout, str):
-                                from datetime import datetime
-                                row_checkout = datetime.strptime(row_checkout, '%Y-%m-%d').date()
-                            if not (row_checkin <= date_range_end and row_checkout >= date_range_start):
-                                continue
-                    
-                    # Status filter
-                    if status_filter:
-                        if row[col_map.get('Status')] not in status_filter:
-                            continue
-                    
-                    # Nights filters
-                    if min_nights > 0:
-                        nights = row[col_map.get('Nº Noches', 0)] or 0
-                        if nights < min_nights:
-                            continue
-                    
-                    if max_nights > 0:
-                        nights = row[col_map.get('Nº Noches', 0)] or 0
-                        if nights > max_nights:
-                            continue
-                    
-                    # Email filter
-                    if email_filter:
-                        email = str(row[col_map.get('Email', '')] or '')
-                        if email_filter.lower() not in email.lower():
-                            continue
-                    
-                    # Passed all filters
-                    filtered_results.append(row)
-                
-                # Sort by Check-In descending
-                filtered_results.sort(key=lambda x: x[col_map.get('Check-In')] or '', reverse=True)
-                results = filtered_results
-                columns = cols
+                    # Sort by Check-In descending
+                    df = df.sort_values("Check-In", ascending=False, kind="stable")
+                    df["Check-In"] = pd.to_datetime(df["Check-In"]).dt.date
+                    df["Check-Out"] = pd.to_datetime(df["Check-Out"]).dt.date
                 
                 # Store results in session state
                 st.session_state.search_results = {
-                    'columns': columns,
-                    'rows': results,
-                    'count': len(results)
+                    'df': df.reset_index(drop=True),
+                    'count': len(df)
                 }
                 
             except Exception as e:
@@ -249,25 +182,8 @@ def render_search_bookings_page():
             st.subheader(f"📊 Search Results ({results_data['count']} bookings found)")
             
             if results_data['count'] > 0:
-                # Convert to DataFrame
-                col_map = {col: idx for idx, col in enumerate(results_data['columns'])}
-                
-                data_rows = []
-                for row in results_data['rows']:
-                    data_rows.append({
-                        "ID": safe_convert_value(row[col_map.get('ID')]),
-                        "Booking ID": safe_convert_value(row[col_map.get('Booking ID')]),
-                        "Guest Name": safe_convert_value(row[col_map.get('Nombre,Apellidos')]),
-                        "Check-In": safe_convert_value(row[col_map.get('Check-In')]),
-                        "Check-Out": safe_convert_value(row[col_map.get('Check-Out')]),
-                        "Nights": safe_convert_value(row[col_map.get('Nº Noches')]),
-                        "Status": safe_convert_value(row[col_map.get('Status')]),
-                        "Price": safe_convert_value(row[col_map.get('Precio')]),
-                        "Email": safe_convert_value(row[col_map.get('Email')]),
-                        "Phone": safe_convert_value(row[col_map.get('Movil')]),
-                    })
-                
-                df = pd.DataFrame(data_rows)
+                df = results_data['df']
+                data_rows = df.to_dict('records')
                 
                 # Display options
                 view_mode = st.radio(
@@ -88,3 +88,10 @@ APP_VERSION = "0.0.1"
 # Highlight Configuration (for table rows)
 CHECKOUT_SOON_DAYS = 2  # Highlight checkouts within X days
 CHECKIN_SOON_DAYS = 2   # Highlight checkins within X days
+
+ROW_CLASSES = ["", "row-checkout-soon", "row-checkin-soon"]
+
+ROW_CLASS_STYLES = {
+    "row-checkout-soon": "background-color: #ffebee;",
+    "row-checkin-soon": "background-color: #e8f5e9;"
+}
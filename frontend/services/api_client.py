@@ -6,10 +6,27 @@ import os
 from typing import List, Optional, Dict, Any
 from datetime import date
 import httpx
+import pandas as pd
 from dotenv import load_dotenv
 
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
 load_dotenv()
 
+# Columnar response format supported by the list/search endpoints
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class APIError(Exception):
+    """Error response from the backend (status_code holds the HTTP status)."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class APIClient:
     """Client for making requests to the backend API."""
@@ -27,6 +44,8 @@ class APIClient:
         self.base_url = base_url or f"{backend_url}/api/v1"
         self.timeout = timeout
         self.client = httpx.Client(base_url=self.base_url, timeout=self.timeout)
+        # Sent to admin-only endpoints (jobs)
+        self.admin_token = os.getenv("ADMIN_TOKEN")
     
     def _handle_response(self, response: httpx.Response) -> Any:
         """Handle API response and raise exceptions if needed."""
@@ -35,7 +54,7 @@ class APIClient:
             return response.json()
         except httpx.HTTPStatusError as e:
             error_detail = e.response.json().get("detail", str(e))
-            raise Exception(f"API Error ({e.response.status_code}): {error_detail}")
+            raise APIError(f"API Error ({e.response.status_code}): {error_detail}", e.response.status_code)
         except Exception as e:
             raise Exception(f"Request failed: {str(e)}")
     
@@ -73,6 +92,97 @@ class APIClient:
         response = self.client.get("/bookings/", params=params)
         return self._handle_response(response)
     
+    def get_bookings_df(
+        self,
+        limit: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        days: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get bookings as a DataFrame (same filters as get_bookings).
+        
+        Requests an Arrow IPC stream, so columns are decoded straight from
+        Arrow buffers without building per-row Python objects.
+        
+        Returns:
+            DataFrame with one column per booking field
+        """
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if start_date:
+            params["start_date"] = start_date.isoformat()
+        if end_date:
+            params["end_date"] = end_date.isoformat()
+        if days:
+            params["days"] = days
+        
+        response = self.client.get("/bookings/", params=params, headers=self._dataframe_headers())
+        return self._read_dataframe(response)
+    
+    def search_bookings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """
+        Search bookings with the search-page filters.
+        
+        Args:
+            filters: Search filters (e.g. guest_name, status, check_in_from, min_nights)
+            
+        Returns:
+            List of booking dictionaries ordered by check-in
+        """
+        response = self.client.get("/bookings/search", params=self._filter_params(filters))
+        return self._handle_response(response)
+    
+    def search_bookings_df(self, filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Search bookings and return the results as a DataFrame (Arrow transport).
+        
+        Args:
+            filters: Search filters (same keys as search_bookings)
+            
+        Returns:
+            DataFrame with one column per booking field, ordered by check-in
+        """
+        response = self.client.get(
+            "/bookings/search",
+            params=self._filter_params(filters),
+            headers=self._dataframe_headers()
+        )
+        return self._read_dataframe(response)
+    
+    @staticmethod
+    def _dataframe_headers() -> Dict[str, str]:
+        """Accept header preferring Arrow when pyarrow is installed."""
+        if pa is None:
+            return {"Accept": "application/json"}
+        return {"Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/json;q=0.5"}
+    
+    def _read_dataframe(self, response: httpx.Response) -> pd.DataFrame:
+        """
+        Decode a list/search response into a DataFrame.
+        
+        Arrow responses are wrapped without copying the body and converted
+        column by column; date columns become datetime64. JSON responses
+        (servers without pyarrow) are converted to the same dtypes.
+        """
+        content_type = response.headers.get("content-type", "")
+        if pa is not None and content_type.startswith(ARROW_STREAM_MEDIA_TYPE):
+            if response.status_code != 200:
+                self._handle_response(response)
+            reader = pa.ipc.open_stream(pa.py_buffer(response.content))
+            return reader.read_all().to_pandas(
+                date_as_object=False,
+                split_blocks=True,
+                self_destruct=True
+            )
+        
+        df = pd.DataFrame(self._handle_response(response))
+        for column in ("check_in", "check_out"):
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column])
+        return df
+    
     def get_booking(self, record_id: int) -> Dict:
         """
         Get a specific booking by ID.
@@ -86,6 +196,26 @@ class APIClient:
         response = self.client.get(f"/bookings/{record_id}")
         return self._handle_response(response)
     
+    def get_bookings_by_ids(self, record_ids: List[int]) -> Dict:
+        """
+        Get several bookings by ID (one request per 1000 IDs).
+        
+        Args:
+            record_ids: Database record IDs
+            
+        Returns:
+            Dictionary with 'bookings' (in request order) and 'missing' IDs
+        """
+        result = {"bookings": [], "missing": []}
+        record_ids = list(dict.fromkeys(record_ids))
+        for i in range(0, len(record_ids), 1000):
+            chunk = record_ids[i:i + 1000]
+            response = self.client.get("/bookings/batch", params={"ids": ",".join(str(r) for r in chunk)})
+            data = self._handle_response(response)
+            result["bookings"].extend(data["bookings"])
+            result["missing"].extend(data["missing"])
+        return result
+    
     def get_active_bookings(self) -> List[Dict]:
         """Get currently active bookings."""
         response = self.client.get("/bookings/active")
@@ -114,6 +244,123 @@ class APIClient:
         response = self.client.get("/bookings/calendar-events", params=params)
         return self._handle_response(response)
     
+    def get_dashboard(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        days: int = 7
+    ) -> Dict:
+        """
+        Get all overview data (active, upcoming check-ins/check-outs,
+        calendar events and counts) in one request.
+        
+        Args:
+            start_date: First day of the calendar period (default: 1st of this month)
+            end_date: Last day of the calendar period (default: end of that month)
+            days: Look-ahead days for check-ins/check-outs
+            
+        Returns:
+            Dashboard dictionary
+        """
+        params = self._filter_params({"start_date": start_date, "end_date": end_date, "days": days})
+        response = self.client.get("/dashboard", params=params)
+        return self._handle_response(response)
+    
+    def get_booking_stats(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[str] = None
+    ) -> Dict:
+        """
+        Get aggregated booking statistics computed by the backend.
+        
+        Args:
+            filters: Search filters (e.g. status, check_in_from, min_nights)
+            group_by: Optional grouping ('month', 'status' or 'booking_id')
+        
+        Returns:
+            Dictionary with 'summary', 'group_by' and 'groups'
+        """
+        params = self._filter_params(filters)
+        if group_by:
+            params["group_by"] = group_by
+        
+        response = self.client.get("/bookings/stats", params=params)
+        return self._handle_response(response)
+    
+    def export_bookings(
+        self,
+        destination,
+        fmt: str = "csv",
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Download a bookings export, streaming it into a file.
+        
+        Args:
+            destination: Path or binary file object to write to
+            fmt: Export format ('csv', 'parquet' or 'ndjson')
+            filters: Search filters (same keys as get_booking_stats)
+            
+        Returns:
+            Number of bytes written
+        """
+        params = self._filter_params(filters)
+        params["format"] = fmt
+        
+        written = 0
+        with self.client.stream("GET", "/bookings/export", params=params) as response:
+            if response.status_code != 200:
+                response.read()
+                self._handle_response(response)
+            
+            target = open(destination, "wb") if isinstance(destination, (str, os.PathLike)) else destination
+            try:
+                for chunk in response.iter_bytes():
+                    target.write(chunk)
+                    written += len(chunk)
+            finally:
+                if target is not destination:
+                    target.close()
+        
+        return written
+    
+    @staticmethod
+    def _filter_params(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert a filters dictionary to query parameters, dropping empty values."""
+        params = {}
+        for key, value in (filters or {}).items():
+            if value is None or value == "" or value == []:
+                continue
+            params[key] = value.isoformat() if isinstance(value, date) else value
+        return params
+    
+    # Analytics endpoints
+    
+    def get_occupancy(
+        self,
+        start_date: date,
+        end_date: date,
+        booking_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Get nightly occupancy, revenue and ADR for a period.
+        
+        Args:
+            start_date: First night of the period
+            end_date: Last night of the period (inclusive)
+            booking_id: Optional booking ID/unit filter
+            
+        Returns:
+            Occupancy report dictionary with per-day entries
+        """
+        params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        if booking_id:
+            params["booking_id"] = booking_id
+        
+        response = self.client.get("/analytics/occupancy", params=params)
+        return self._handle_response(response)
+    
     def create_booking(self, booking_data: Dict) -> Dict:
         """
         Create a new booking.
@@ -127,18 +374,37 @@ class APIClient:
         response = self.client.post("/bookings/", json=booking_data)
         return self._handle_response(response)
     
-    def update_booking(self, record_id: int, booking_data: Dict) -> Dict:
+    def update_booking(self, record_id: int, booking_data: Dict, version: Optional[int] = None) -> Dict:
         """
         Update an existing booking.
         
         Args:
             record_id: Database record ID
             booking_data: Fields to update
+            version: Version the edit is based on (sent as If-Match); the update
+                fails with APIError 409 if the booking changed since
             
         Returns:
             Updated booking dictionary
         """
-        response = self.client.put(f"/bookings/{record_id}", json=booking_data)
+        headers = {"If-Match": f'"{version}"'} if version is not None else None
+        response = self.client.put(f"/bookings/{record_id}", json=booking_data, headers=headers)
+        return self._handle_response(response)
+    
+    def patch_booking(self, record_id: int, changes: Dict, version: Optional[int] = None) -> Dict:
+        """
+        Change only some fields of a booking (None clears a field).
+        
+        Args:
+            record_id: Database record ID
+            changes: Fields that changed
+            version: Version the edit is based on (sent as If-Match)
+            
+        Returns:
+            Updated booking dictionary
+        """
+        headers = {"If-Match": f'"{version}"'} if version is not None else None
+        response = self.client.patch(f"/bookings/{record_id}", json=changes, headers=headers)
         return self._handle_response(response)
     
     def delete_booking(self, record_id: int) -> None:
@@ -152,6 +418,30 @@ class APIClient:
         if response.status_code != 204:
             self._handle_response(response)
     
+    # Job endpoints (admin only: need ADMIN_TOKEN)
+    
+    def _admin_headers(self) -> Dict[str, str]:
+        return {"X-Admin-Token": self.admin_token} if self.admin_token else {}
+    
+    def submit_job(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """
+        Start a background job (export, rebuild_occupancy, rebuild_night_ledger, backfill_properties).
+        
+        Args:
+            kind: Job kind
+            params: Job parameters (e.g. {"format": "csv", "filters": {...}} for export)
+            
+        Returns:
+            Job dictionary (poll get_job with its 'id')
+        """
+        response = self.client.post("/jobs", json={"kind": kind, "params": params or {}}, headers=self._admin_headers())
+        return self._handle_response(response)
+    
+    def get_job(self, job_id: str) -> Dict:
+        """Get a job's status, progress and result."""
+        response = self.client.get(f"/jobs/{job_id}", headers=self._admin_headers())
+        return self._handle_response(response)
+    
     def close(self):
         """Close the HTTP client."""
         self.client.close()
@@ -0,0 +1,325 @@
+"""
+Async API client for pages that need several endpoints at once.
+
+Same endpoints and error type (APIError) as APIClient, but on an
+httpx.AsyncClient with a sized connection pool, optional HTTP/2,
+per-endpoint timeouts and retries with jittered backoff for idempotent
+requests. `gather` / `fetch_all` run several calls in one parallel round;
+`fetch_all` keeps one client on a background event loop for the process.
+"""
+
+import asyncio
+import atexit
+import os
+import random
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import date
+import httpx
+from dotenv import load_dotenv
+
+from .api_client import APIClient, APIError
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+load_dotenv()
+
+# Read timeout (seconds) per endpoint prefix; the longest matching prefix wins
+ENDPOINT_TIMEOUTS = {
+    "/bookings/export": 300.0,
+    "/bookings/stats": 30.0,
+    "/bookings/search": 30.0,
+    "/analytics": 30.0,
+}
+DEFAULT_TIMEOUT = 10.0
+CONNECT_TIMEOUT = 5.0
+
+# Only these are retried (repeating them cannot change data twice)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Gateway/overload responses worth retrying
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# IDs per GET /bookings/batch request (the backend's MAX_BATCH_IDS)
+BATCH_IDS_PER_REQUEST = 1000
+
+
+class AsyncAPIClient:
+    """Async client for the backend API (use with `async with`)."""
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        http2: Optional[bool] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        retries: int = 2,
+        backoff: float = 0.2
+    ):
+        """
+        Initialize the async API client.
+        
+        Args:
+            base_url: Base URL for the API (defaults to env variable or localhost)
+            http2: Use HTTP/2 (defaults to API_HTTP2; needs the h2 package)
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            retries: Extra attempts for idempotent requests on network errors or 502/503/504
+            backoff: Base delay in seconds (doubled per attempt, with full jitter)
+        """
+        backend_url = os.getenv("BACKEND_URL", "http://localhost:8000")
+        self.base_url = base_url or f"{backend_url}/api/v1"
+        if http2 is None:
+            http2 = os.getenv("API_HTTP2", "").lower() in ("1", "true", "yes")
+        if http2 and h2 is None:
+            print("⚠️ HTTP/2 requested but the h2 package is not installed - using HTTP/1.1")
+            http2 = False
+        self.retries = retries
+        self.backoff = backoff
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=http2,
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+    
+    @staticmethod
+    def _timeout_for(url: str) -> httpx.Timeout:
+        """Timeout of an endpoint (longest matching prefix of ENDPOINT_TIMEOUTS)."""
+        matches = [prefix for prefix in ENDPOINT_TIMEOUTS if url.startswith(prefix)]
+        read = ENDPOINT_TIMEOUTS[max(matches, key=len)] if matches else DEFAULT_TIMEOUT
+        return httpx.Timeout(read, connect=CONNECT_TIMEOUT)
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying idempotent ones on transient failures."""
+        kwargs.setdefault("timeout", self._timeout_for(url))
+        attempts = self.retries + 1 if method.upper() in IDEMPOTENT_METHODS else 1
+        
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if last:
+                    raise Exception(f"Request failed: {str(e)}")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last:
+                    return response
+            # Full jitter: spreads retries of parallel calls over the backoff window
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+    
+    @staticmethod
+    def _handle_response(response: httpx.Response) -> Any:
+        """Return the JSON body or raise APIError (same errors as APIClient)."""
+        if response.is_error:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(f"API Error ({response.status_code}): {detail}", response.status_code)
+        return response.json()
+    
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return self._handle_response(await self._request("GET", url, params=params))
+    
+    # Booking endpoints
+    
+    async def get_bookings(
+        self,
+        limit: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        days: Optional[int] = None
+    ) -> List[Dict]:
+        """Get bookings with optional filters (see APIClient.get_bookings)."""
+        params = APIClient._filter_params({
+            "limit": limit, "start_date": start_date, "end_date": end_date, "days": days
+        })
+        return await self._get("/bookings/", params)
+    
+    async def get_booking(self, record_id: int) -> Dict:
+        """Get a specific booking by ID."""
+        return await self._get(f"/bookings/{record_id}")
+    
+    async def get_bookings_by_ids(self, record_ids: List[int]) -> Dict:
+        """
+        Get several bookings by ID ('bookings' in request order, 'missing' IDs).
+        
+        Sent in chunks of BATCH_IDS_PER_REQUEST IDs (the server limit), fetched in parallel.
+        """
+        record_ids = list(dict.fromkeys(record_ids))
+        chunks = [
+            record_ids[i:i + BATCH_IDS_PER_REQUEST]
+            for i in range(0, len(record_ids), BATCH_IDS_PER_REQUEST)
+        ]
+        pages = await asyncio.gather(*(
+            self._get("/bookings/batch", {"ids": ",".join(str(r) for r in chunk)})
+            for chunk in chunks
+        ))
+        return {
+            "bookings": [booking for page in pages for booking in page["bookings"]],
+            "missing": [record_id for page in pages for record_id in page["missing"]],
+        }
+    
+    async def search_bookings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Search bookings with the search-page filters."""
+        return await self._get("/bookings/search", APIClient._filter_params(filters))
+    
+    async def get_active_bookings(self) -> List[Dict]:
+        """Get currently active bookings."""
+        return await self._get("/bookings/active")
+    
+    async def get_upcoming_checkins(self, days: int = 7) -> List[Dict]:
+        """Get bookings with upcoming check-ins."""
+        return await self._get("/bookings/upcoming-checkins", {"days": days})
+    
+    async def get_upcoming_checkouts(self, days: int = 7) -> List[Dict]:
+        """Get bookings with upcoming check-outs."""
+        return await self._get("/bookings/upcoming-checkouts", {"days": days})
+    
+    async def get_calendar_events(self, start_date: Optional[date] = None, days: int = 90) -> List[Dict]:
+        """Get bookings formatted as calendar events."""
+        params = {"days": days}
+        if start_date:
+            params["start_date"] = start_date.isoformat()
+        return await self._get("/bookings/calendar-events", params)
+    
+    async def get_dashboard(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        days: int = 7
+    ) -> Dict:
+        """Get all overview data in one request (see APIClient.get_dashboard)."""
+        params = APIClient._filter_params({"start_date": start_date, "end_date": end_date, "days": days})
+        return await self._get("/dashboard", params)
+    
+    async def get_booking_stats(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[str] = None
+    ) -> Dict:
+        """Get aggregated booking statistics computed by the backend."""
+        params = APIClient._filter_params(filters)
+        if group_by:
+            params["group_by"] = group_by
+        return await self._get("/bookings/stats", params)
+    
+    async def get_occupancy(self, start_date: date, end_date: date, booking_id: Optional[str] = None) -> Dict:
+        """Get nightly occupancy, revenue and ADR for a period."""
+        params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        if booking_id:
+            params["booking_id"] = booking_id
+        return await self._get("/analytics/occupancy", params)
+    
+    async def gather(self, return_exceptions: bool = False, **calls: Awaitable) -> Dict[str, Any]:
+        """
+        Run several calls concurrently.
+        
+        Example:
+            data = await client.gather(
+                active=client.get_active_bookings(),
+                checkins=client.get_upcoming_checkins(days=3),
+            )
+        
+        Args:
+            return_exceptions: Put failures in the result instead of raising the first one
+            **calls: Name -> coroutine of this client
+        
+        Returns:
+            Dictionary of name -> result
+        """
+        results = await asyncio.gather(*calls.values(), return_exceptions=return_exceptions)
+        return dict(zip(calls.keys(), results))
+    
+    async def close(self):
+        """Close the HTTP client."""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+
+# Process-wide event loop (on a daemon thread) and client used by fetch_all,
+# so every Streamlit rerun reuses the same pool of open connections
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[AsyncAPIClient] = None
+_loop_lock = threading.Lock()
+
+
+def _background_client() -> Tuple[asyncio.AbstractEventLoop, AsyncAPIClient]:
+    """Start the background event loop and its client on first use."""
+    global _loop, _client
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-api-client", daemon=True).start()
+            
+            async def _create():
+                return AsyncAPIClient()
+            
+            _client = asyncio.run_coroutine_threadsafe(_create(), loop).result()
+            _loop = loop
+        return _loop, _client
+
+
+def close_background_client():
+    """Close fetch_all's client and stop its event loop (a later call starts new ones)."""
+    global _loop, _client
+    with _loop_lock:
+        loop, client, _loop, _client = _loop, _client, None, None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(close_background_client)
+
+
+def fetch_all(
+    return_exceptions: bool = False,
+    **calls: Callable[[AsyncAPIClient], Awaitable]
+) -> Dict[str, Any]:
+    """
+    Fetch several endpoints in one parallel round from synchronous code (Streamlit).
+    
+    The calls run on a long-lived client on a background event loop, so
+    connections (and HTTP/2 sessions) are reused across calls and reruns
+    instead of being opened for each one.
+    
+    Example:
+        data = fetch_all(
+            active=lambda api: api.get_active_bookings(),
+            checkins=lambda api: api.get_upcoming_checkins(days=3),
+        )
+    
+    Args:
+        return_exceptions: Put failures in the result instead of raising the first one
+        **calls: Name -> function taking the client and returning a coroutine
+    
+    Returns:
+        Dictionary of name -> result
+    """
+    loop, client = _background_client()
+    
+    async def _run():
+        return await client.gather(
+            return_exceptions=return_exceptions,
+            **{name: call(client) for name, call in calls.items()}
+        )
+    
+    return asyncio.run_coroutine_threadsafe(_run(), loop).result()
@@ -3,51 +3,49 @@ Booking service for Property Manager application.
 
 Business logic for loading, filtering, and managing bookings.
 """
-import sys
-import os
 from datetime import date
+from decimal import Decimal
 
-# Add parent directory to access root services
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, parent_dir)
-
-from shared.database_utils import fetch_table
-from .data_transformer import convert_db_to_dataframe, add_electric_allowance
+from .api_client import APIError, api_client
+from .data_transformer import (
+    convert_api_frame_to_table,
+    convert_api_booking_to_db_row,
+    add_row_classification,
+)
 
 
 def load_bookings(start_date: date, end_date: date):
     """
-    Loads and filters bookings from database for the given date range.
+    Loads bookings overlapping the given date range from the backend API.
     
     Args:
         start_date: Filter start date
         end_date: Filter end date
         
     Returns:
-        dict: Dictionary with 'df' (DataFrame), 'count', 'start_date', 'end_date'
-              or None if no data found
+        dict: Dictionary with 'df' (DataFrame), 'count', 'start_date', 'end_date',
+              'classified_on' or None if no data found
     """
     try:
-        # Load fresh data from DB
-        cols_fresh, rows_fresh = fetch_table("bookings")
-        
-        if not rows_fresh:
-            return None
+        # Load bookings overlapping the period from the API (Arrow transport)
+        api_df = api_client.get_bookings_df(start_date=start_date, end_date=end_date)
         
-        # Convert to DataFrame with filtering
-        df = convert_db_to_dataframe(cols_fresh, rows_fresh, start_date, end_date)
+        # Rename/format columns for the table (includes electric allowance)
+        df = convert_api_frame_to_table(api_df)
         
         if df.empty:
             return None
         
-        # Add electric allowance column
-        df = add_electric_allowance(df)
+        # Precompute typed dates and row highlighting once per load
+        classified_on = date.today()
+        df = add_row_classification(df, classified_on)
         
         return {
             'df': df,
             'count': len(df),
             'start_date': start_date,
-            'end_date': end_date
+            'end_date': end_date,
+            'classified_on': classified_on
         }
         
     except Exception as e:
@@ -74,3 +72,123 @@ def auto_load_bookings_if_needed(start_date: date, end_date: date, session_state
         except Exception as e:
             # If auto-load fails, silently disable table
             session_state.bookings_table_visible = False
+
+
+def refresh_row_classification_if_stale(bookings_data: dict) -> dict:
+    """
+    Re-classifies cached bookings rows if they were classified on a previous day.
+    
+    Args:
+        bookings_data: Dictionary returned by load_bookings
+        
+    Returns:
+        dict: The same dictionary, with 'df' and 'classified_on' refreshed if needed
+    """
+    today = date.today()
+    if bookings_data.get('classified_on') != today:
+        bookings_data['df'] = add_row_classification(bookings_data['df'], today)
+        bookings_data['classified_on'] = today
+    return bookings_data
+
+
+def refresh_calendar_rows(record_ids: list, session_state):
+    """
+    Updates the calendar rows of some bookings from the API (one batch request)
+    instead of reloading the whole bookings table.
+    
+    Rows of bookings that no longer exist are dropped and new bookings are
+    appended. The bookings table is reloaded on its next display.
+    
+    Args:
+        record_ids: Database record IDs of the bookings that changed
+        session_state: Streamlit session state (db_cols, db_rows)
+    """
+    session_state.bookings_data = None
+    cols = session_state.get('db_cols')
+    if not cols or 'ID' not in cols:
+        return
+    
+    result = api_client.get_bookings_by_ids(record_ids)
+    fresh = {b['record_id']: convert_api_booking_to_db_row(b, cols) for b in result['bookings']}
+    missing = set(result['missing'])
+    id_index = cols.index('ID')
+    
+    rows = []
+    for row in session_state.get('db_rows') or []:
+        if row[id_index] in missing:
+            continue
+        rows.append(fresh.pop(row[id_index], row))
+    rows.extend(fresh.values())
+    session_state.db_rows = rows
+
+
+def _normalize(value):
+    """Comparable form of a booking field ('' == None, dates as ISO, numbers as float)."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        # DECIMAL columns (price, charges) come back as Decimal
+        return float(value)
+    return value
+
+
+def diff_booking(original: dict, edited: dict) -> dict:
+    """
+    Returns the fields of an edited booking that differ from the original.
+    
+    Args:
+        original: Booking as loaded (API field names)
+        edited: Form values (API field names)
+        
+    Returns:
+        dict: Changed fields with JSON-ready values ('' becomes None)
+    """
+    changes = {}
+    for field, value in edited.items():
+        if _normalize(value) == _normalize(original.get(field)):
+            continue
+        if isinstance(value, date):
+            value = value.isoformat()
+        changes[field] = None if value == '' else value
+    return changes
+
+
+def save_booking_changes(record_id: int, original: dict, edited: dict):
+    """
+    Saves only the fields the user changed (PATCH), based on the loaded version.
+    
+    If someone else saved the booking in between but touched other fields,
+    the change is re-sent on top of the latest version; if they changed one
+    of the same fields, nothing is saved.
+    
+    Args:
+        record_id: Database record ID
+        original: Booking as loaded (with 'version')
+        edited: Form values (API field names)
+        
+    Returns:
+        dict: Updated booking, or None if nothing changed
+        
+    Raises:
+        APIError: 409 if a changed field was also changed by someone else
+    """
+    changes = diff_booking(original, edited)
+    if not changes:
+        return None
+    
+    version = original.get('version')
+    try:
+        return api_client.patch_booking(record_id, changes, version=version)
+    except APIError as e:
+        if e.status_code != 409 or version is None:
+            raise
+        latest = api_client.get_booking(record_id)
+        if latest.get('version') == version:
+            # Not a version clash (e.g. the dates overlap another booking)
+            raise
+        clashing = [field for field in changes if _normalize(latest.get(field)) != _normalize(original.get(field))]
+        if clashing:
+            raise APIError(f"Also changed by someone else: {', '.join(clashing)}", 409)
+        return api_client.patch_booking(record_id, changes, version=latest.get('version'))
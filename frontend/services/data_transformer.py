@@ -7,6 +7,63 @@ import os
 import pandas as pd
 from datetime import date, timedelta
 from ..utils.converters import safe_convert_value, convert_date_field
+from ..config import CHECKOUT_SOON_DAYS, CHECKIN_SOON_DAYS, ROW_CLASSES
+
+
+# API booking fields -> bookings table columns
+API_TABLE_COLUMNS = {
+    "record_id": "Record ID",
+    "booking_id": "Booking ID",
+    "booking_number": "Booking Number",
+    "guest_name": "Name and Surname",
+    "check_in": "Check-In",
+    "check_out": "Check-Out",
+    "nights": "Nº Nights",
+    "status": "Status",
+    "persons": "Persons",
+    "adults": "Adults",
+    "children": "Children",
+    "email": "Email",
+    "phone": "Phone",
+    "price": "Price",
+    "charges": "Charges",
+}
+
+# API booking fields -> columns of the raw bookings rows the calendar is built from
+API_DB_COLUMNS = {
+    "record_id": "ID",
+    "booking_id": "Booking ID",
+    "check_in": "Check-In",
+    "check_out": "Check-Out",
+    "guest_name": "Nombre,Apellidos",
+    "nights": "Nº Noches",
+    "persons": "Nº Personas",
+    "adults": "Nº Adultos",
+    "children": "Nº Niños",
+    "booking_number": "Nº Booking",
+    "status": "Status",
+    "email": "Email",
+    "phone": "Movil",
+    "charges": "Comm y Cargos",
+    "price": "Precio",
+    "property_id": "property_id",
+    "version": "version",
+}
+
+
+def convert_api_booking_to_db_row(booking: dict, cols: list) -> tuple:
+    """
+    Converts an API booking to a raw bookings row.
+    
+    Args:
+        booking: Booking dictionary from the API
+        cols: Column names of the rows it goes with
+        
+    Returns:
+        Row tuple in the order of cols (None for columns the API does not return)
+    """
+    fields = {column: field for field, column in API_DB_COLUMNS.items()}
+    return tuple(booking.get(fields[col]) if col in fields else None for col in cols)
 
 
 def convert_db_to_events(cols: list, rows: list) -> list:
@@ -200,6 +257,33 @@ def convert_db_to_dataframe(cols: list, rows: list, start_date: date, end_date:
         return pd.DataFrame()
 
 
+def convert_api_frame_to_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts a bookings DataFrame from the API (Arrow or JSON) to the table format.
+    
+    Renames API fields to the table column names and formats dates and the
+    electric allowance with vectorized column operations.
+    
+    Args:
+        df: DataFrame from APIClient.get_bookings_df / search_bookings_df
+        
+    Returns:
+        DataFrame with the same columns as convert_db_to_dataframe plus 'Allowance electric'
+    """
+    if df.empty:
+        return pd.DataFrame()
+    
+    table = df.rename(columns=API_TABLE_COLUMNS)
+    table['Check-In'] = pd.to_datetime(table['Check-In']).dt.strftime('%Y-%m-%d')
+    table['Check-Out'] = pd.to_datetime(table['Check-Out']).dt.strftime('%Y-%m-%d')
+    table['Name and Surname'] = table['Name and Surname'].fillna("No name")
+    
+    allowance = table.pop('electric_allowance')
+    table['Allowance electric'] = allowance.astype(object).where(allowance.notna(), 'N/A')
+    
+    return table
+
+
 def add_electric_allowance(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds electric allowance column to bookings DataFrame.
@@ -223,6 +307,44 @@ def add_electric_allowance(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def add_row_classification(df: pd.DataFrame, today: date = None) -> pd.DataFrame:
+    """
+    Adds typed date columns and a 'row_class' category column to bookings DataFrame.
+    
+    All rows are classified in one vectorized pass so the table renderer
+    does not need to parse dates or compare against today per row.
+    
+    Args:
+        df: DataFrame with booking data ('Check-In' and 'Check-Out' columns)
+        today: Reference date for the classification (defaults to today)
+    
+    Returns:
+        DataFrame with added 'Check-In Date', 'Check-Out Date' and 'row_class' columns
+    """
+    if today is None:
+        today = date.today()
+    today_ts = pd.Timestamp(today)
+    
+    # Typed date columns (unparseable values become NaT and are left unclassified)
+    df['Check-In Date'] = pd.to_datetime(df['Check-In'], errors='coerce')
+    df['Check-Out Date'] = pd.to_datetime(df['Check-Out'], errors='coerce')
+    
+    days_until_checkout = (df['Check-Out Date'] - today_ts).dt.days
+    days_until_checkin = (df['Check-In Date'] - today_ts).dt.days
+    
+    checkout_soon = days_until_checkout <= CHECKOUT_SOON_DAYS
+    checkin_soon = (days_until_checkin <= CHECKIN_SOON_DAYS) & (days_until_checkin >= 0)
+    
+    # Check-out highlighting takes precedence over check-in highlighting
+    row_class = pd.Series("", index=df.index)
+    row_class = row_class.mask(checkin_soon, "row-checkin-soon")
+    row_class = row_class.mask(checkout_soon, "row-checkout-soon")
+    
+    df['row_class'] = pd.Categorical(row_class, categories=ROW_CLASSES)
+    
+    return df
+
+
 def fix_calendar_events_dates(events: list) -> list:
     """
     Fixes date formats for calendar events to ensure proper display.